@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from atomic import atomic_path, write_json
+from manifest import file_hash
+
+ASSET_LIST_NAME = ".assets.json"
+DEFAULT_COPY_THREADS = 8
+NO_STATIC_DIR_ERROR = "asset sync error: static directory does not exist"
+
+
+class AssetReport:
+    def __init__(self, copied, unchanged, removed, failed, copied_bytes, seconds):
+        """
+        Outcome of one sync_assets
+
+        Attrs:
+            self.copied - (list) of output paths written
+            self.unchanged - (int) number of outputs already up to date
+            self.removed - (list) of output paths deleted because their source is gone
+            self.failed - (list) of (source path, error message) for files not copied
+            self.copied_bytes - (int) size of the files copied
+            self.seconds - (float) wall time of the whole sync
+        """
+        self.copied = copied
+        self.unchanged = unchanged
+        self.removed = removed
+        self.failed = failed
+        self.copied_bytes = copied_bytes
+        self.seconds = seconds
+
+    def format(self):
+        lines = [f"ERROR {error}  {source}" for source, error in self.failed]
+        megabytes = self.copied_bytes / 2**20
+        seconds = self.seconds or 1e-9
+        lines.append(
+            f"Copied {len(self.copied)} assets, {megabytes:.1f} MB in "
+            f"{self.seconds:.3f} s ({len(self.copied) / seconds:.0f} files/s, "
+            f"{megabytes / seconds:.1f} MB/s), {self.unchanged} unchanged, "
+            f"{len(self.removed)} removed"
+        )
+        return "\n".join(lines)
+
+
+def find_asset_files(static_dir):
+    """
+    Yields the paths of every file under static_dir, relative to it, in sorted order.
+    """
+    for root, dirs, files in os.walk(static_dir):
+        dirs.sort()
+        for name in sorted(files):
+            yield os.path.relpath(os.path.join(root, name), static_dir)
+
+
+def asset_is_fresh(source, output, use_hash=False):
+    """
+    Checks whether output is a copy of source.
+
+    Copies keep the mtime of their source, so equal size and mtime mean
+    up to date without reading either file. With use_hash, files of equal
+    size but different mtime are compared by content, and an equal output
+    gets the mtime of its source to take the fast path next time.
+    """
+    src = os.stat(source)
+    try:
+        dst = os.stat(output)
+    except FileNotFoundError:
+        return False
+    if src.st_size != dst.st_size:
+        return False
+    if src.st_mtime_ns == dst.st_mtime_ns:
+        return True
+    if use_hash and file_hash(source) == file_hash(output):
+        os.utime(output, ns=(dst.st_atime_ns, src.st_mtime_ns))
+        return True
+    return False
+
+
+def copy_asset(source, output, use_hash=False):
+    """
+    Copies source to output unless output is already up to date.
+
+    Returns:
+        the number of bytes copied, None if output was up to date
+    """
+    if asset_is_fresh(source, output, use_hash):
+        return None
+    with atomic_path(output) as tmp_output:
+        # copyfile uses os.sendfile where it can, the data never enters Python
+        shutil.copyfile(source, tmp_output)
+        shutil.copystat(source, tmp_output)
+    return os.path.getsize(output)
+
+
+def load_asset_list(path):
+    # A missing or unreadable list only means stale outputs are not pruned
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_asset_list(path, rel_paths):
+    write_json(path, rel_paths)
+
+
+def remove_output(output, public_dir):
+    """
+    Deletes output, then each parent directory left empty, up to public_dir.
+    """
+    os.remove(output)
+    directory = os.path.dirname(output)
+    while os.path.abspath(directory) != os.path.abspath(public_dir):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            # Not empty
+            break
+        directory = os.path.dirname(directory)
+
+
+def sync_assets(static_dir, public_dir, workers=None, use_hash=False, list_path=None):
+    """
+    Makes public_dir hold a copy of every file under static_dir, keeping the
+    directory layout, e.g. static/images/logo.png -> public/images/logo.png
+
+    Only new and changed files are copied, by a pool of threads since the
+    work is I/O. Outputs whose source was removed since the last sync are
+    deleted; other files in public_dir, such as the html of the pages, are
+    never touched.
+
+    Args:
+        static_dir - (str) directory holding the assets
+        public_dir - (str) directory the assets are copied to
+        workers - (int) copying threads, defaults to DEFAULT_COPY_THREADS
+        use_hash - (bool) compare the content of files whose size matches but
+            mtime does not, e.g. after a fresh checkout, rather than copying them
+        list_path - (str) where the list of synced assets is kept, defaults to
+            public_dir/ASSET_LIST_NAME
+
+    Returns:
+        AssetReport
+    """
+    start = time.perf_counter()
+    if not os.path.isdir(static_dir):
+        raise ValueError(NO_STATIC_DIR_ERROR)
+    list_path = list_path or os.path.join(public_dir, ASSET_LIST_NAME)
+    rel_paths = list(find_asset_files(static_dir))
+
+    removed = []
+    current = set(rel_paths)
+    for rel_path in load_asset_list(list_path):
+        output = os.path.join(public_dir, rel_path)
+        if rel_path not in current and os.path.exists(output):
+            remove_output(output, public_dir)
+            removed.append(output)
+
+    def sync(rel_path):
+        source = os.path.join(static_dir, rel_path)
+        output = os.path.join(public_dir, rel_path)
+        try:
+            return output, copy_asset(source, output, use_hash), None
+        except OSError as e:
+            return output, None, (source, str(e))
+
+    copied, failed = [], []
+    unchanged = copied_bytes = 0
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_COPY_THREADS) as executor:
+        for output, size, error in executor.map(sync, rel_paths):
+            if error is not None:
+                failed.append(error)
+            elif size is None:
+                unchanged += 1
+            else:
+                copied.append(output)
+                copied_bytes += size
+
+    save_asset_list(list_path, rel_paths)
+    seconds = time.perf_counter() - start
+    return AssetReport(copied, unchanged, removed, failed, copied_bytes, seconds)
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from atomic import atomic_path
+from build import BuildPlan, BuildReport, PageResult, convert_markdown, init_worker
+from links import LinkIndex
+from search import build_search_index
+from template import load_template
+
+DEFAULT_IO_THREADS = 8
+
+
+def read_text(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def write_text(path, text):
+    with atomic_path(path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+async def build_site_async(
+    content_dir,
+    public_dir,
+    workers=None,
+    max_in_flight=None,
+    io_threads=DEFAULT_IO_THREADS,
+    incremental=True,
+    manifest_path=None,
+    cache_size=0,
+    cache_path=None,
+    profile=False,
+    inline_cache_size=0,
+    template_path=None,
+    record_links=False,
+    search_index=False,
+):
+    """
+    Same result as build.build_site, but sources are read and outputs written
+    by a thread pool while other pages are being converted, so slow storage
+    does not leave the worker processes idle.
+
+    Reader tasks put the text of each source on a bounded queue, converter
+    tasks take it off, convert it in the process pool and hand the html back
+    to the thread pool to write. Readers wait while the queue is full, so at
+    most about 2 * max_in_flight pages are held in memory at once.
+
+    Args:
+        workers - (int) worker processes for conversion, defaults to os.cpu_count()
+        max_in_flight - (int) pages being converted at once, and the queue size.
+            Defaults to 2 * workers so a worker always has the next page waiting
+        io_threads - (int) threads reading and writing files, also the number of reader tasks
+        others - see build.build_site
+
+    Returns:
+        build.BuildReport
+    """
+    start = time.perf_counter()
+    template = load_template(template_path) if template_path else None
+    template_hash = template.hash if template else ""
+    plan = BuildPlan(
+        content_dir,
+        public_dir,
+        incremental,
+        manifest_path,
+        template_hash,
+        record_links,
+        search_index,
+    )
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    jobs = list(enumerate(zip(plan.sources, plan.outputs)))
+    pages = [None] * len(jobs)
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=max_in_flight)
+
+    async def read(io_pool, pending):
+        while pending:
+            index, (source, output) = pending.pop()
+            page_start = time.perf_counter()
+            try:
+                markdown = await loop.run_in_executor(io_pool, read_text, source)
+            except Exception as e:
+                seconds = time.perf_counter() - page_start
+                pages[index] = PageResult(source, output, seconds, str(e))
+                continue
+            await queue.put((index, source, output, markdown, page_start))
+
+    async def convert(io_pool, cpu_pool):
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            index, source, output, markdown, page_start = job
+            html, error, cache_stats, page_profile, links, search = (
+                await loop.run_in_executor(cpu_pool, convert_markdown, markdown)
+            )
+            if error is None:
+                try:
+                    await loop.run_in_executor(io_pool, write_text, output, html)
+                except OSError as e:
+                    error = str(e)
+            seconds = time.perf_counter() - page_start
+            pages[index] = PageResult(
+                source, output, seconds, error, cache_stats, page_profile, links, search
+            )
+
+    with ThreadPoolExecutor(max_workers=io_threads) as io_pool:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(
+                cache_size,
+                cache_path,
+                profile,
+                inline_cache_size,
+                template,
+                record_links,
+                search_index,
+            ),
+        ) as cpu_pool:
+            # Readers pop from the end, reverse so pages start in content order
+            pending = jobs[::-1]
+            readers = [
+                asyncio.create_task(read(io_pool, pending)) for _ in range(io_threads)
+            ]
+            converters = [
+                asyncio.create_task(convert(io_pool, cpu_pool))
+                for _ in range(max_in_flight)
+            ]
+
+            async def feed():
+                await asyncio.gather(*readers)
+                for _ in converters:
+                    await queue.put(None)
+
+            tasks = [asyncio.create_task(feed()), *converters]
+            try:
+                # A converter that dies, e.g. on a BrokenProcessPool, stops
+                # taking pages off the queue, the readers would wait forever
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    task.result()
+            finally:
+                for task in tasks + readers:
+                    task.cancel()
+                await asyncio.gather(*tasks, *readers, return_exceptions=True)
+
+    plan.finish(pages)
+    links = LinkIndex.from_manifest(plan.manifest, public_dir) if record_links else None
+    search = build_search_index(plan.manifest, public_dir) if search_index else None
+    seconds = time.perf_counter() - start
+    return BuildReport(
+        pages, seconds, workers, plan.unchanged, plan.removed, links, search
+    )
@@ -0,0 +1,37 @@
+import contextlib
+import json
+import os
+
+TMP_SUFFIX = ".tmp"
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """
+    Yields a temporary path to write the new content of path to. Once the
+    block is done the file is moved over path in one step, so a reader, e.g.
+    the dev server, sees the old file or the new one but never part of it.
+    If the block raises, the temporary file is removed and path left alone.
+
+        with atomic_path(path) as tmp_path, open(tmp_path, "w") as f:
+            f.write(html)
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + TMP_SUFFIX
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json(path, data, **options):
+    """
+    Writes data to path as compact JSON, atomically. options go to json.dumps.
+    """
+    # dumps encodes in C, dump would walk the data in Python
+    text = json.dumps(data, separators=(",", ":"), **options)
+    with atomic_path(path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
@@ -0,0 +1,71 @@
+# Run from the repo root with: ./bench.sh [--save-baseline] [--only NAME]
+import argparse
+import os
+import sys
+
+from benchmarks.suite import (
+    DEFAULT_THRESHOLD,
+    compare,
+    format_results,
+    read_results,
+    run_suite,
+    write_results,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="benchmarks", description="Benchmark the markdown to html pipeline"
+    )
+    parser.add_argument("--output", default="bench_output.txt", help="results file")
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="results to compare against"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store this run as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown before failing, 0.25 = 25%%",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this")
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    results = run_suite(repeat=args.repeat, only=args.only)
+    write_results(results, args.output)
+    if args.save_baseline:
+        write_results(results, args.baseline)
+        print(format_results(results))
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    baseline = read_results(args.baseline) if os.path.exists(args.baseline) else None
+    print(format_results(results, baseline))
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, run with --save-baseline to store one")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSION: {len(regressions)} benchmark(s) slower than")
+        print(f"the baseline by more than {args.threshold:.0%}")
+        for name, base, current, ratio in regressions:
+            print(
+                f"  {name}: {base * 1000:.3f} ms -> {current * 1000:.3f} ms "
+                f"({ratio:.2f}x)"
+            )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
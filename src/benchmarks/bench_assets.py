@@ -0,0 +1,53 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_assets
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from assets import sync_assets
+from benchmarks.corpus import SEED
+
+FILES = 2000
+# Mostly small css and icons, some larger images and fonts
+SIZES = (2**10, 8 * 2**10, 64 * 2**10, 512 * 2**10)
+
+
+def make_static(static_dir):
+    rng = random.Random(SEED)
+    for n in range(FILES):
+        path = os.path.join(static_dir, f"dir{n % 20}", f"asset{n}.bin")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(rng.randbytes(rng.choice(SIZES)))
+
+
+def copy_everything(static_dir, public_dir):
+    # Delete the previous copy and copy every file again, one at a time
+    shutil.rmtree(public_dir, ignore_errors=True)
+    shutil.copytree(static_dir, public_dir)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        static_dir = os.path.join(tmp, "static")
+        make_static(static_dir)
+        seconds, _ = timed(copy_everything, static_dir, os.path.join(tmp, "serial"))
+        print(f"{'rmtree + copytree':>22} {seconds * 1000:8.1f} ms")
+        public_dir = os.path.join(tmp, "public")
+        seconds, report = timed(sync_assets, static_dir, public_dir)
+        print(f"{'sync_assets, cold':>22} {seconds * 1000:8.1f} ms  {report.format()}")
+        touched = os.path.join(static_dir, "dir0", "asset0.bin")
+        os.utime(touched, ns=(0, os.stat(touched).st_mtime_ns + 10**9))
+        seconds, report = timed(sync_assets, static_dir, public_dir)
+        print(f"{'sync_assets, 1 changed':>22} {seconds * 1000:8.1f} ms  {report.format()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_batch
+import random
+import time
+
+from converter import PROCESS, THREAD, Converter
+from md_to_html import markdown_to_html_node
+
+DOCUMENTS = 5000
+SIGNATURES = [
+    "> Sent from my phone",
+    "Thanks, the **team**",
+    "- [docs](https://example.com/docs)\n- [faq](https://example.com/faq)",
+]
+
+
+def comments(count, seed=13):
+    # Short comment bodies that repeat signatures and quoted replies, like a CMS thread
+    rng = random.Random(seed)
+    documents = []
+    for i in range(count):
+        body = (
+            f"Reply {i}: this is _really_ useful, see `item-{rng.randrange(100)}` "
+            f"and [the thread](https://example.com/t/{rng.randrange(1000)})."
+        )
+        documents.append(f"{body}\n\n{rng.choice(SIGNATURES)}")
+    return documents
+
+
+def throughput(func, documents):
+    start = time.perf_counter()
+    func(documents)
+    return len(documents) / (time.perf_counter() - start)
+
+
+def main():
+    documents = comments(DOCUMENTS)
+    cached = Converter()
+    runs = {
+        "plain loop": lambda docs: [markdown_to_html_node(doc) for doc in docs],
+        "Converter, no cache": Converter(cache_size=0).convert_many,
+        "Converter, single pass": Converter(0, single_pass=True).convert_many,
+        "Converter, inline cache": Converter(0, inline_cache_size=4096).convert_many,
+        "Converter, cached": cached.convert_many,
+        "Converter, 4 threads": lambda docs: cached.convert_many(docs, 4, THREAD),
+        "Converter, 4 processes": lambda docs: cached.convert_many(docs, 4, PROCESS),
+    }
+    base = None
+    print(f"{'run':<26} {'docs/s':>10} {'speedup':>8}")
+    for name, func in runs.items():
+        rate = throughput(func, documents)
+        base = base or rate
+        print(f"{name:<26} {rate:>10.0f} {rate / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_blocks
+import timeit
+
+from blocks import (
+    BlockType,
+    classify_block,
+    is_code_block,
+    is_heading_block,
+    is_ordered_list_block,
+    is_quote_block,
+    is_unordered_list_block,
+)
+
+ITEMS = 50
+SAMPLE_BLOCKS = {
+    BlockType.PARAGRAPH: "A paragraph with some **bold** text\nover two lines.",
+    BlockType.HEADING: "### A third level heading",
+    BlockType.CODE: "```\n" + "print('hello')\n" * ITEMS + "```",
+    BlockType.QUOTE: "\n".join(f"> quoted line {i}" for i in range(ITEMS)),
+    BlockType.UNORDERED: "\n".join(f"- item {i}" for i in range(ITEMS)),
+    BlockType.ORDERED: "\n".join(f"{i}. item {i}" for i in range(1, ITEMS + 1)),
+}
+
+
+def predicate_chain(block):
+    # block_to_blocktype before the table driven classifier
+    if is_heading_block(block):
+        return BlockType.HEADING
+    elif is_code_block(block):
+        return BlockType.CODE
+    elif is_quote_block(block):
+        return BlockType.QUOTE
+    elif is_unordered_list_block(block):
+        return BlockType.UNORDERED
+    elif is_ordered_list_block(block):
+        return BlockType.ORDERED
+    return BlockType.PARAGRAPH
+
+
+def chain_then_split(block):
+    # The builders used to split quote and list blocks again after classifying
+    block_type = predicate_chain(block)
+    if block_type in (BlockType.QUOTE, BlockType.UNORDERED, BlockType.ORDERED):
+        block.split("\n")
+    return block_type
+
+
+def time_call(func, block, number=20000):
+    return min(timeit.repeat(lambda: func(block), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'block type':>15} {'chain (us)':>11} {'table (us)':>11} {'speedup':>8}")
+    for block_type, block in SAMPLE_BLOCKS.items():
+        assert predicate_chain(block) == classify_block(block)[0] == block_type
+        chain = time_call(chain_then_split, block)
+        table = time_call(classify_block, block)
+        print(
+            f"{block_type.value:>15} {chain * 1e6:>11.2f} {table * 1e6:>11.2f} "
+            f"{chain / table:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_frozen
+import random
+import time
+import tracemalloc
+
+from frozennode import NodeTable
+from htmlnode import LeafNode, ParentNode
+
+POSTS = 5000
+TAGS = [f"tag-{n}" for n in range(30)]
+TAG_PAGES = 10
+
+
+def make_builders(variant):
+    if variant == "mutable":
+        return LeafNode, ParentNode
+    table = NodeTable()
+    return table.leaf, table.parent
+
+
+def build_pages(variant, seed=7):
+    """
+    Builds an index page listing every post and a page per tag listing its posts,
+    the kind of generated pages made of the same fragments over and over.
+    """
+    leaf, parent = make_builders(variant)
+    rng = random.Random(seed)
+    posts = []
+    for n in range(POSTS):
+        tags = rng.sample(TAGS, 3)
+        items = [
+            parent("li", [leaf("a", tag, {"href": f"/tags/{tag}.html"})])
+            for tag in tags
+        ]
+        entry = parent(
+            "li",
+            [
+                leaf("a", f"Post {n}", {"href": f"/posts/{n}.html"}),
+                leaf(None, " "),
+                leaf("span", "Filed under"),
+                parent("ul", items),
+            ],
+        )
+        posts.append((tags, entry))
+    pages = [parent("ul", [entry for _, entry in posts])]
+    for tag in TAGS[:TAG_PAGES]:
+        pages.append(parent("ul", [entry for tags, entry in posts if tag in tags]))
+    return pages
+
+
+def measure(variant):
+    tracemalloc.start()
+    pages = build_pages(variant)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    size = sum(len(page.to_html()) for page in pages)
+    seconds = time.perf_counter() - start
+    return traced, seconds, size
+
+
+def main():
+    print(f"{'variant':>8} {'traced MB':>10} {'serialize (ms)':>15}")
+    sizes = set()
+    for variant in ("mutable", "interned"):
+        traced, seconds, size = measure(variant)
+        sizes.add(size)
+        print(f"{variant:>8} {traced / 2**20:>10.1f} {seconds * 1000:>15.2f}")
+    assert len(sizes) == 1
+
+
+if __name__ == "__main__":
+    main()
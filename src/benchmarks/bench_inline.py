@@ -0,0 +1,33 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_inline
+import timeit
+
+from text_functions import text_to_text_nodes
+
+SPAN = (
+    "Some **bold text**, an _italic word_, a `code span`, "
+    "a [link](https://www.boot.dev) and an ![image](https://i.imgur.com/fJRm4Vk.jpeg). "
+)
+
+
+def make_paragraph(spans):
+    return SPAN * spans
+
+
+def time_call(func, text, number):
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'spans':>6} {'chained (ms)':>14} {'single pass (ms)':>18} {'speedup':>8}")
+    for spans in (1, 10, 100, 1000):
+        text = make_paragraph(spans)
+        number = max(1, 2000 // spans)
+        chained = time_call(text_to_text_nodes, text, number)
+        single = time_call(lambda t: text_to_text_nodes(t, single_pass=True), text, number)
+        print(
+            f"{spans:>6} {chained * 1000:>14.3f} {single * 1000:>18.3f} {chained / single:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_lazy
+import random
+import time
+
+from benchmarks.corpus import SEED, mixed_page
+from document import IncrementalDocument, LazyDocument
+from md_to_html import markdown_to_html_node
+
+PAGES = 2000
+REPEAT = 5
+
+
+def long_document():
+    # One long page, e.g. a reference manual, whose reader only wants a few blocks
+    rng = random.Random(SEED)
+    return "\n\n".join(mixed_page(rng) for _ in range(PAGES))
+
+
+def best_of(fn):
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main():
+    markdown = long_document()
+    blocks = len(LazyDocument(markdown))
+    print(f"{len(markdown) / 2**20:.1f} MB, {blocks} blocks")
+    cases = {
+        "markdown_to_html_node": lambda: markdown_to_html_node(markdown),
+        "LazyDocument.render()": lambda: LazyDocument(markdown).render(),
+        "LazyDocument index only": lambda: LazyDocument(markdown),
+        "LazyDocument.render(0, 5)": lambda: LazyDocument(markdown).render(0, 5),
+        "LazyDocument[blocks // 2]": lambda: LazyDocument(markdown)[blocks // 2],
+    }
+    for name, fn in cases.items():
+        print(f"{name:>26} {best_of(fn) * 1000:9.1f} ms")
+
+    # An editor preview: one keystroke in the middle, re-render what changed
+    doc = IncrementalDocument(markdown)
+    doc.render()
+    offset = doc.spans[blocks // 2][0] + 1
+
+    def keystroke():
+        first, _, added = doc.edit(offset, 0, "x")
+        doc[first : first + added]
+
+    def full_text():
+        first, _, added = doc.update(doc.buf[:offset] + "x" + doc.buf[offset:])
+        doc[first : first + added]
+
+    print(f"{'edit() a keystroke':>26} {best_of(keystroke) * 1000:9.1f} ms")
+    print(f"{'update() a keystroke':>26} {best_of(full_text) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
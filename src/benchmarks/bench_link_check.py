@@ -0,0 +1,64 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_link_check
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.corpus import SEED, words
+from build import build_site
+
+PAGES = 10000
+LINKS_PER_PAGE = 8
+# Share of links pointing to pages that do not exist
+BROKEN_SHARE = 0.01
+
+
+def write_site(content_dir):
+    rng = random.Random(SEED)
+    for n in range(PAGES):
+        links = []
+        for _ in range(LINKS_PER_PAGE):
+            target = rng.randrange(PAGES)
+            if rng.random() < BROKEN_SHARE:
+                target += PAGES
+            links.append(f"[{words(rng, 2)}](/section{target % 100}/page{target}.html)")
+        body = f"# Page {n}\n\n{words(rng, 20)} {' '.join(links)}\n\n![logo](/logo.png)"
+        path = os.path.join(content_dir, f"section{n % 100}", f"page{n}.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        write_site(content_dir)
+        for record_links in (False, True):
+            public_dir = os.path.join(tmp, f"public-{record_links}")
+            seconds, report = timed(
+                build_site,
+                content_dir,
+                public_dir,
+                incremental=False,
+                record_links=record_links,
+            )
+            print(f"build, record_links={record_links!s:>5} {seconds:7.3f} s")
+        open(os.path.join(public_dir, "logo.png"), "w").close()
+        seconds, broken = timed(report.links.broken, public_dir)
+        targets = sum(len(pages) for pages in report.links.internal.values())
+        print(
+            f"{'check':>24} {seconds:7.3f} s for {targets} links to "
+            f"{len(report.links.internal)} targets, {len(broken)} broken"
+        )
+        seconds, report = timed(build_site, content_dir, public_dir, record_links=True)
+        print(f"{'unchanged rebuild + index':>24} {seconds:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
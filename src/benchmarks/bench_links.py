@@ -0,0 +1,65 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_links
+import re
+import timeit
+
+from benchmarks.corpus import image_dense, link_dense
+from textnode import TextNode, TextType
+from text_functions import split_nodes_image, split_nodes_link
+
+
+def rescan_split(nodes_arr, find_regex, regex, text_type):
+    # split_nodes_link/image before the single scan rewrite: a search, a split and a
+    # findall per node, on uncompiled patterns that do not agree on what they match
+    new_nodes = []
+    for node in nodes_arr:
+        if not node.text or not re.search(find_regex, node.text):
+            new_nodes.append(node)
+            continue
+        texts = re.split(find_regex, node.text)
+        details = re.findall(regex, node.text)
+        for i, text in enumerate(texts):
+            if text:
+                new_nodes.append(TextNode(text, TextType.TEXT))
+            if i + 1 < len(texts):
+                new_nodes.append(TextNode(details[i][0], text_type, details[i][1]))
+    return new_nodes
+
+
+def rescan_split_link(nodes):
+    return rescan_split(
+        nodes,
+        r"(?<!!)\[[^\)]+\)",
+        r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)",
+        TextType.LINK,
+    )
+
+
+def rescan_split_image(nodes):
+    return rescan_split(
+        nodes, r"[!\[]{2}[^\)]+\)", r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", TextType.IMAGE
+    )
+
+
+def time_call(func, nodes, number=20):
+    return min(timeit.repeat(lambda: func(nodes), number=number, repeat=5)) / number
+
+
+def main():
+    runs = (
+        ("link dense", link_dense(), rescan_split_link, split_nodes_link),
+        ("image dense", image_dense(), rescan_split_image, split_nodes_image),
+    )
+    print(f"{'corpus':>12} {'rescan (ms)':>12} {'one scan (ms)':>14} {'speedup':>8}")
+    for name, markdown, rescan, one_scan in runs:
+        nodes = [TextNode(p, TextType.TEXT) for p in markdown.split("\n\n")]
+        assert rescan(nodes) == one_scan(nodes)
+        before = time_call(rescan, nodes)
+        after = time_call(one_scan, nodes)
+        print(
+            f"{name:>12} {before * 1000:>12.3f} {after * 1000:>14.3f} "
+            f"{before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
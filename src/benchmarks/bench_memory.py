@@ -0,0 +1,107 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_memory
+import multiprocessing
+import resource
+import tracemalloc
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+SPAN = "Some **bold text**, an _italic word_ and a [link](https://www.boot.dev). "
+PARAGRAPHS = 20000
+SPANS_PER_PARAGRAPH = 5
+
+
+# The node classes as they were before __slots__, kept for comparison
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+class DictLeafNode(DictHTMLNode):
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag, value, None, props)
+
+
+class DictParentNode(DictHTMLNode):
+    def __init__(self, tag=None, children=None, props=None):
+        super().__init__(tag, None, children, props)
+
+
+VARIANTS = {
+    "dict": (DictTextNode, DictLeafNode, DictParentNode),
+    "slots": (TextNode, LeafNode, ParentNode),
+}
+
+
+def build_document(variant):
+    """
+    Builds the text and html nodes of a large document from pre-split spans,
+    so only node allocations are measured. Returns (nodes, node count).
+    """
+    text_cls, leaf_cls, parent_cls = VARIANTS[variant]
+    spans = [
+        ("Some ", TextType.TEXT, None),
+        ("bold text", TextType.BOLD, None),
+        (", an ", TextType.TEXT, None),
+        ("italic word", TextType.ITALIC, None),
+        (" and a ", TextType.TEXT, None),
+        ("link", TextType.LINK, "https://www.boot.dev"),
+        (". ", TextType.TEXT, None),
+    ] * SPANS_PER_PARAGRAPH
+    tags = {TextType.TEXT: None, TextType.BOLD: "b", TextType.ITALIC: "i"}
+    document = []
+    count = 0
+    for _ in range(PARAGRAPHS):
+        text_nodes = [text_cls(text, text_type, url) for text, text_type, url in spans]
+        children = []
+        for node in text_nodes:
+            if node.text_type == TextType.LINK:
+                children.append(leaf_cls("a", node.text, {"href": node.url}))
+            else:
+                children.append(leaf_cls(tags[node.text_type], node.text))
+        document.append(parent_cls("p", children))
+        document.append(text_nodes)
+        count += len(text_nodes) + len(children) + 1
+    return document, count
+
+
+def measure(variant, results):
+    tracemalloc.start()
+    document, count = build_document(variant)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((variant, count, current, peak_rss_kb))
+    del document
+
+
+def main():
+    # One process per variant so each peak RSS only covers its own nodes
+    results = multiprocessing.Queue()
+    print(
+        f"{'variant':>8} {'nodes':>9} {'traced MB':>10} {'bytes/node':>11} "
+        f"{'peak RSS MB':>12}"
+    )
+    for variant in VARIANTS:
+        process = multiprocessing.Process(target=measure, args=(variant, results))
+        process.start()
+        variant, count, traced, peak_rss_kb = results.get()
+        process.join()
+        print(
+            f"{variant:>8} {count:>9} {traced / 2**20:>10.1f} {traced / count:>11.1f} "
+            f"{peak_rss_kb / 1024:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_mmap
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+
+from benchmarks.corpus import SEED, inline_heavy_paragraph, words
+from md_to_html import markdown_file_to_html, markdown_to_html
+
+TARGET_MB = 64
+
+
+def write_reference_doc(path, target_mb=TARGET_MB):
+    # A generated reference doc: sections of headings, paragraphs and code
+    rng = random.Random(SEED)
+    size = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while size < target_mb * 2**20:
+            code = "\n".join(words(rng, 8) for _ in range(40))
+            section = (
+                f"## {words(rng, 4)}\n\n{inline_heavy_paragraph(rng, spans=8)}\n\n"
+                f"```\n{code}\n```\n\n"
+            )
+            size += f.write(section)
+
+
+def read_whole(path, sink):
+    with open(path, encoding="utf-8") as f:
+        markdown_to_html(f.read(), sink)
+
+
+def stream_lines(path, sink):
+    with open(path, encoding="utf-8") as f:
+        markdown_to_html(f, sink)
+
+
+def memory_map(path, sink):
+    markdown_file_to_html(path, sink)
+
+
+MODES = {"read()": read_whole, "lines": stream_lines, "mmap": memory_map}
+
+
+def measure(mode, path, results):
+    start = time.perf_counter()
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        MODES[mode](path, sink)
+    seconds = time.perf_counter() - start
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((seconds, peak_rss_kb))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reference.md")
+        write_reference_doc(path)
+        print(f"{os.path.getsize(path) / 2**20:.0f} MB source")
+        print(f"{'mode':>7} {'seconds':>8} {'peak RSS MB':>12}")
+        results = multiprocessing.Queue()
+        # One process per mode so each peak RSS only covers that mode
+        for mode in MODES:
+            process = multiprocessing.Process(
+                target=measure, args=(mode, path, results)
+            )
+            process.start()
+            seconds, peak_rss_kb = results.get()
+            process.join()
+            print(f"{mode:>7} {seconds:>8.2f} {peak_rss_kb / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
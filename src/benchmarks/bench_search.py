@@ -0,0 +1,60 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_search
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import many_small_files
+from build import build_site
+from search import DOCS_NAME, SEARCH_DIR
+
+PAGES = 5000
+
+
+def write_site(content_dir):
+    for n, markdown in enumerate(many_small_files(PAGES)):
+        path = os.path.join(content_dir, f"section{n % 50}", f"page{n}.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+
+
+def timed_build(content_dir, public_dir, **options):
+    start = time.perf_counter()
+    report = build_site(content_dir, public_dir, workers=1, **options)
+    return time.perf_counter() - start, report
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        write_site(content_dir)
+        seconds, _ = timed_build(content_dir, os.path.join(tmp, "plain"))
+        print(f"{'build':>28} {seconds:7.3f} s")
+        public_dir = os.path.join(tmp, "public")
+        seconds, report = timed_build(content_dir, public_dir, search_index=True)
+        print(f"{'build + search index':>28} {seconds:7.3f} s")
+        index_dir = os.path.join(public_dir, SEARCH_DIR)
+        docs = os.path.getsize(os.path.join(index_dir, DOCS_NAME))
+        search = report.search
+        print(
+            f"{search['pages']} pages, {search['terms']} terms in {search['shards']} "
+            f"shards, {search['bytes'] / 2**20:.1f} MB, "
+            f"largest shard {max_shard(index_dir) / 1024:.0f} KB, "
+            f"docs {docs / 1024:.0f} KB"
+        )
+        with open(os.path.join(content_dir, "section0", "page0.md"), "a") as f:
+            f.write("\n\nOne more paragraph.")
+        seconds, report = timed_build(content_dir, public_dir, search_index=True)
+        print(f"{'one page changed + index':>28} {seconds:7.3f} s")
+
+
+def max_shard(index_dir):
+    return max(
+        os.path.getsize(os.path.join(index_dir, name))
+        for name in os.listdir(index_dir)
+        if name != DOCS_NAME
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_serialize
+import sys
+import timeit
+
+from htmlnode import LeafNode, ParentNode
+from serializer import attrs_to_html, close_tag, escape_text, open_tag, serialize
+
+WIDTH = 20000
+DEPTH = 400
+DEEP_COPIES = 50
+VERY_DEEP = sys.getrecursionlimit() * 2
+
+
+def legacy_to_html(node):
+    # LeafNode/ParentNode.to_html before the serializer: f-string tags per node,
+    # props_to_html rebuilt on every call, nested generators and no escaping
+    if node.children is None:
+        if not node.tag:
+            return node.value
+        return f"<{node.tag}{node.props_to_html()}>{node.value}</{node.tag}>"
+    return "".join(legacy_iter_html(node))
+
+
+def legacy_iter_html(node):
+    yield f"<{node.tag}{node.props_to_html()}>"
+    for child in node.children:
+        if child.children is None:
+            yield legacy_to_html(child)
+        else:
+            yield from legacy_iter_html(child)
+    yield f"</{node.tag}>"
+
+
+def recursive_serialize(node):
+    # The serializer before the explicit stack, one Python call per parent node
+    parts = []
+    recursive_emit(node, parts.append)
+    return "".join(parts)
+
+
+def recursive_emit(node, emit):
+    emit(open_tag(node.tag, node.props))
+    for child in node.children:
+        if child.memoized:
+            emit(child.to_html())
+            continue
+        if child.children is not None:
+            recursive_emit(child, emit)
+            continue
+        value = child.value if child.raw else escape_text(child.value)
+        tag = child.tag
+        if tag is None:
+            emit(value)
+        elif child.props:
+            emit(f"<{tag}{attrs_to_html(child.props)}>{value}</{tag}>")
+        else:
+            emit(f"<{tag}>{value}</{tag}>")
+    emit(close_tag(node.tag))
+
+
+RENDERERS = {
+    "to_html before": legacy_to_html,
+    "recursive": recursive_serialize,
+    "explicit stack": serialize,
+}
+
+
+def wide_tree():
+    # One list with many items, each a link and some text, like an index page
+    items = [
+        ParentNode(
+            "li",
+            [
+                LeafNode("a", f"Post {n}", {"href": f"/posts/{n}", "class": "post"}),
+                LeafNode(None, " - a short summary of the post"),
+            ],
+        )
+        for n in range(WIDTH)
+    ]
+    return ParentNode("ul", items)
+
+
+def deep_tree(depth=DEPTH, copies=DEEP_COPIES):
+    # Deeply nested sections, like machine generated outlines
+    nodes = []
+    for _ in range(copies):
+        node = LeafNode("code", "value")
+        for level in range(depth):
+            node = ParentNode("div", [LeafNode("span", f"level {level}"), node])
+        nodes.append(node)
+    return ParentNode("body", nodes)
+
+
+def time_call(func, tree, number=3):
+    try:
+        timer = timeit.repeat(lambda: func(tree), number=number, repeat=5)
+    except RecursionError:
+        return None
+    return min(timer) / number
+
+
+def main():
+    trees = {
+        "wide": wide_tree(),
+        "deep": deep_tree(),
+        f"depth {VERY_DEEP}": deep_tree(VERY_DEEP, copies=1),
+    }
+    print(f"{'tree':>12}" + "".join(f" {name + ' (ms)':>20}" for name in RENDERERS))
+    for name, tree in trees.items():
+        row = f"{name:>12}"
+        for func in RENDERERS.values():
+            seconds = time_call(func, tree)
+            if seconds is None:
+                row += f" {'RecursionError':>20}"
+            else:
+                row += f" {seconds * 1000:>20.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
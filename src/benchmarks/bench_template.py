@@ -0,0 +1,56 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_template
+import time
+
+from benchmarks.corpus import many_small_files
+from md_to_html import markdown_to_html_node
+from template import Template, extract_title
+
+LAYOUT = """<!doctype html>
+<html>
+  <head>
+    <title>{{ Title }}</title>
+    <link rel="stylesheet" href="/styles.css" />
+  </head>
+  <body>
+    {{ Nav }}
+    <article>{{ Content }}</article>
+    {{ Footer }}
+  </body>
+</html>
+"""
+NAV = "<nav>" + "".join(f'<a href="/docs/{n}.html">Page {n}</a>' for n in range(40))
+FOOTER = "<footer>" + "<p>Built with pygenstat</p>" * 10 + "</footer>"
+REPEAT = 5
+
+
+def replace_each_page(pages):
+    # Reading and filling the layout by str.replace for every page
+    for html in pages:
+        (
+            LAYOUT.replace("{{ Nav }}", NAV)
+            .replace("{{ Footer }}", FOOTER)
+            .replace("{{ Title }}", extract_title(html))
+            .replace("{{ Content }}", html)
+        )
+
+
+def compiled_once(pages):
+    template = Template(LAYOUT, {"Nav": NAV, "Footer": FOOTER})
+    for html in pages:
+        template.render_page(html)
+
+
+def main():
+    pages = [markdown_to_html_node(markdown) for markdown in many_small_files(5000)]
+    for name, fill in (("str.replace", replace_each_page), ("Template", compiled_once)):
+        best = None
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            fill(pages)
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        print(f"{name:>12} {best * 1000:8.1f} ms for {len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main()
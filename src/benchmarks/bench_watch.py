@@ -0,0 +1,64 @@
+# Run from the repo root with: PYTHONPATH=src python3 -m benchmarks.bench_watch
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.corpus import many_small_files
+from build import build_site
+from serve import Watcher
+
+PAGES = 10000
+POLLS = 20
+
+
+def write_site(content_dir):
+    for n, markdown in enumerate(many_small_files(PAGES)):
+        path = os.path.join(content_dir, f"section{n % 100}", f"page{n}.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+
+
+def timed_polls(watcher, edit=None):
+    """
+    Returns the median poll time, and of the save to html latency if edit is given.
+    """
+    polls, latencies = [], []
+    for n in range(POLLS):
+        if edit:
+            with open(edit, "a", encoding="utf-8") as f:
+                f.write(f"\n\nEdit {n}.")
+        start = time.perf_counter()
+        rebuild = watcher.poll()
+        polls.append(time.perf_counter() - start)
+        latencies.extend(rebuild.latencies)
+    latency = statistics.median(latencies) if latencies else 0.0
+    return statistics.median(polls), latency
+
+
+def report(name, watcher, edit):
+    idle, _ = timed_polls(watcher)
+    poll, latency = timed_polls(watcher, edit)
+    print(
+        f"{name:>30} idle poll {idle * 1000:6.1f} ms, edited poll "
+        f"{poll * 1000:6.1f} ms, save to html {latency * 1000:6.1f} ms"
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        write_site(content_dir)
+        edit = os.path.join(content_dir, "section0", "page0.md")
+        public_dir = os.path.join(tmp, "public")
+        build_site(content_dir, public_dir)
+        report(f"{PAGES} pages", Watcher(content_dir, public_dir), edit)
+        public_dir = os.path.join(tmp, "indexed")
+        build_site(content_dir, public_dir, record_links=True, search_index=True)
+        watcher = Watcher(content_dir, public_dir)
+        report(f"{PAGES} pages, links + search", watcher, edit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import random
+
+# Seeded so every run benchmarks exactly the same documents
+SEED = 1234
+WORDS = (
+    "static site generator markdown block inline parser node render html "
+    "page content public build template link image code quote list item"
+).split()
+
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def inline_span(rng):
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"**{words(rng, 2)}**"
+    elif kind == 1:
+        return f"_{words(rng, 2)}_"
+    elif kind == 2:
+        return f"`{words(rng, 1)}`"
+    elif kind == 3:
+        return f"[{words(rng, 2)}](https://example.com/{rng.choice(WORDS)})"
+    return f"![{words(rng, 2)}](https://example.com/{rng.choice(WORDS)}.png)"
+
+
+def inline_heavy_paragraph(rng, spans=40):
+    return " ".join(f"{words(rng, 3)} {inline_span(rng)}" for _ in range(spans))
+
+
+def inline_heavy(paragraphs=50):
+    """
+    A page of long paragraphs packed with bold, italic, code, link and image spans.
+    """
+    rng = random.Random(SEED)
+    return "\n\n".join(inline_heavy_paragraph(rng) for _ in range(paragraphs))
+
+
+def link_span(rng, image=False):
+    prefix = "!" if image else ""
+    return f"{prefix}[{words(rng, 2)}](https://example.com/{rng.choice(WORDS)})"
+
+
+def link_dense(paragraphs=50, links=60):
+    """
+    A page of paragraphs that are mostly links, as in link lists and footers.
+    """
+    rng = random.Random(SEED)
+    return "\n\n".join(
+        " ".join(f"{words(rng, 2)} {link_span(rng)}" for _ in range(links))
+        for _ in range(paragraphs)
+    )
+
+
+def image_dense(paragraphs=50, images=60):
+    """
+    A page of paragraphs that are mostly images, as in galleries.
+    """
+    rng = random.Random(SEED)
+    return "\n\n".join(
+        " ".join(link_span(rng, image=True) for _ in range(images))
+        for _ in range(paragraphs)
+    )
+
+
+def deep_lists(lists=20, items=200):
+    """
+    A page of long unordered and ordered lists.
+    """
+    rng = random.Random(SEED)
+    blocks = []
+    for i in range(lists):
+        if i % 2:
+            lines = [f"{n}. {words(rng, 6)}" for n in range(1, items + 1)]
+        else:
+            lines = [f"- {words(rng, 6)}" for _ in range(items)]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def huge_code(lines=20000):
+    """
+    A page that is one very large fenced code block, blank lines included.
+    """
+    rng = random.Random(SEED)
+    code = [words(rng, 8) if n % 10 else "" for n in range(lines)]
+    return "```\n" + "\n".join(code) + "\n```"
+
+
+def mixed_page(rng):
+    blocks = [f"# {words(rng, 4)}"]
+    for _ in range(rng.randint(3, 8)):
+        kind = rng.randrange(4)
+        if kind == 0:
+            blocks.append(f"## {words(rng, 3)}")
+        elif kind == 1:
+            blocks.append("\n".join(f"- {words(rng, 4)}" for _ in range(5)))
+        elif kind == 2:
+            blocks.append(f"> {words(rng, 12)}")
+        blocks.append(inline_heavy_paragraph(rng, spans=4))
+    return "\n\n".join(blocks)
+
+
+def many_small_files(files=500):
+    """
+    Many short pages with headings, lists, quotes and paragraphs, as in a docs site.
+    """
+    rng = random.Random(SEED)
+    return [mixed_page(rng) for _ in range(files)]
+
+
+CORPORA = {
+    "inline_heavy": inline_heavy,
+    "link_dense": link_dense,
+    "image_dense": image_dense,
+    "deep_lists": deep_lists,
+    "huge_code": huge_code,
+    "many_small_files": many_small_files,
+}
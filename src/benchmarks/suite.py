@@ -0,0 +1,157 @@
+import json
+import platform
+import time
+
+from benchmarks.corpus import CORPORA
+from blocks import BlockType, block_to_blocktype
+from htmlnode import ParentNode
+from md_to_html import block_to_html_node, markdown_to_html_node
+from textnode import TextNode, TextType
+from text_functions import (
+    markdown_to_blocks,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_text_nodes,
+)
+
+DEFAULT_THRESHOLD = 0.25
+RESULTS_FORMAT = 1
+
+
+def load_documents(name):
+    documents = CORPORA[name]()
+    return documents if isinstance(documents, list) else [documents]
+
+
+def make_stages(documents):
+    """
+    Returns {stage name: callable} timing each pipeline stage on its own, with
+    the inputs of later stages prepared up front so only that stage is timed.
+    """
+    blocks = [block for doc in documents for block in markdown_to_blocks(doc)]
+    paragraphs = [b for b in blocks if block_to_blocktype(b) == BlockType.PARAGRAPH]
+    trees = [
+        ParentNode("div", [block_to_html_node(b) for b in markdown_to_blocks(doc)])
+        for doc in documents
+    ]
+
+    text_nodes = [[TextNode(paragraph, TextType.TEXT)] for paragraph in paragraphs]
+
+    def inline():
+        for paragraph in paragraphs:
+            text_to_text_nodes(paragraph)
+
+    def links():
+        for nodes in text_nodes:
+            split_nodes_link(nodes)
+
+    def images():
+        for nodes in text_nodes:
+            split_nodes_image(nodes)
+
+    def split():
+        for doc in documents:
+            markdown_to_blocks(doc)
+
+    def classify():
+        for block in blocks:
+            block_to_blocktype(block)
+
+    def convert():
+        for doc in documents:
+            markdown_to_html_node(doc)
+
+    def serialize():
+        for tree in trees:
+            tree.to_html()
+
+    stages = {
+        "markdown_to_blocks": split,
+        "block_to_blocktype": classify,
+        "markdown_to_html_node": convert,
+        "ParentNode.to_html": serialize,
+    }
+    if paragraphs:
+        stages["text_to_text_nodes"] = inline
+        stages["split_nodes_link"] = links
+        stages["split_nodes_image"] = images
+    return stages
+
+
+def time_stage(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "mean": sum(times) / len(times)}
+
+
+def run_suite(repeat=5, only=None):
+    """
+    Times every stage on every corpus.
+
+    Args:
+        repeat - (int) runs per benchmark, the fastest is the one compared
+        only - (str) or None, run only benchmarks whose name contains it
+
+    Returns:
+        dict of results, see write_results
+    """
+    results = {}
+    for corpus in CORPORA:
+        stages = make_stages(load_documents(corpus))
+        for stage, func in stages.items():
+            name = f"{corpus}/{stage}"
+            if only and only not in name:
+                continue
+            results[name] = time_stage(func, repeat)
+    return {
+        "format": RESULTS_FORMAT,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def write_results(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares the fastest time of each benchmark against the baseline.
+
+    Returns:
+        list of (name, baseline seconds, current seconds, ratio) for every
+        benchmark slower than the baseline by more than threshold (0.25 = 25%)
+    """
+    regressions = []
+    for name, current in results["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        ratio = current["min"] / base["min"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["min"], current["min"], ratio))
+    return regressions
+
+
+def format_results(results, baseline=None):
+    lines = [f"{'benchmark':<40} {'min (ms)':>10} {'mean (ms)':>10} {'vs base':>8}"]
+    for name, timing in sorted(results["results"].items()):
+        base = baseline["results"].get(name) if baseline else None
+        ratio = f"{timing['min'] / base['min']:>7.2f}x" if base else f"{'-':>8}"
+        lines.append(
+            f"{name:<40} {timing['min'] * 1000:>10.3f} {timing['mean'] * 1000:>10.3f} "
+            f"{ratio}"
+        )
+    return "\n".join(lines)
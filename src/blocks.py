@@ -66,33 +66,92 @@ def is_ordered_list_block(block):
     return is_ordered
 
 
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+def heading_level(block):
+    """
+    Returns the heading level (1-6) of block, or 0 if it is not a heading.
+    """
+    # Only look at the first 7 characters, "####### " is not a heading
+    prefix = block[:7]
+    level = len(prefix) - len(prefix.lstrip("#"))
+    if 1 <= level <= 6 and block[level : level + 1] == " ":
+        return level
+    return 0
+
+
 def determine_heading_number(block):
-    if block.startswith("# "):
-        return "h1"
-    elif block.startswith("## "):
-        return "h2"
-    elif block.startswith("### "):
-        return "h3"
-    elif block.startswith("#### "):
-        return "h4"
-    elif block.startswith("##### "):
-        return "h5"
-    elif block.startswith("###### "):
-        return "h6"
-    else:
+    level = heading_level(block)
+    if not level:
         raise Exception("Unknown heading type")
+    return HEADING_TAGS[level - 1]
+
+
+# Table driven classification, see classify_block
+def classify_heading(block):
+    if heading_level(block):
+        return BlockType.HEADING, None
+    return BlockType.PARAGRAPH, None
+
+
+def classify_code(block):
+    if block.endswith("```") and block.startswith("```"):
+        return BlockType.CODE, None
+    return BlockType.PARAGRAPH, None
+
+
+def classify_quote(block):
+    lines = block.split("\n")
+    for line in lines:
+        if not line.startswith(">"):
+            return BlockType.PARAGRAPH, None
+    return BlockType.QUOTE, lines
+
+
+def classify_unordered_list(block):
+    lines = block.split("\n")
+    for line in lines:
+        if not line.startswith("- "):
+            return BlockType.PARAGRAPH, None
+    return BlockType.UNORDERED, lines
+
+
+def classify_ordered_list(block):
+    if not block.startswith("1. "):
+        return BlockType.PARAGRAPH, None
+    lines = block.split("\n")
+    for count, line in enumerate(lines, 1):
+        supposed_num, sep, _ = line.partition(". ")
+        if not sep or not supposed_num.isnumeric() or int(supposed_num) != count:
+            return BlockType.PARAGRAPH, None
+    return BlockType.ORDERED, lines
+
+
+# Every block type other than paragraph is decided by the block's first character
+BLOCK_CLASSIFIERS = {
+    "#": classify_heading,
+    "`": classify_code,
+    ">": classify_quote,
+    "-": classify_unordered_list,
+    "1": classify_ordered_list,
+}
+
+
+def classify_block(block):
+    """
+    Classifies a block by dispatching on its first character, splitting it
+    into lines at most once.
+
+    Returns:
+        (block_type, lines) - lines is the block split on newlines for quote
+        and list blocks, so the html builders need not split it again, else None
+    """
+    classifier = BLOCK_CLASSIFIERS.get(block[:1])
+    if classifier is None:
+        return BlockType.PARAGRAPH, None
+    return classifier(block)
 
 
 def block_to_blocktype(block):
-    if is_heading_block(block):
-        return BlockType.HEADING
-    elif is_code_block(block):
-        return BlockType.CODE
-    elif is_quote_block(block):
-        return BlockType.QUOTE
-    elif is_unordered_list_block(block):
-        return BlockType.UNORDERED
-    elif is_ordered_list_block(block):
-        return BlockType.ORDERED
-    else:
-        return BlockType.PARAGRAPH
+    return classify_block(block)[0]
@@ -0,0 +1,483 @@
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import instrument
+from atomic import atomic_path
+from cache import BlockCache, InlineCache
+from manifest import MANIFEST_NAME, Manifest, converter_version
+from links import LinkIndex, LinkRecorder, extract_links
+from md_to_html import markdown_file_to_html, markdown_to_html_node
+from search import PageIndexer, build_search_index
+from template import load_template
+
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+NO_CONTENT_DIR_ERROR = "build error: content directory does not exist"
+
+
+CACHE_COUNTERS = ("hits", "disk_hits", "misses", "evictions")
+INLINE_CACHE_COUNTERS = ("hits", "misses", "evictions")
+
+# The block and inline caches of this process, whether to profile pages, the
+# page template and whether to record links and index pages, set up by init_worker
+_block_cache = None
+_inline_cache = None
+_profile_pages = False
+_template = None
+_record_links = False
+_search_index = False
+
+
+class PageResult:
+    def __init__(
+        self,
+        source,
+        output,
+        seconds,
+        error=None,
+        cache_stats=None,
+        profile=None,
+        links=None,
+        search=None,
+    ):
+        """
+        Outcome of converting one markdown file
+
+        Attrs:
+            self.source - (str) path of the markdown file
+            self.output - (str) path of the html file written
+            self.seconds - (float) wall time spent converting the file
+            self.error - (str) or None, the error message if the conversion failed
+            self.cache_stats - (dict) or None, block cache counters for this page alone,
+                inline cache counters are prefixed with "inline_"
+            self.profile - (dict) or None, instrument.Profiler counters for this page
+            self.links - (list) or None, the link and image targets of the page
+            self.search - (dict) or None, the page's search.PageIndexer.to_dict()
+        """
+        self.source = source
+        self.output = output
+        self.seconds = seconds
+        self.error = error
+        self.cache_stats = cache_stats
+        self.profile = profile
+        self.links = links
+        self.search = search
+
+    def __repr__(self):
+        return f"PageResult({self.source}, {self.output}, {self.seconds:.4f}, {self.error})"
+
+
+class BuildReport:
+    def __init__(
+        self,
+        pages,
+        seconds,
+        workers,
+        unchanged=None,
+        removed=None,
+        links=None,
+        search=None,
+    ):
+        """
+        Outcome of a whole site build
+
+        Attrs:
+            self.pages - (list) of PageResult for the pages converted, in content directory order
+            self.seconds - (float) wall time of the whole build
+            self.workers - (int) number of worker processes used
+            self.unchanged - (list) of source paths skipped as already up to date
+            self.removed - (list) of output paths deleted because their source is gone
+            self.links - links.LinkIndex of every page of the site, None unless
+                links were recorded
+            self.search - (dict) or None, what search.build_search_index wrote
+        """
+        self.pages = pages
+        self.seconds = seconds
+        self.workers = workers
+        self.unchanged = unchanged or []
+        self.removed = removed or []
+        self.links = links
+        self.search = search
+
+    @property
+    def failed(self):
+        return [page for page in self.pages if page.error]
+
+    def cache_stats(self):
+        """
+        Returns the block and inline cache counters summed over every page and worker, None without a cache.
+        """
+        stats = None
+        for page in self.pages:
+            if page.cache_stats is None:
+                continue
+            if stats is None:
+                stats = dict.fromkeys(page.cache_stats, 0)
+            for counter, value in page.cache_stats.items():
+                stats[counter] += value
+        return stats
+
+    def profile(self):
+        """
+        Returns an instrument.Profiler summing every page's profile, None if pages were not profiled.
+        """
+        profiles = [page.profile for page in self.pages if page.profile]
+        if not profiles:
+            return None
+        profiler = instrument.Profiler()
+        for profile in profiles:
+            profiler.merge(profile)
+        return profiler
+
+    def format(self, per_file=True):
+        lines = []
+        if per_file:
+            for page in self.pages:
+                status = f"ERROR {page.error}" if page.error else "ok"
+                lines.append(f"{page.seconds * 1000:9.2f} ms  {page.source}  {status}")
+        converted = len(self.pages) - len(self.failed)
+        cache_stats = self.cache_stats()
+        if cache_stats:
+            lines.append(
+                "Block cache: "
+                + ", ".join(f"{k} {v}" for k, v in cache_stats.items())
+            )
+        if self.search:
+            lines.append(
+                f"Search index: {self.search['pages']} pages, "
+                f"{self.search['terms']} terms in {self.search['shards']} shards, "
+                f"{self.search['bytes'] / 1024:.0f} KB"
+            )
+        lines.append(
+            f"Built {converted}/{len(self.pages)} pages in {self.seconds:.3f} s "
+            f"with {self.workers} worker(s), {len(self.unchanged)} unchanged, "
+            f"{len(self.removed)} removed"
+        )
+        return "\n".join(lines)
+
+
+def find_markdown_files(content_dir):
+    """
+    Yields the paths of markdown files under content_dir, relative to it, in sorted order.
+    """
+    for root, dirs, files in os.walk(content_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(MARKDOWN_EXTENSIONS):
+                yield os.path.relpath(os.path.join(root, name), content_dir)
+
+
+def output_path(rel_path, public_dir):
+    return os.path.join(public_dir, os.path.splitext(rel_path)[0] + ".html")
+
+
+class BuildPlan:
+    def __init__(
+        self,
+        content_dir,
+        public_dir,
+        incremental=True,
+        manifest_path=None,
+        template_hash="",
+        record_links=False,
+        search_index=False,
+    ):
+        """
+        Works out which pages a build has to convert. Outputs whose source was
+        removed are deleted straight away.
+
+        Args:
+            see build_site
+
+        Attrs:
+            self.manifest - manifest.Manifest of the previous build, empty if not incremental
+            self.sources - (list) of source paths to convert
+            self.outputs - (list) of the html path for each of self.sources
+            self.unchanged - (list) of source paths that are already up to date
+            self.removed - (list) of output paths deleted
+        """
+        if not os.path.isdir(content_dir):
+            raise ValueError(NO_CONTENT_DIR_ERROR)
+        self.manifest_path = manifest_path or os.path.join(public_dir, MANIFEST_NAME)
+        if incremental:
+            self.manifest = Manifest.load(
+                self.manifest_path, converter_version(), template_hash
+            )
+        else:
+            self.manifest = Manifest(converter_version(), template_hash)
+
+        rel_paths = list(find_markdown_files(content_dir))
+        self.removed = []
+        for rel_path, output in self.manifest.removed(rel_paths):
+            if os.path.exists(output):
+                os.remove(output)
+                self.removed.append(output)
+            self.manifest.forget(rel_path)
+
+        self.stale, self.entries, self.unchanged = [], [], []
+        for rel_path in rel_paths:
+            source = os.path.join(content_dir, rel_path)
+            output = output_path(rel_path, public_dir)
+            fresh, entry = self.manifest.check(rel_path, source, output)
+            # Pages built before links were recorded, or before they were indexed,
+            # are built again to get them
+            if (
+                fresh
+                and (not record_links or "links" in entry)
+                and (not search_index or "search" in entry)
+            ):
+                self.unchanged.append(source)
+            else:
+                self.stale.append(rel_path)
+                self.entries.append(entry)
+        self.sources = [os.path.join(content_dir, rel_path) for rel_path in self.stale]
+        self.outputs = [entry["output"] for entry in self.entries]
+
+    def finish(self, pages):
+        """
+        Records the converted pages, one PageResult per source in order, and saves the manifest.
+        """
+        for rel_path, entry, page in zip(self.stale, self.entries, pages):
+            if page.error:
+                self.manifest.fail(rel_path, entry["output"])
+                continue
+            if page.links is not None:
+                entry["links"] = page.links
+            if page.search is not None:
+                entry["search"] = page.search
+            self.manifest.record(rel_path, entry)
+        self.manifest.save(self.manifest_path)
+
+
+def init_worker(
+    cache_size=0,
+    cache_path=None,
+    profile=False,
+    inline_cache_size=0,
+    template=None,
+    record_links=False,
+    search_index=False,
+):
+    """
+    Sets up the block and inline caches used by convert_file in this process.
+    Every worker keeps its own memory tiers, the disk tier at cache_path is
+    shared. With profile, every page is converted inside instrument.profile().
+    With a template.Template, compiled once by the caller and sent to each
+    worker once, every page is wrapped in it. With record_links, the link and
+    image targets of every page are returned in its PageResult, and with
+    search_index its search.PageIndexer data, its headings getting ids.
+    """
+    global _block_cache, _inline_cache, _profile_pages, _template
+    global _record_links, _search_index
+    _profile_pages = profile
+    _template = template
+    _record_links = record_links
+    _search_index = search_index
+    if cache_size or cache_path:
+        _block_cache = BlockCache(cache_size or 1, cache_path)
+    else:
+        _block_cache = None
+    _inline_cache = InlineCache(inline_cache_size) if inline_cache_size else None
+
+
+def cache_counters():
+    counters = {}
+    if _block_cache is not None:
+        stats = _block_cache.stats()
+        counters.update((k, stats[k]) for k in CACHE_COUNTERS)
+    if _inline_cache is not None:
+        stats = _inline_cache.stats()
+        counters.update((f"inline_{k}", stats[k]) for k in INLINE_CACHE_COUNTERS)
+    return counters
+
+
+def run_page(convert):
+    """
+    Calls convert(cache, inline_cache) with this process's caches, profiling
+    it if init_worker asked for it.
+
+    Returns:
+        (error, cache_stats, profile) - error is the message of any exception
+        raised by convert, else None. See PageResult for the others
+    """
+    before = cache_counters()
+    profiling = instrument.profile() if _profile_pages else contextlib.nullcontext()
+    with profiling as profiler:
+        try:
+            convert(_block_cache, _inline_cache)
+            error = None
+        except Exception as e:
+            error = str(e)
+    cache_stats = None
+    if before:
+        after = cache_counters()
+        cache_stats = {k: after[k] - before[k] for k in before}
+    profile = profiler.to_dict() if profiler is not None else None
+    return error, cache_stats, profile
+
+
+def convert_file(source, output):
+    """
+    Converts one markdown file to html. Runs in the worker processes, so
+    errors are returned in the PageResult rather than raised.
+    """
+    start = time.perf_counter()
+    recorders = []
+    indexers = []
+
+    def convert(cache, inline_cache):
+        # A failed page never leaves partial html
+        with atomic_path(output) as tmp_output:
+            with open(tmp_output, "w", encoding="utf-8") as dst:
+                # The title comes from the html, a templated page is rendered first
+                html = dst if _template is None else io.StringIO()
+                sink = html
+                # Only the content is recorded, the template is the same on every page
+                if _record_links:
+                    sink = LinkRecorder(sink)
+                    recorders.append(sink)
+                if _search_index:
+                    # Outermost, the html with heading ids is what gets written
+                    sink = PageIndexer(sink)
+                    indexers.append(sink)
+                markdown_file_to_html(source, sink, cache, inline_cache=inline_cache)
+                if _template is not None:
+                    dst.write(_template.render_page(html.getvalue()))
+
+    error, cache_stats, profile = run_page(convert)
+    links = recorders[0].targets if recorders and not error else None
+    search = indexers[0].to_dict() if indexers and not error else None
+    seconds = time.perf_counter() - start
+    return PageResult(
+        source, output, seconds, error, cache_stats, profile, links, search
+    )
+
+
+def convert_markdown(markdown):
+    """
+    Converts markdown text to html in a worker process, leaving file I/O to the caller.
+
+    Returns:
+        (html, error, cache_stats, profile, links, search) - html is None if the
+        conversion failed, links and search as recorded by convert_file
+    """
+    pages = []
+    links = []
+    indexers = []
+
+    def convert(cache, inline_cache):
+        html = markdown_to_html_node(markdown, cache, inline_cache=inline_cache)
+        if _record_links:
+            links.append(extract_links(html))
+        if _search_index:
+            indexed = io.StringIO()
+            indexers.append(PageIndexer(indexed))
+            indexers[0].write(html)
+            html = indexed.getvalue()
+        if _template is not None:
+            html = _template.render_page(html)
+        pages.append(html)
+
+    error, cache_stats, profile = run_page(convert)
+    if error:
+        return None, error, cache_stats, profile, None, None
+    links = links[0] if links else None
+    search = indexers[0].to_dict() if indexers else None
+    return pages[0], error, cache_stats, profile, links, search
+
+
+def default_chunksize(jobs, workers):
+    # Roughly four chunks per worker keeps cores busy without paying IPC per page
+    return max(1, jobs // (workers * 4))
+
+
+def build_site(
+    content_dir,
+    public_dir,
+    workers=None,
+    chunksize=None,
+    incremental=True,
+    manifest_path=None,
+    cache_size=0,
+    cache_path=None,
+    profile=False,
+    inline_cache_size=0,
+    template_path=None,
+    record_links=False,
+    search_index=False,
+):
+    """
+    Converts every markdown file under content_dir into html under public_dir,
+    keeping the directory layout, e.g. content/blog/post.md -> public/blog/post.html
+
+    Args:
+        content_dir - (str) directory holding the markdown sources
+        public_dir - (str) directory the html files are written to
+        workers - (int) number of worker processes, defaults to os.cpu_count(). 1 builds in process
+        chunksize - (int) number of pages handed to a worker at a time, defaults to default_chunksize
+        incremental - (bool) skip pages whose source is unchanged since the last build
+            and delete outputs whose source was removed. False rebuilds every page
+        manifest_path - (str) where the build manifest is kept, defaults to public_dir/MANIFEST_NAME
+        cache_size - (int) blocks kept in each worker's in memory block cache, 0 disables it
+        cache_path - (str) sqlite file for a block cache tier shared by all workers and builds
+        profile - (bool) record per stage timings of every page, see BuildReport.profile
+        inline_cache_size - (int) paragraph texts kept in each worker's inline cache, 0 disables it
+        template_path - (str) page template every page is wrapped in, see
+            template.load_template. Changing it rebuilds every page
+        record_links - (bool) record the link and image targets of every page in
+            the manifest and index them site wide, see BuildReport.links
+        search_index - (bool) give headings ids and write a search index of every
+            page to public_dir/search.SEARCH_DIR, see search.build_search_index
+
+    Returns:
+        BuildReport
+    """
+    start = time.perf_counter()
+    template = load_template(template_path) if template_path else None
+    template_hash = template.hash if template else ""
+    plan = BuildPlan(
+        content_dir,
+        public_dir,
+        incremental,
+        manifest_path,
+        template_hash,
+        record_links,
+        search_index,
+    )
+    sources, outputs = plan.sources, plan.outputs
+    workers = workers or os.cpu_count() or 1
+    worker_args = (
+        cache_size,
+        cache_path,
+        profile,
+        inline_cache_size,
+        template,
+        record_links,
+        search_index,
+    )
+
+    if workers == 1 or len(sources) <= 1:
+        workers = 1
+        init_worker(*worker_args)
+        pages = list(map(convert_file, sources, outputs))
+    else:
+        if not chunksize:
+            chunksize = default_chunksize(len(sources), workers)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=worker_args,
+        ) as executor:
+            pages = list(
+                executor.map(convert_file, sources, outputs, chunksize=chunksize)
+            )
+
+    plan.finish(pages)
+    links = LinkIndex.from_manifest(plan.manifest, public_dir) if record_links else None
+    search = build_search_index(plan.manifest, public_dir) if search_index else None
+    seconds = time.perf_counter() - start
+    return BuildReport(
+        pages, seconds, workers, plan.unchanged, plan.removed, links, search
+    )
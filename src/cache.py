@@ -0,0 +1,162 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from manifest import converter_version
+
+DEFAULT_CACHE_SIZE = 4096
+INVALID_CACHE_SIZE_ERROR = "init error: maxsize must be a positive int"
+
+
+class LRUCache:
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        """
+        Bounded in memory cache that evicts the least recently used entry.
+        Safe to share between threads.
+
+        Attrs:
+            self.maxsize - (int) most entries kept in memory
+            self.hits - (int) lookups answered from memory
+            self.misses - (int) lookups not in the cache
+            self.evictions - (int) entries dropped to stay within maxsize
+        """
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError(INVALID_CACHE_SIZE_ERROR)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class InlineCache(LRUCache):
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        """
+        Cache of inline markdown text to rendered html fragment
+
+        Paragraph and quote line text repeats a lot across a site ("See the
+        [API reference](...)"), so its parsed and rendered html is kept and the
+        same immutable str is returned for every repeat. Only successful renders
+        are kept, so invalid markdown raises every time.
+        """
+        super().__init__(maxsize)
+
+    def get_or_render(self, text, single_pass, render):
+        """
+        Returns the html for inline text, calling render(text, single_pass) on a miss.
+        """
+        # Both parsers agree on valid markdown but not on what is invalid
+        key = (text, single_pass)
+        html = self.get(key)
+        if html is None:
+            html = render(text, single_pass)
+            self.put(key, html)
+        return html
+
+
+class BlockCache(LRUCache):
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, path=None):
+        """
+        Cache of markdown block text to rendered html fragment
+
+        Blocks are keyed by a hash of their text, the inline parser and the converter
+        version, so a code change never serves stale html. With a path, misses in memory fall back
+        to an sqlite database on disk that outlives the process and is shared by
+        every process using the same path, e.g. the workers of a site build.
+
+        Attrs:
+            self.path - (str) or None, the sqlite file of the disk tier
+            self.disk_hits - (int) memory misses answered from disk, so
+                misses - disk_hits blocks were actually rendered
+        """
+        super().__init__(maxsize)
+        self.path = path
+        self.disk_hits = 0
+        self._local = threading.local()
+        self._version_digest = hashlib.sha1(converter_version().encode())
+
+    def block_key(self, block, single_pass=False):
+        digest = self._version_digest.copy()
+        # Both parsers agree on valid markdown but not on what is invalid
+        digest.update(b"1" if single_pass else b"0")
+        digest.update(block.encode())
+        return digest.hexdigest()
+
+    def _connection(self):
+        # sqlite connections must not cross a fork or a thread, so each opens its own
+        local = self._local
+        if getattr(local, "db", None) is None or local.pid != os.getpid():
+            local.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            local.db.execute("PRAGMA journal_mode=WAL")
+            local.db.execute(
+                "CREATE TABLE IF NOT EXISTS blocks (key TEXT PRIMARY KEY, html TEXT)"
+            )
+            local.pid = os.getpid()
+        return local.db
+
+    def get_or_render(self, block, render, single_pass=False):
+        """
+        Returns the html for block, calling render(block) only when no tier has it.
+        single_pass is the inline parser render uses.
+        """
+        key = self.block_key(block, single_pass)
+        html = self.get(key)
+        if html is not None:
+            return html
+        if self.path:
+            db = self._connection()
+            row = db.execute("SELECT html FROM blocks WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.disk_hits += 1
+                self.put(key, row[0])
+                return row[0]
+        html = render(block)
+        self.put(key, html)
+        if self.path:
+            db.execute("INSERT OR REPLACE INTO blocks VALUES (?, ?)", (key, html))
+        return html
+
+    def stats(self):
+        stats = super().stats()
+        stats["disk_hits"] = self.disk_hits
+        return stats
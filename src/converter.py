@@ -0,0 +1,119 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from cache import DEFAULT_CACHE_SIZE, BlockCache, InlineCache
+from md_to_html import markdown_to_html_node
+
+THREAD = "thread"
+PROCESS = "process"
+UNKNOWN_MODE_ERROR = "convert_many error: mode must be 'thread' or 'process'"
+
+# The Converter of a convert_many worker process, set up by init_converter
+_worker_converter = None
+
+
+class Converter:
+    def __init__(
+        self,
+        cache_size=DEFAULT_CACHE_SIZE,
+        cache_path=None,
+        single_pass=False,
+        inline_cache_size=0,
+    ):
+        """
+        Reusable markdown to html converter for converting many documents.
+
+        Holds everything that does not depend on the document, so it is set up
+        once rather than per call: the inline parser with its precompiled
+        patterns, and a block cache shared by every document, which pays off
+        when documents repeat blocks (signatures, boilerplate, quotes). By
+        default the output is that of md_to_html.markdown_to_html_node.
+
+        Args:
+            cache_size - (int) blocks kept in the in memory block cache, 0 disables it
+            cache_path - (str) sqlite file for a disk tier of the block cache
+            single_pass - (bool) use text_functions.tokenize_inline for inline markdown.
+                Faster, but it accepts some markdown the default parser rejects, e.g.
+                "[docs](https://x/a_b) and _c_"
+            inline_cache_size - (int) paragraph texts kept in an inline cache, 0 disables
+                it. Pays off with repeated paragraphs and no block cache, or repeated
+                lines inside otherwise different quotes
+
+        Attrs:
+            self.cache - cache.BlockCache or None
+            self.inline_cache - cache.InlineCache or None
+            self.single_pass - bool
+        """
+        self.cache_size = cache_size
+        self.cache_path = cache_path
+        self.single_pass = single_pass
+        self.inline_cache_size = inline_cache_size
+        self.cache = None
+        self.inline_cache = None
+        if inline_cache_size:
+            self.inline_cache = InlineCache(inline_cache_size)
+        if cache_size or cache_path:
+            self.cache = BlockCache(cache_size or 1, cache_path)
+
+    def convert(self, markdown):
+        return markdown_to_html_node(
+            markdown, self.cache, self.single_pass, self.inline_cache
+        )
+
+    def convert_many(self, documents, workers=None, mode=THREAD, chunksize=None):
+        """
+        Converts every markdown str in documents and returns the html in input order.
+
+        Args:
+            documents - iterable of markdown str
+            workers - (int) threads or processes to fan out to. None or 1 converts in this thread
+            mode - "thread" or "process". Threads share this converter's cache; each
+                process gets its own converter with the same settings
+            chunksize - (int) documents sent to a process at a time, defaults to
+                about four chunks per worker
+
+        Raises:
+            the first exception raised converting any document
+        """
+        if not workers or workers == 1:
+            convert = self.convert
+            return [convert(markdown) for markdown in documents]
+        if mode == THREAD:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(self.convert, documents))
+        if mode == PROCESS:
+            documents = list(documents)
+            if not chunksize:
+                chunksize = max(1, len(documents) // (workers * 4))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_converter,
+                initargs=(
+                    self.cache_size,
+                    self.cache_path,
+                    self.single_pass,
+                    self.inline_cache_size,
+                ),
+            ) as executor:
+                return list(
+                    executor.map(convert_in_worker, documents, chunksize=chunksize)
+                )
+        raise ValueError(UNKNOWN_MODE_ERROR)
+
+
+def init_converter(cache_size, cache_path, single_pass, inline_cache_size):
+    global _worker_converter
+    _worker_converter = Converter(
+        cache_size, cache_path, single_pass, inline_cache_size
+    )
+
+
+def convert_in_worker(markdown):
+    return _worker_converter.convert(markdown)
+
+
+def convert_many(documents, workers=None, mode=THREAD, chunksize=None, **options):
+    """
+    Converts every markdown str in documents with a new Converter(**options).
+    See Converter.convert_many.
+    """
+    return Converter(**options).convert_many(documents, workers, mode, chunksize)
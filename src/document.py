@@ -0,0 +1,249 @@
+import re
+from bisect import bisect_right
+
+from blocks import classify_block
+from htmlnode import NO_CHILDREN_ERROR
+from md_to_html import build_html_node
+from text_functions import decode_block, iter_block_spans
+
+NON_SPACE_REGEX = re.compile(rb"\S")
+NON_SPACE_TEXT_REGEX = re.compile(r"\S")
+EDIT_RANGE_ERROR = "edit error: the removed range must lie within the document"
+# Texts are compared this many characters at a time when looking for an edit
+COMPARE_CHUNK = 4096
+
+
+class LazyDocument:
+    def __init__(self, markdown, cache=None, single_pass=False, inline_cache=None):
+        """
+        Markdown document whose blocks are classified and rendered only when asked for.
+
+        The block offsets are indexed once, up front, by a scan that neither
+        decodes nor copies the markdown. Each block is then decoded, classified
+        and rendered on first access only, and its html kept, so asking for
+        the first few blocks, or block K, never touches the rest.
+
+            doc = LazyDocument(markdown)
+            doc.render(0, 5)  # <div> of the first five blocks
+            doc[7]            # html of block 7
+            doc.render()      # same as md_to_html.markdown_to_html_node(markdown)
+
+        Args:
+            markdown - (str) markdown, or utf-8 bytes / an mmap of it
+            cache - cache.BlockCache looked up before rendering a block
+            single_pass - (bool) use text_functions.tokenize_inline for inline markdown
+            inline_cache - cache.InlineCache for paragraph and quote line html
+
+        Attrs:
+            self.spans - (list) of (start, end) offsets of each block in self.buf
+        """
+        self.buf = markdown
+        self.cache = cache
+        self.single_pass = single_pass
+        self.inline_cache = inline_cache
+        self.spans = list(self.scan())
+        self._block_types = [None] * len(self.spans)
+        self._html = [None] * len(self.spans)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __getitem__(self, index):
+        """
+        Returns the html of block index, or a list of the html of a slice of blocks.
+        """
+        if isinstance(index, slice):
+            return [self.html(i) for i in range(*index.indices(len(self.spans)))]
+        return self.html(index)
+
+    def scan(self, pos=0):
+        """
+        Yields the spans of the blocks of self.buf from pos, a block start, on.
+        """
+        buf = self.buf
+        if isinstance(buf, str):
+            has_text = NON_SPACE_TEXT_REGEX.search
+        else:
+            has_text = NON_SPACE_REGEX.search
+        for start, end in iter_block_spans(buf, pos):
+            if has_text(buf, start, end):
+                yield start, end
+
+    def block(self, index):
+        start, end = self.spans[index]
+        return decode_block(self.buf[start:end])
+
+    def block_type(self, index):
+        block_type = self._block_types[index]
+        if block_type is None:
+            block_type = classify_block(self.block(index))[0]
+            self._block_types[index] = block_type
+        return block_type
+
+    def html(self, index):
+        html = self._html[index]
+        if html is not None:
+            return html
+        block = self.block(index)
+        block_type, lines = classify_block(block)
+        self._block_types[index] = block_type
+
+        def render(block):
+            node = build_html_node(
+                block, block_type, lines, self.single_pass, self.inline_cache
+            )
+            return node.to_html()
+
+        if self.cache is not None:
+            html = self.cache.get_or_render(block, render, self.single_pass)
+        else:
+            html = render(block)
+        self._html[index] = html
+        return html
+
+    def render(self, start=0, stop=None):
+        """
+        Returns the html of blocks start up to stop wrapped in one div, as
+        markdown_to_html_node does for the whole document.
+        """
+        blocks = self[start:stop]
+        if not blocks:
+            raise ValueError(NO_CHILDREN_ERROR)
+        return "<div>" + "".join(blocks) + "</div>"
+
+
+class IncrementalDocument(LazyDocument):
+    def __init__(self, markdown, cache=None, single_pass=False, inline_cache=None):
+        """
+        LazyDocument of markdown being edited, e.g. in an editor preview.
+
+        An edit re-scans the text from the start of the block it falls in only
+        until block boundaries line up with the old ones again, and only the
+        blocks in between are re-parsed. Every other block keeps its html, as
+        do re-scanned blocks whose text did not change, so the cost of an edit
+        depends on the blocks it touches, not on the length of the document.
+
+            doc = IncrementalDocument(markdown)
+            doc.render()
+            first, removed, added = doc.edit(offset, 0, "x")
+            doc[first:first + added]  # the html replacing `removed` old blocks
+
+        Args:
+            markdown - (str) markdown
+            cache, single_pass, inline_cache - as for LazyDocument
+        """
+        super().__init__(markdown, cache, single_pass, inline_cache)
+
+    def edit(self, offset, removed, inserted):
+        """
+        Replaces the removed characters from offset on with the str inserted.
+
+        Returns:
+            (first, removed, added) - blocks first to first + removed of the old
+            text were replaced by blocks first to first + added, every other
+            block is unchanged, after first + added shifted by added - removed
+        """
+        old = self.buf
+        end = offset + removed
+        if offset < 0 or removed < 0 or end > len(old):
+            raise ValueError(EDIT_RANGE_ERROR)
+        self.buf = old[:offset] + inserted + old[end:]
+        delta = len(inserted) - removed
+        inserted_end = offset + len(inserted)
+        spans = self.spans
+        # Scanning restarts at the last block starting before or at the edit,
+        # the text up to it is unchanged and so are the blocks it ends
+        first = bisect_right(spans, (offset, len(old) + 1)) - 1
+        if first < 0:
+            first, pos = 0, 0
+        else:
+            pos = spans[first][0]
+        # Past the edit a block starting where an old block started means the
+        # scan is back in step, the rest of the old blocks only moved
+        resume = len(spans)
+        new_spans = []
+        for start, stop in self.scan(pos):
+            if start >= inserted_end:
+                old_start = start - delta
+                j = bisect_right(spans, (old_start, -1))
+                if j < len(spans) and spans[j][0] == old_start:
+                    resume = j
+                    break
+            new_spans.append((start, stop))
+        kept = spans[resume:]
+        if delta:
+            kept = [(start + delta, stop + delta) for start, stop in kept]
+        self.spans = spans[:first] + new_spans + kept
+
+        old_blocks = [
+            decode_block(old[start:stop]) for start, stop in spans[first:resume]
+        ]
+        new_blocks = [decode_block(self.buf[start:stop]) for start, stop in new_spans]
+        # Re-scanned blocks with unchanged text keep their html, even if moved
+        rendered = dict(
+            zip(
+                old_blocks,
+                zip(self._html[first:resume], self._block_types[first:resume]),
+            )
+        )
+        reused = [rendered.get(block, (None, None)) for block in new_blocks]
+        self._html[first:resume] = [html for html, _ in reused]
+        self._block_types[first:resume] = [block_type for _, block_type in reused]
+
+        # Report only the blocks whose text changed
+        same = min(len(old_blocks), len(new_blocks))
+        lead = 0
+        while lead < same and old_blocks[lead] == new_blocks[lead]:
+            lead += 1
+        trail = 0
+        while trail < same - lead and old_blocks[-1 - trail] == new_blocks[-1 - trail]:
+            trail += 1
+        dropped = len(old_blocks) - lead - trail
+        return first + lead, dropped, len(new_blocks) - lead - trail
+
+    def update(self, markdown):
+        """
+        Replaces the whole text with the str markdown, re-parsing only what differs,
+        for editors that send the full text on every change. Returns as edit.
+        """
+        old = self.buf
+        prefix = common_prefix_length(old, markdown)
+        suffix = common_suffix_length(
+            old, markdown, min(len(old), len(markdown)) - prefix
+        )
+        return self.edit(
+            prefix,
+            len(old) - prefix - suffix,
+            markdown[prefix : len(markdown) - suffix],
+        )
+
+
+def common_prefix_length(a, b):
+    # Chunks are compared in C, a differing chunk is halved down to the character
+    limit = min(len(a), len(b))
+    n = 0
+    step = COMPARE_CHUNK
+    while n < limit:
+        k = min(step, limit - n)
+        if a[n : n + k] == b[n : n + k]:
+            n += k
+        elif k == 1:
+            break
+        else:
+            step = k // 2
+    return n
+
+
+def common_suffix_length(a, b, limit):
+    size_a, size_b = len(a), len(b)
+    n = 0
+    step = COMPARE_CHUNK
+    while n < limit:
+        k = min(step, limit - n)
+        if a[size_a - n - k : size_a - n] == b[size_b - n - k : size_b - n]:
+            n += k
+        elif k == 1:
+            break
+        else:
+            step = k // 2
+    return n
@@ -0,0 +1,221 @@
+from types import MappingProxyType
+
+import serializer
+from htmlnode import (
+    NO_CHILDREN_ERROR,
+    NO_TAG_ERROR,
+    NO_VALUE_ERROR,
+    LeafNode,
+    ParentNode,
+)
+from textnode import TextNode
+
+FROZEN_NODE_ERROR = "frozen node error: nodes made by a NodeTable cannot be changed"
+EMPTY_PROPS = MappingProxyType({})
+
+
+def freeze_props(props):
+    # Read only view of a private copy, props can't change under the cached html
+    return MappingProxyType(dict(props)) if props else EMPTY_PROPS
+
+
+class FrozenTextNode(TextNode):
+    __slots__ = ("_hash",)
+
+    def __init__(self, text, text_type, url=None):
+        """
+        Immutable, hashable TextNode, made by NodeTable.text
+        """
+        TextNode.__init__(self, text, text_type, url)
+        object.__setattr__(self, "_hash", hash((text, text_type, url)))
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "_hash"):
+            raise AttributeError(FROZEN_NODE_ERROR)
+        object.__setattr__(self, name, value)
+
+    def __hash__(self):
+        return self._hash
+
+
+class FrozenLeafNode(LeafNode):
+    __slots__ = ("_hash", "html")
+    memoized = True
+
+    def __init__(self, tag, value, props=None):
+        """
+        Immutable, hashable LeafNode, made by NodeTable.leaf
+
+        Attrs:
+            self.props - read only mapping, empty without props
+            self.html - str, or None until the node is first serialized
+        """
+        if not value:
+            raise ValueError(NO_VALUE_ERROR)
+        props = freeze_props(props)
+        for name, attr in (("tag", tag), ("value", value), ("children", None)):
+            object.__setattr__(self, name, attr)
+        object.__setattr__(self, "props", props)
+        object.__setattr__(self, "html", None)
+        object.__setattr__(self, "_hash", hash(node_key(tag, value, props, self.raw)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(FROZEN_NODE_ERROR)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, FrozenLeafNode) or self._hash != other._hash:
+            return False
+        return node_key(self.tag, self.value, self.props, self.raw) == node_key(
+            other.tag, other.value, other.props, other.raw
+        )
+
+    def to_html(self):
+        # Computed once, every later use of this node reuses it
+        if self.html is None:
+            serializer.serialize(self)
+        return self.html
+
+    def remember_html(self, html):
+        object.__setattr__(self, "html", html)
+
+
+class FrozenRawNode(FrozenLeafNode):
+    __slots__ = ()
+    raw = True
+
+    def __init__(self, html):
+        """
+        Immutable, hashable RawNode, made by NodeTable.raw. Never equal to a
+        FrozenLeafNode of the same text, which would be escaped.
+        """
+        super().__init__(None, html)
+
+
+class FrozenParentNode(ParentNode):
+    __slots__ = ("_hash", "html")
+    memoized = True
+
+    def __init__(self, tag, children, props=None):
+        """
+        Immutable, hashable ParentNode, made by NodeTable.parent
+
+        Attrs:
+            self.children - tuple of frozen nodes
+            self.props - read only mapping, empty without props
+            self.html - str, or None until the node is first serialized
+        """
+        if not tag:
+            raise ValueError(NO_TAG_ERROR)
+        elif not children:
+            raise ValueError(NO_CHILDREN_ERROR)
+        children = tuple(children)
+        props = freeze_props(props)
+        for name, attr in (("tag", tag), ("value", None), ("children", children)):
+            object.__setattr__(self, name, attr)
+        object.__setattr__(self, "props", props)
+        object.__setattr__(self, "html", None)
+        object.__setattr__(self, "_hash", hash(node_key(tag, children, props)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(FROZEN_NODE_ERROR)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, FrozenParentNode) or self._hash != other._hash:
+            return False
+        return node_key(self.tag, self.children, self.props) == node_key(
+            other.tag, other.children, other.props
+        )
+
+    def to_html(self):
+        if self.html is None:
+            serializer.serialize(self)
+        return self.html
+
+    def remember_html(self, html):
+        object.__setattr__(self, "html", html)
+
+    def iter_html(self):
+        yield self.to_html()
+
+
+def node_key(tag, content, props, raw=False):
+    # content is a leaf's value or a parent's tuple of (already interned) children
+    return (tag, content, tuple(props.items()), raw)
+
+
+class NodeTable:
+    def __init__(self):
+        """
+        Hash-consing table of frozen nodes: asking for a node equal to one already
+        made returns that same object, so identical subtrees are stored once and
+        their html is serialized once.
+
+            table = NodeTable()
+            link = table.leaf("a", "python", {"href": "/tags/python"})
+            link is table.leaf("a", "python", {"href": "/tags/python"})  # True
+
+        The table keeps every node it made alive, use one per page or per build.
+
+        Attrs:
+            self.hits - (int) requests answered with an existing node
+            self.misses - (int) nodes made
+        """
+        self.hits = 0
+        self.misses = 0
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def intern(self, node):
+        """
+        Returns the table's node equal to the frozen node, adding node if there is none.
+        """
+        existing = self._nodes.get(node)
+        if existing is not None:
+            self.hits += 1
+            return existing
+        self.misses += 1
+        self._nodes[node] = node
+        return node
+
+    def text(self, text, text_type, url=None):
+        return self.intern(FrozenTextNode(text, text_type, url))
+
+    def leaf(self, tag, value, props=None):
+        return self.intern(FrozenLeafNode(tag, value, props))
+
+    def raw(self, html):
+        return self.intern(FrozenRawNode(html))
+
+    def parent(self, tag, children, props=None):
+        # Children from this table are canonical, anything else is frozen first
+        children = [self.freeze(child) for child in children]
+        return self.intern(FrozenParentNode(tag, children, props))
+
+    def freeze(self, node):
+        """
+        Returns the frozen, interned equivalent of node, a TextNode or an HTMLNode tree.
+        """
+        if isinstance(node, (FrozenTextNode, FrozenLeafNode, FrozenParentNode)):
+            return self.intern(node)
+        if isinstance(node, TextNode):
+            return self.text(node.text, node.text_type, node.url)
+        if isinstance(node, ParentNode):
+            return self.parent(node.tag, node.children, node.props)
+        if node.raw:
+            return self.raw(node.value)
+        return self.leaf(node.tag, node.value, node.props)
+
+    def stats(self):
+        return {"size": len(self._nodes), "hits": self.hits, "misses": self.misses}
@@ -1,7 +1,15 @@
+import serializer
 from textnode import TextType
 
 
 class HTMLNode:
+    # No per instance __dict__, a site build creates millions of nodes
+    __slots__ = ("tag", "value", "children", "props")
+    # Read by serializer: raw values are emitted unescaped, memoized nodes
+    # keep their html once serialized (see frozennode)
+    raw = False
+    memoized = False
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         """
         Initializes an HTML Node
@@ -27,6 +35,18 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("to_html needs implementation")
 
+    def iter_html(self):
+        """
+        Yields the HTML of this node in chunks, in document order.
+        """
+        raise NotImplementedError("iter_html needs implementation")
+
+    def write_html(self, sink):
+        """
+        Writes the HTML of this node chunk by chunk to sink, any object with a write method.
+        """
+        serializer.write_html(self, sink)
+
     def props_to_html(self):
         props = ""
         if not self.props:
@@ -50,6 +70,8 @@ UNKNOWN_TAG_ERROR = "ERROR: text_node_to_html_node requires a text node with a t
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         if not value:
             raise ValueError(NO_VALUE_ERROR)
@@ -57,13 +79,26 @@ class LeafNode(HTMLNode):
             super().__init__(tag, value, None, props)
 
     def to_html(self):
-        if not self.tag:
-            return self.value
-        else:
-            return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        return serializer.serialize(self)
+
+    def iter_html(self):
+        yield self.to_html()
+
+
+class RawNode(LeafNode):
+    __slots__ = ()
+    raw = True
+
+    def __init__(self, html):
+        """
+        Leaf of html that is already rendered, emitted as is without escaping
+        """
+        super().__init__(None, html)
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag=None, children=None, props=None):
         if not tag:
             raise ValueError(NO_TAG_ERROR)
@@ -72,16 +107,18 @@ class ParentNode(HTMLNode):
         super().__init__(tag=tag, value=None, children=children, props=props)
 
     def to_html(self):
+        self.validate()
+        return serializer.serialize(self)
+
+    def iter_html(self):
+        self.validate()
+        return serializer.iter_html(self)
+
+    def validate(self):
         if not self.tag:
             raise ValueError(NO_TAG_ERROR)
         if not self.children:
             raise ValueError(NO_CHILDREN_ERROR)
-        props = self.props_to_html()
-        start = f"<{self.tag}{props}>"
-        end = f"</{self.tag}>"
-        for child in self.children:
-            start += child.to_html()
-        return start + end
 
 
 def text_node_to_html_node(text_node):
@@ -0,0 +1,135 @@
+import contextlib
+import json
+import time
+
+# The active Profiler, None when instrumentation is off. The pipeline only checks
+# this once per document and once per paragraph, so leaving it off costs nothing.
+profiler = None
+clock = time.perf_counter
+
+STAGE_ORDER = ("split", "classify", "inline", "build", "serialize", "cache")
+COUNTERS = ("calls", "seconds", "nodes", "bytes")
+
+
+def new_stats():
+    return dict.fromkeys(COUNTERS, 0)
+
+
+class Profiler:
+    def __init__(self):
+        """
+        Per stage and per BlockType counters of the markdown to html pipeline
+
+        Stages:
+            split - reading the source and splitting it into blocks (bytes of block text)
+            classify - deciding each block's BlockType
+            inline - text_to_text_nodes on paragraph text (TextNodes made)
+            build - making the html nodes, not counting inline (HTMLNodes made)
+            serialize - turning html nodes into html (bytes of html)
+            cache - block cache lookups, including renders on a miss
+
+        Attrs:
+            self.stages - (dict) of stage name to its counters dict
+            self.block_types - (dict) of BlockType value to its counters dict,
+                covering classify, inline, build and serialize of those blocks
+        """
+        self.stages = {}
+        self.block_types = {}
+
+    def record(self, stage, seconds, nodes=0, nbytes=0):
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = new_stats()
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["nodes"] += nodes
+        stats["bytes"] += nbytes
+
+    def record_block(self, block_type, seconds, nodes=0, nbytes=0):
+        stats = self.block_types.get(block_type.value)
+        if stats is None:
+            stats = self.block_types[block_type.value] = new_stats()
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["nodes"] += nodes
+        stats["bytes"] += nbytes
+
+    def stage_seconds(self, stage):
+        stats = self.stages.get(stage)
+        return stats["seconds"] if stats else 0.0
+
+    def timed_iter(self, stage, iterable):
+        """
+        Yields from iterable, recording the time spent producing each item under stage.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.record(stage, clock() - start)
+                return
+            self.record(stage, clock() - start, nbytes=len(item))
+            yield item
+
+    def merge(self, data):
+        """
+        Adds the counters of another profile, as returned by to_dict, e.g. from a worker process.
+        """
+        for mine, theirs in (
+            (self.stages, data["stages"]),
+            (self.block_types, data["block_types"]),
+        ):
+            for name, stats in theirs.items():
+                total = mine.setdefault(name, new_stats())
+                for counter in COUNTERS:
+                    total[counter] += stats[counter]
+
+    def to_dict(self):
+        return {
+            "stages": {name: dict(stats) for name, stats in self.stages.items()},
+            "block_types": {
+                name: dict(stats) for name, stats in self.block_types.items()
+            },
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    def format_table(self):
+        header = f"{'':<16} {'calls':>9} {'ms':>10} {'nodes':>10} {'bytes':>12}"
+        lines = [f"{'stage':<16}" + header[16:]]
+        known = [name for name in STAGE_ORDER if name in self.stages]
+        others = sorted(name for name in self.stages if name not in STAGE_ORDER)
+        for name in known + others:
+            lines.append(self.format_row(name, self.stages[name]))
+        lines.append("")
+        lines.append(f"{'block type':<16}" + header[16:])
+        for name in sorted(self.block_types):
+            lines.append(self.format_row(name, self.block_types[name]))
+        return "\n".join(lines)
+
+    def format_row(self, name, stats):
+        return (
+            f"{name:<16} {stats['calls']:>9} {stats['seconds'] * 1000:>10.3f} "
+            f"{stats['nodes']:>10} {stats['bytes']:>12}"
+        )
+
+
+@contextlib.contextmanager
+def profile():
+    """
+    Instruments every conversion run inside the with block.
+
+        with instrument.profile() as prof:
+            markdown_to_html_node(markdown)
+        print(prof.format_table())
+    """
+    global profiler
+    previous = profiler
+    profiler = Profiler()
+    try:
+        yield profiler
+    finally:
+        profiler = previous
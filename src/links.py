@@ -0,0 +1,125 @@
+import html
+import os
+import posixpath
+import re
+from urllib.parse import unquote, urlsplit
+
+# Only matches real tags, see serializer.TAG_REGEX
+TARGET_REGEX = re.compile(r'<(?:a href|img src)="([^"]*)"')
+INDEX_PAGE = "index.html"
+
+
+class LinkRecorder:
+    def __init__(self, sink):
+        """
+        Sink that passes html on to sink, recording the target of every link
+        and image on the way.
+
+        Attrs:
+            self.targets - (list) of link and image targets, in document order
+        """
+        self.sink = sink
+        self.targets = []
+
+    def write(self, part):
+        self.targets.extend(extract_links(part))
+        return self.sink.write(part)
+
+
+def extract_links(html_text):
+    """
+    Returns the targets of the links and images in html made by this converter.
+    """
+    return [
+        html.unescape(target) if "&" in target else target
+        for target in TARGET_REGEX.findall(html_text)
+    ]
+
+
+def resolve_target(page, target):
+    """
+    Returns the output file an internal target refers to, relative to the
+    public directory, or None for an external target or a link within the page.
+
+    Args:
+        page - (str) the referring page, relative to the public directory
+        target - (str) the href or src, e.g. "../img/logo.png" or "/blog/"
+    """
+    parts = urlsplit(target)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = unquote(parts.path)
+    if path.startswith("/"):
+        resolved = posixpath.normpath(path.lstrip("/") or ".")
+    else:
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(page), path))
+    if resolved == "." or path.endswith("/"):
+        resolved = posixpath.join(resolved, INDEX_PAGE)
+    return posixpath.normpath(resolved)
+
+
+def output_files(public_dir):
+    """
+    Returns the set of every file under public_dir, as posix paths relative to it.
+    """
+    files = set()
+    for root, _, names in os.walk(public_dir):
+        rel_root = os.path.relpath(root, public_dir)
+        for name in names:
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            files.add(rel_path.replace(os.sep, "/"))
+    return files
+
+
+class LinkIndex:
+    def __init__(self):
+        """
+        Site wide index of link and image targets to the pages referring to them
+
+        Attrs:
+            self.internal - (dict) of output file, relative to the public
+                directory, to the list of pages linking to it
+            self.external - (dict) of external url to the list of pages linking to it
+        """
+        self.internal = {}
+        self.external = {}
+
+    def add_page(self, page, targets):
+        """
+        Adds the targets of page, a path relative to the public directory.
+        """
+        for target in targets:
+            resolved = resolve_target(page, target)
+            if resolved is not None:
+                self.internal.setdefault(resolved, []).append(page)
+            elif urlsplit(target).netloc:
+                self.external.setdefault(target, []).append(page)
+
+    @classmethod
+    def from_manifest(cls, manifest, public_dir):
+        """
+        Returns the index of the links recorded in a manifest.Manifest, see
+        build.build_site(record_links=True).
+        """
+        index = cls()
+        for entry in manifest.entries.values():
+            links = entry.get("links")
+            if links:
+                page = os.path.relpath(entry["output"], public_dir)
+                index.add_page(page.replace(os.sep, "/"), links)
+        return index
+
+    def broken(self, public_dir):
+        """
+        Returns {target: referring pages} for internal targets with no file in
+        public_dir. The output tree is listed once, every check is a set lookup.
+        """
+        files = output_files(public_dir)
+        broken = {}
+        for target, pages in self.internal.items():
+            # A directory link without the slash is redirected to its index
+            if target in files or posixpath.join(target, INDEX_PAGE) in files:
+                continue
+            broken[target] = pages
+        return broken
+
@@ -1,12 +1,202 @@
-from textnode import TextType, TextNode
+import argparse
+import asyncio
+import os
+import sys
 
+from assets import sync_assets
+from async_build import DEFAULT_IO_THREADS, build_site_async
 
-def main():
-    test_node = TextNode(
-        "This is some anchor text", TextType["LINK"].value, "https://www.boot.dev"
+from build import build_site
+from serve import DEFAULT_HOST, DEFAULT_INTERVAL, DEFAULT_PORT, watch
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="pygenstat", description="Static site generator"
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    build = commands.add_parser("build", help="convert a content directory to html")
+    build.add_argument("--content", default="content", help="markdown source directory")
+    build.add_argument("--public", default="public", help="html output directory")
+    build.add_argument(
+        "--static",
+        default="static",
+        help="assets copied into the public directory, if it exists",
+    )
+    build.add_argument(
+        "--hash-assets",
+        action="store_true",
+        help="compare asset contents when only their mtime changed",
+    )
+    build.add_argument(
+        "--workers", type=int, help="worker processes (default: one per core)"
+    )
+    build.add_argument(
+        "--chunksize", type=int, help="pages handed to a worker at a time"
+    )
+    build.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="overlap file reads and writes with conversion (for slow storage)",
+    )
+    build.add_argument(
+        "--max-in-flight",
+        type=int,
+        help="with --async, pages converted at once (default: 2 per worker)",
+    )
+    build.add_argument(
+        "--io-threads",
+        type=int,
+        default=DEFAULT_IO_THREADS,
+        help="with --async, threads reading and writing files",
+    )
+    build.add_argument(
+        "--quiet", action="store_true", help="only report the total timing"
+    )
+    build.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        help="blocks kept in each worker's render cache (default: no cache)",
+    )
+    build.add_argument(
+        "--cache-path", help="sqlite file for a render cache shared across builds"
+    )
+    build.add_argument(
+        "--inline-cache-size",
+        type=int,
+        default=0,
+        help="paragraph texts kept in each worker's inline cache (default: no cache)",
     )
-    print(test_node)
+    build.add_argument(
+        "--template",
+        help="html page template with {{ Title }} and {{ Content }} slots",
+    )
+    build.add_argument(
+        "--check-links",
+        action="store_true",
+        help="report internal links and images pointing to missing files",
+    )
+    build.add_argument(
+        "--search-index",
+        action="store_true",
+        help="give headings ids and write a sharded search index of every page",
+    )
+    build.add_argument(
+        "--profile",
+        action="store_true",
+        help="print time spent per pipeline stage and block type",
+    )
+    build.add_argument("--profile-json", help="write the stage profile to this file")
+    build.add_argument(
+        "--force", action="store_true", help="rebuild every page, even unchanged ones"
+    )
+
+    for name, description in (
+        ("watch", "rebuild changed pages whenever the content directory changes"),
+        ("serve", "watch and serve the public directory over http"),
+    ):
+        command = commands.add_parser(name, help=description)
+        command.add_argument(
+            "--content", default="content", help="markdown source directory"
+        )
+        command.add_argument(
+            "--public", default="public", help="html output directory"
+        )
+        command.add_argument(
+            "--interval",
+            type=float,
+            default=DEFAULT_INTERVAL,
+            help="seconds between checks for changes",
+        )
+        command.add_argument(
+            "--cache-size", type=int, default=0, help="blocks kept in the render cache"
+        )
+        command.add_argument("--template", help="html page template")
+        if name == "serve":
+            command.add_argument("--host", default=DEFAULT_HOST)
+            command.add_argument("--port", type=int, default=DEFAULT_PORT)
+    return parser
+
+
+def run_watch(args, serve):
+    watch(
+        args.content,
+        args.public,
+        interval=args.interval,
+        serve=serve,
+        host=getattr(args, "host", DEFAULT_HOST),
+        port=getattr(args, "port", DEFAULT_PORT),
+        cache_size=args.cache_size,
+        template_path=args.template,
+    )
+    return 0
+
+
+def run_build(args):
+    options = dict(
+        workers=args.workers,
+        incremental=not args.force,
+        cache_size=args.cache_size,
+        cache_path=args.cache_path,
+        inline_cache_size=args.inline_cache_size,
+        template_path=args.template,
+        record_links=args.check_links,
+        search_index=args.search_index,
+        profile=args.profile or bool(args.profile_json),
+    )
+    if args.use_async:
+        report = asyncio.run(
+            build_site_async(
+                args.content,
+                args.public,
+                max_in_flight=args.max_in_flight,
+                io_threads=args.io_threads,
+                **options,
+            )
+        )
+    else:
+        report = build_site(
+            args.content, args.public, chunksize=args.chunksize, **options
+        )
+    print(report.format(per_file=not args.quiet))
+    failed = bool(report.failed)
+    if os.path.isdir(args.static):
+        assets = sync_assets(args.static, args.public, use_hash=args.hash_assets)
+        print(assets.format())
+        failed = failed or bool(assets.failed)
+    if report.links is not None:
+        # After the asset sync, images are assets
+        broken = report.links.broken(args.public)
+        for target, pages in sorted(broken.items()):
+            print(f"BROKEN {target}  linked from {', '.join(sorted(set(pages)))}")
+        print(
+            f"Checked {len(report.links.internal)} internal targets, "
+            f"{len(broken)} broken"
+        )
+        failed = failed or bool(broken)
+    profiler = report.profile()
+    if profiler is not None:
+        if args.profile:
+            print(profiler.format_table())
+        if args.profile_json:
+            with open(args.profile_json, "w", encoding="utf-8") as f:
+                f.write(profiler.to_json())
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        return run_build(args)
+    if args.command in ("watch", "serve"):
+        return run_watch(args, serve=args.command == "serve")
+    parser.print_help()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import functools
+import hashlib
+import importlib
+import json
+import os
+
+from atomic import write_json
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_FORMAT = 1
+# Modules that decide the html output, changing any of them invalidates every page
+CONVERTER_MODULES = (
+    "textnode",
+    "htmlnode",
+    "serializer",
+    "text_functions",
+    "blocks",
+    "md_to_html",
+    "template",
+    "search",
+)
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.cache
+def converter_version():
+    """
+    Hash of the source of every converter module, so any code change invalidates the manifest.
+    """
+    digest = hashlib.sha256()
+    for name in CONVERTER_MODULES:
+        module = importlib.import_module(name)
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class Manifest:
+    def __init__(self, version, template_hash="", entries=None):
+        """
+        Record of what produced each output of the last build
+
+        Args:
+            version - (str) converter version, see converter_version
+            template_hash - (str) hash of the page template, "" when pages are not templated
+            entries - (dict) of source path (relative to the content dir) to a dict with the
+                source "size", "mtime_ns" and "hash" and the "output" path written for it,
+                and with build_site(record_links=True) the "links" of the output.
+                The entry of a page that failed only holds its "output", see fail
+        """
+        self.version = version
+        self.template_hash = template_hash
+        self.entries = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, path, version, template_hash=""):
+        """
+        Loads the manifest at path. A missing or unreadable manifest, or one written by
+        another converter version or template, loads empty so every page is rebuilt.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(version, template_hash)
+        if (
+            data.get("format") != MANIFEST_FORMAT
+            or data.get("version") != version
+            or data.get("template_hash") != template_hash
+        ):
+            return cls(version, template_hash)
+        return cls(version, template_hash, data.get("entries", {}))
+
+    def save(self, path):
+        data = {
+            "format": MANIFEST_FORMAT,
+            "version": self.version,
+            "template_hash": self.template_hash,
+            "entries": self.entries,
+        }
+        write_json(path, data, sort_keys=True)
+
+    def check(self, rel_path, source, output):
+        """
+        Checks whether output is up to date with source.
+
+        Size and mtime are compared first, so unchanged files are never read. When
+        they differ the content hash decides, so a touched but unchanged file is
+        still skipped.
+
+        Returns:
+            (fresh, entry) - fresh is a bool, entry the dict to record once output is rebuilt
+        """
+        stat = os.stat(source)
+        old = self.entries.get(rel_path)
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "output": output}
+        if (
+            old is None
+            or "hash" not in old
+            or old["output"] != output
+            or not os.path.exists(output)
+        ):
+            entry["hash"] = file_hash(source)
+            return False, entry
+        if old["size"] == entry["size"] and old["mtime_ns"] == entry["mtime_ns"]:
+            return True, old
+        entry["hash"] = file_hash(source)
+        if entry["hash"] == old["hash"]:
+            # Content unchanged, remember the new stat to take the fast path next time,
+            # keeping anything else recorded about the output, e.g. its links
+            entry = dict(old, **entry)
+            self.entries[rel_path] = entry
+            return True, entry
+        return False, entry
+
+    def record(self, rel_path, entry):
+        self.entries[rel_path] = entry
+
+    def fail(self, rel_path, output):
+        """
+        Records that rel_path failed to convert. Only its output is kept, so
+        the page is always stale, and an output left by an earlier build is
+        still deleted once the source is removed.
+        """
+        self.entries[rel_path] = {"output": output}
+
+    def forget(self, rel_path):
+        self.entries.pop(rel_path, None)
+
+    def removed(self, rel_paths):
+        """
+        Returns the entries whose source path is not in rel_paths, as (rel_path, output) pairs.
+        """
+        current = set(rel_paths)
+        return [
+            (rel_path, entry["output"])
+            for rel_path, entry in self.entries.items()
+            if rel_path not in current
+        ]
@@ -1,79 +1,237 @@
-from text_functions import markdown_to_blocks, text_to_text_nodes
-from htmlnode import LeafNode, ParentNode, text_node_to_html_node
-from blocks import BlockType, block_to_blocktype, determine_heading_number
-
-
-def markdown_to_html_node(markdown):
+import functools
+import io
+import mmap
+
+import instrument
+from text_functions import (
+    iter_buffer_blocks,
+    iter_markdown_blocks,
+    map_markdown_file,
+    text_to_text_nodes,
+)
+from htmlnode import (
+    NO_CHILDREN_ERROR,
+    LeafNode,
+    ParentNode,
+    RawNode,
+    text_node_to_html_node,
+)
+from blocks import (
+    UNKNOWN_BLOCK_ERROR,
+    BlockType,
+    classify_block,
+    determine_heading_number,
+)
+
+
+def markdown_to_html_node(markdown, cache=None, single_pass=False, inline_cache=None):
+    return "".join(iter_markdown_html(markdown, cache, single_pass, inline_cache))
+
+
+def markdown_to_html(markdown, sink, cache=None, single_pass=False, inline_cache=None):
+    """
+    Streams the HTML for markdown to a text stream (anything with a write method),
+    one block at a time, so the whole page never has to be held as one string.
+    markdown can be a str, an open text file / iterable of lines or utf-8 bytes.
+    """
+    write = sink.write
+    for chunk in iter_markdown_html(markdown, cache, single_pass, inline_cache):
+        write(chunk)
+
+
+def markdown_file_to_html(path, sink, cache=None, single_pass=False, inline_cache=None):
+    """
+    Streams the HTML for the markdown file at path to sink like markdown_to_html,
+    but memory maps the file and finds blocks in the raw bytes, so only one
+    block at a time is ever decoded. Peak memory follows the largest block,
+    not the file, which matters for huge generated sources.
+    """
+    with map_markdown_file(path) as buf:
+        markdown_to_html(buf, sink, cache, single_pass, inline_cache)
+
+
+def iter_markdown_html(markdown, cache=None, single_pass=False, inline_cache=None):
+    """
+    Yields the HTML for markdown in chunks. Blocks are read, parsed and
+    rendered one at a time, so a file object source is never fully loaded.
+    With a cache.BlockCache, each block's html is looked up before rendering.
+    Inside instrument.profile() every stage is timed, see instrument.Profiler.
+    single_pass selects text_functions.tokenize_inline for inline markdown.
+    With a cache.InlineCache, paragraph and quote line html is looked up
+    before parsing its inline markdown.
+    """
     # Split markdown into blocks
-    blocks = markdown_to_blocks(markdown)
-    nodes = []
-
-    for block in blocks:
-        block_type = block_to_blocktype(block)
-        if block_type == BlockType.HEADING:
-            heading_node = md_to_heading_html_node(block)
-            nodes.append(heading_node)
-        elif block_type == BlockType.PARAGRAPH:
-            p_node = md_to_paragraph_html_node(block)
-            nodes.append(p_node)
-        elif block_type == BlockType.QUOTE:
-            q_node = md_to_quote_html_node(block)
-            nodes.append(q_node)
-        elif block_type == BlockType.UNORDERED:
-            ul_node = md_to_unordered_list_html_node(block)
-            nodes.append(ul_node)
-        elif block_type == BlockType.ORDERED:
-            ol_node = md_to_ordered_list_html_node(block)
-            nodes.append(ol_node)
-        elif block_type == BlockType.CODE:
-            code_node = md_to_code_html_node(block)
-            nodes.append(code_node)
+    if isinstance(markdown, str):
+        blocks = iter_markdown_blocks(io.StringIO(markdown))
+    elif isinstance(markdown, (bytes, bytearray, memoryview, mmap.mmap)):
+        blocks = iter_buffer_blocks(markdown)
+    else:
+        blocks = iter_markdown_blocks(markdown)
+    profiler = instrument.profiler
+    if profiler is not None:
+        blocks = profiler.timed_iter("split", blocks)
+    block = next(blocks, None)
+    if block is None:
+        raise ValueError(NO_CHILDREN_ERROR)
 
     # main parent
-    div = ParentNode("div", nodes)
-    return div.to_html()
+    yield "<div>"
+    if profiler is not None:
+        yield from iter_profiled_html(
+            block, blocks, cache, profiler, single_pass, inline_cache
+        )
+    elif cache is None:
+        # A block is the streaming unit, each is serialized in one go
+        yield block_to_html_node(block, single_pass, inline_cache).to_html()
+        for block in blocks:
+            yield block_to_html_node(block, single_pass, inline_cache).to_html()
+    else:
+        render = functools.partial(
+            block_to_html, single_pass=single_pass, inline_cache=inline_cache
+        )
+        yield cache.get_or_render(block, render, single_pass)
+        for block in blocks:
+            yield cache.get_or_render(block, render, single_pass)
+    yield "</div>"
+
+
+def iter_profiled_html(
+    block, blocks, cache, profiler, single_pass=False, inline_cache=None
+):
+    def render(block):
+        return profiled_block_to_html(block, profiler, single_pass, inline_cache)
+
+    while block is not None:
+        if cache is None:
+            yield render(block)
+        else:
+            start = instrument.clock()
+            html = cache.get_or_render(block, render, single_pass)
+            profiler.record("cache", instrument.clock() - start, nbytes=len(html))
+            yield html
+        block = next(blocks, None)
+
+
+def profiled_block_to_html(block, profiler, single_pass=False, inline_cache=None):
+    clock = instrument.clock
+    inline_before = profiler.stage_seconds("inline")
+    start = clock()
+    block_type, lines = classify_block(block)
+    classified = clock()
+    node = build_html_node(block, block_type, lines, single_pass, inline_cache)
+    built = clock()
+    html = node.to_html()
+    done = clock()
+    inline = profiler.stage_seconds("inline") - inline_before
+    nodes = count_nodes(node)
+    profiler.record("classify", classified - start)
+    profiler.record("build", built - classified - inline, nodes=nodes)
+    profiler.record("serialize", done - built, nbytes=len(html))
+    profiler.record_block(block_type, done - start, nodes=nodes, nbytes=len(html))
+    return html
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children or ())
+
+
+def block_to_html(block, single_pass=False, inline_cache=None):
+    return block_to_html_node(block, single_pass, inline_cache).to_html()
+
+
+def block_to_html_node(block, single_pass=False, inline_cache=None):
+    block_type, lines = classify_block(block)
+    return build_html_node(block, block_type, lines, single_pass, inline_cache)
+
+
+def build_html_node(
+    block, block_type, lines=None, single_pass=False, inline_cache=None
+):
+    if block_type == BlockType.HEADING:
+        return md_to_heading_html_node(block)
+    elif block_type == BlockType.PARAGRAPH:
+        return md_to_paragraph_html_node(block, single_pass, inline_cache)
+    elif block_type == BlockType.QUOTE:
+        return md_to_quote_html_node(block, lines, single_pass, inline_cache)
+    elif block_type == BlockType.UNORDERED:
+        return md_to_unordered_list_html_node(block, lines)
+    elif block_type == BlockType.ORDERED:
+        return md_to_ordered_list_html_node(block, lines)
+    elif block_type == BlockType.CODE:
+        return md_to_code_html_node(block)
+    raise Exception(UNKNOWN_BLOCK_ERROR)
 
 
 # Markdown to Html helper functions
+HEADING_TEXT_START = {"h1": 2, "h2": 3, "h3": 4, "h4": 5, "h5": 6, "h6": 7}
+
+
 def md_to_heading_html_node(block):
-    start_dict = {"h1": 2, "h2": 3, "h3": 4, "h4": 5, "h5": 6, "h6": 7}
     tag = determine_heading_number(block)
-    text = block[start_dict[tag] :]
+    text = block[HEADING_TEXT_START[tag] :]
     return LeafNode(tag, text)
 
 
-def md_to_quote_html_node(block):
+def md_to_quote_html_node(block, lines=None, single_pass=False, inline_cache=None):
+    # lines is block already split by classify_block
+    if lines is None:
+        lines = block.split("\n")
     p_nodes = []
-    for block in block.split("\n"):
+    for block in lines:
         text = block.strip("> ")
-        p_node = md_to_paragraph_html_node(text)
+        p_node = md_to_paragraph_html_node(text, single_pass, inline_cache)
         p_nodes.append(p_node)
     quote_node = ParentNode("blockquote", p_nodes)
     return quote_node
 
 
-def md_to_paragraph_html_node(block):
-    text_nodes = text_to_text_nodes(block)
+def md_to_paragraph_html_node(block, single_pass=False, inline_cache=None):
+    if inline_cache is not None:
+        html = inline_cache.get_or_render(block, single_pass, inline_to_html)
+        return ParentNode("p", [RawNode(html)])
+    p = ParentNode("p", inline_to_html_nodes(block, single_pass))
+    return p
+
+
+def inline_to_html_nodes(text, single_pass=False):
+    profiler = instrument.profiler
+    if profiler is None:
+        text_nodes = text_to_text_nodes(text, single_pass)
+    else:
+        start = instrument.clock()
+        text_nodes = text_to_text_nodes(text, single_pass)
+        seconds = instrument.clock() - start
+        profiler.record("inline", seconds, nodes=len(text_nodes), nbytes=len(text))
     html_nodes = []
     for text_node in text_nodes:
         html_node = text_node_to_html_node(text_node)
         html_nodes.append(html_node)
-    p = ParentNode("p", html_nodes)
-    return p
+    return html_nodes
+
+
+def inline_to_html(text, single_pass=False):
+    html_nodes = inline_to_html_nodes(text, single_pass)
+    if not html_nodes:
+        raise ValueError(NO_CHILDREN_ERROR)
+    return "".join(node.to_html() for node in html_nodes)
 
 
-def md_to_unordered_list_html_node(block):
+def md_to_unordered_list_html_node(block, lines=None):
+    if lines is None:
+        lines = block.split("\n")
     item_nodes = []
-    for item in block.split("\n"):
+    for item in lines:
         item_node = LeafNode("li", item.strip("- "))
         item_nodes.append(item_node)
     ul_node = ParentNode("ul", item_nodes)
     return ul_node
 
 
-def md_to_ordered_list_html_node(block):
+def md_to_ordered_list_html_node(block, lines=None):
+    if lines is None:
+        lines = block.split("\n")
     item_nodes = []
-    for item in block.split("\n"):
+    for item in lines:
         text = item.split(".", 1)[1].strip()
         item_node = LeafNode("li", text)
         item_nodes.append(item_node)
@@ -0,0 +1,215 @@
+import html
+import json
+import os
+import re
+
+from atomic import write_json
+from serializer import TAG_REGEX
+
+# Only matches real headings, see serializer.TAG_REGEX
+HEADING_REGEX = re.compile(r"<h([1-6])>(.*?)</h\1>", re.DOTALL)
+TERM_REGEX = re.compile(r"\w\w+")
+SLUG_REGEX = re.compile(r"[^\w]+")
+SEARCH_DIR = "search"
+DOCS_NAME = "docs.json"
+# Terms are sharded on their first characters, so a browser only loads the
+# shard of what is typed
+SHARD_PREFIX = 2
+
+
+def slugify(text):
+    return SLUG_REGEX.sub("-", text.lower()).strip("-") or "section"
+
+
+class PageIndexer:
+    def __init__(self, sink):
+        """
+        Sink that passes html on to sink, indexing its text on the way, and
+        giving every heading an id so search results can link to it. Blocks
+        served from a cache are indexed like rendered ones.
+
+        Attrs:
+            self.title - (str) text of the first h1, "" without one
+            self.anchors - (list) of [id, heading text], the first is the top
+                of the page with id ""
+            self.terms - (dict) of term to the sorted indexes of the anchors
+                whose section holds it
+        """
+        self.sink = sink
+        self.title = ""
+        self.anchors = [["", ""]]
+        self.terms = {}
+        self._ids = set()
+
+    def write(self, part):
+        pos = 0
+        pieces = []
+        for heading in HEADING_REGEX.finditer(part):
+            self.add_text(part[pos : heading.start()])
+            level, inner = heading.groups()
+            anchor_id = self.add_heading(level, inner)
+            pieces.append(part[pos : heading.start()])
+            pieces.append(f'<h{level} id="{anchor_id}">{inner}</h{level}>')
+            pos = heading.end()
+        if not pos:
+            self.add_text(part)
+            return self.sink.write(part)
+        self.add_text(part[pos:])
+        pieces.append(part[pos:])
+        return self.sink.write("".join(pieces))
+
+    def add_heading(self, level, inner):
+        text = html_to_text(inner).strip()
+        if level == "1" and not self.title:
+            self.title = text
+        anchor_id = base = slugify(text)
+        n = 1
+        while anchor_id in self._ids:
+            n += 1
+            anchor_id = f"{base}-{n}"
+        self._ids.add(anchor_id)
+        self.anchors.append([anchor_id, text])
+        self.add_text(text)
+        return anchor_id
+
+    def add_text(self, html_text):
+        if not html_text:
+            return
+        anchor = len(self.anchors) - 1
+        terms = self.terms
+        for term in TERM_REGEX.findall(html_to_text(html_text).lower()):
+            anchors = terms.get(term)
+            if anchors is None:
+                terms[term] = [anchor]
+            elif anchors[-1] != anchor:
+                anchors.append(anchor)
+
+    def to_dict(self):
+        """
+        Returns what the site index needs of this page, JSON serializable.
+        """
+        return {"title": self.title, "anchors": self.anchors, "terms": self.terms}
+
+
+def html_to_text(html_text):
+    text = TAG_REGEX.sub(" ", html_text)
+    return html.unescape(text) if "&" in text else text
+
+
+def shard_key(term):
+    return term[:SHARD_PREFIX]
+
+
+def encode_postings(postings):
+    """
+    Returns postings, (page, anchor) pairs sorted by page, as one flat list
+    with each page stored as the difference to the previous one, so most
+    numbers in the index are small.
+    """
+    flat = []
+    previous = 0
+    for page, anchor in postings:
+        flat.append(page - previous)
+        flat.append(anchor)
+        previous = page
+    return flat
+
+
+def decode_postings(flat):
+    postings = []
+    page = 0
+    for i in range(0, len(flat), 2):
+        page += flat[i]
+        postings.append((page, flat[i + 1]))
+    return postings
+
+
+def build_search_index(manifest, public_dir, index_dir=None):
+    """
+    Writes the search index of every page indexed in a manifest.Manifest, see
+    build.build_site(search_index=True), to index_dir.
+
+    The index is DOCS_NAME, the url, title and anchors of every page and the
+    list of shards, plus one shard per term prefix mapping each term to its
+    encode_postings list of (page number, anchor number). Pages are indexed
+    once, when converted, so this only merges their terms. Shards listed by
+    the previous DOCS_NAME but not written again are removed, any other file
+    in index_dir, e.g. a page or an asset, is left alone.
+
+    Args:
+        index_dir - (str) defaults to public_dir/SEARCH_DIR
+
+    Returns:
+        (dict) of "pages", "terms", "shards" and "bytes" written
+    """
+    index_dir = index_dir or os.path.join(public_dir, SEARCH_DIR)
+    docs = []
+    postings = {}
+    for rel_path in sorted(manifest.entries):
+        entry = manifest.entries[rel_path]
+        search = entry.get("search")
+        if search is None:
+            continue
+        page = len(docs)
+        url = os.path.relpath(entry["output"], public_dir).replace(os.sep, "/")
+        docs.append(["/" + url, search["title"], search["anchors"]])
+        for term, anchors in search["terms"].items():
+            pairs = postings.get(term)
+            if pairs is None:
+                pairs = postings[term] = []
+            pairs.extend((page, anchor) for anchor in anchors)
+
+    shards = {}
+    for term in sorted(postings):
+        shard = shards.setdefault(shard_key(term), {})
+        shard[term] = encode_postings(postings[term])
+
+    docs_path = os.path.join(index_dir, DOCS_NAME)
+    previous = load_shard_list(docs_path)
+    index = {"prefix": SHARD_PREFIX, "shards": sorted(shards), "docs": docs}
+    write_json(docs_path, index, ensure_ascii=False)
+    for key, shard in shards.items():
+        write_json(os.path.join(index_dir, shard_path(key)), shard, ensure_ascii=False)
+    # Shards of terms no page holds any more
+    for key in previous:
+        path = os.path.join(index_dir, shard_path(key))
+        if key not in shards and os.path.exists(path):
+            os.remove(path)
+    written = [DOCS_NAME] + [shard_path(key) for key in shards]
+    nbytes = sum(os.path.getsize(os.path.join(index_dir, name)) for name in written)
+    return {
+        "pages": len(docs),
+        "terms": len(postings),
+        "shards": len(shards),
+        "bytes": nbytes,
+    }
+
+
+def load_shard_list(docs_path):
+    # A missing or unreadable index only means stale shards are not pruned
+    try:
+        with open(docs_path, encoding="utf-8") as f:
+            shards = json.load(f).get("shards", [])
+    except (OSError, ValueError, AttributeError):
+        return []
+    return [key for key in shards if isinstance(key, str)]
+
+
+def shard_path(key):
+    # Keys are \w characters, hex keeps file names portable
+    return key.encode().hex() + ".json"
+
+
+def load_postings(index_dir, term):
+    """
+    Returns the (page number, anchor number) pairs of term, as a browser would
+    look them up: only the shard of the term is read.
+    """
+    term = term.lower()
+    path = os.path.join(index_dir, shard_path(shard_key(term)))
+    try:
+        with open(path, encoding="utf-8") as f:
+            shard = json.load(f)
+    except FileNotFoundError:
+        return []
+    return decode_postings(shard.get(term, []))
@@ -0,0 +1,177 @@
+import re
+
+# Text and attribute values are escaped, and raw nodes only hold html rendered
+# here, so in the output every "<" starts a tag and no tag is split across
+# parts. Tags can be found with a regex rather than an html parser: links,
+# search and template read the html of md_to_html, written a block at a time,
+# this way.
+TAG_REGEX = re.compile(r"<[^>]*>")
+
+# Tag strings only depend on the tag name, so each is built once per process
+_open_tags = {}
+_close_tags = {}
+
+
+def escape_text(text):
+    # Most text has nothing to escape, the in checks are much cheaper than replace
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escape_attr(value):
+    if value.__class__ is not str:
+        value = str(value)
+    # escape_text inlined, attributes are escaped once per prop of every node
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    return value
+
+
+def attrs_to_html(props):
+    """
+    Returns props as an attribute string, e.g. ' href="/" class="nav"', values escaped.
+    """
+    # Nodes have one or two props, concatenating beats building a list to join
+    attrs = ""
+    for k, v in props.items():
+        attrs += f' {k}="{escape_attr(v)}"'
+    return attrs
+
+
+def open_tag(tag, props=None):
+    if props:
+        return f"<{tag}{attrs_to_html(props)}>"
+    html = _open_tags.get(tag)
+    if html is None:
+        html = _open_tags[tag] = f"<{tag}>"
+    return html
+
+
+def close_tag(tag):
+    html = _close_tags.get(tag)
+    if html is None:
+        html = _close_tags[tag] = f"</{tag}>"
+    return html
+
+
+def serialize(node):
+    """
+    Returns the html of an htmlnode tree, walking it once and joining the parts once.
+    """
+    return "".join(html_parts(node))
+
+
+def write_html(node, sink):
+    """
+    Writes the html of an htmlnode tree to sink, any object with a write method,
+    each part as soon as it is made.
+    """
+    write = sink.write
+    for part in html_parts(node):
+        write(part)
+
+
+def iter_html(node):
+    """
+    Yields the parts of the html of node, in document order.
+    """
+    return html_parts(node)
+
+
+def leaf_html(node):
+    value = node.value if node.raw else escape_text(node.value)
+    tag = node.tag
+    if tag is None:
+        return value
+    if node.props:
+        return f"<{tag}{attrs_to_html(node.props)}>{value}</{tag}>"
+    return f"<{tag}>{value}</{tag}>"
+
+
+def html_parts(node):
+    """
+    Yields the parts of the html of node, in document order, as the tree is
+    walked, so the first part is out before the rest of the tree is visited.
+
+    The tree is walked with an explicit stack of child iterators rather than
+    recursion, so any depth renders without RecursionError, and leaves, most
+    of any tree, are rendered inline without a call of their own.
+    Text is escaped, except the value of nodes marked raw (htmlnode.RawNode).
+    Nodes marked memoized (frozennode) yield their html as one part. The
+    first time, the parts of their subtree are held back, joined and handed
+    to their remember_html; only those parts are ever held in memory.
+    """
+    # Parts of the memoized subtrees being collected, and how many are open
+    parts = []
+    append = parts.append
+    collecting = 0
+    # One entry per open parent: (its siblings left, its close tag, the node
+    # if it is memoized and its html is being collected, its first part)
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    children = iter((node,))
+    closing = None
+    while True:
+        for child in children:
+            memoized = child.memoized
+            if memoized and child.html is not None:
+                html = child.html
+            elif child.children is None:
+                # leaf_html inlined
+                value = child.value if child.raw else escape_text(child.value)
+                tag = child.tag
+                if tag is None:
+                    html = value
+                elif child.props:
+                    html = f"<{tag}{attrs_to_html(child.props)}>{value}</{tag}>"
+                else:
+                    html = f"<{tag}>{value}</{tag}>"
+                if memoized:
+                    child.remember_html(html)
+            else:
+                tag = child.tag
+                if not tag or not child.children:
+                    child.validate()
+                if memoized:
+                    collecting += 1
+                push((children, closing, child if memoized else None, len(parts)))
+                if collecting:
+                    append(open_tag(tag, child.props))
+                else:
+                    yield open_tag(tag, child.props)
+                children = iter(child.children)
+                closing = close_tag(tag)
+                break
+            if collecting:
+                append(html)
+            else:
+                yield html
+        else:
+            if not stack:
+                return
+            if collecting:
+                append(closing)
+            else:
+                yield closing
+            children, closing, memo, first = pop()
+            if memo is not None:
+                html = "".join(parts[first:])
+                del parts[first:]
+                memo.remember_html(html)
+                collecting -= 1
+                if collecting:
+                    append(html)
+                else:
+                    yield html
@@ -0,0 +1,236 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from build import (
+    MARKDOWN_EXTENSIONS,
+    build_site,
+    convert_file,
+    init_worker,
+    output_path,
+)
+from manifest import MANIFEST_NAME, Manifest, converter_version
+from template import load_template
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8888
+DEFAULT_INTERVAL = 0.05
+# Seconds without changes before the watcher writes its manifest out
+DEFAULT_SAVE_DELAY = 1.0
+
+
+def snapshot(content_dir):
+    """
+    Returns {relative path: (mtime_ns, size)} for every markdown file under content_dir.
+    """
+    files = {}
+    # Entry paths all start with content_dir, slicing it off is much cheaper
+    # than os.path.relpath
+    prefix = len(os.path.join(content_dir, ""))
+    stack = [content_dir]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.name.endswith(MARKDOWN_EXTENSIONS):
+                    stat = entry.stat()
+                    files[entry.path[prefix:]] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+class Rebuild:
+    def __init__(self, pages, removed, latencies, seconds=0.0):
+        """
+        Outcome of one Watcher.poll
+
+        Attrs:
+            self.pages - (list) of build.PageResult for the pages converted
+            self.removed - (list) of output paths deleted
+            self.latencies - (list) of seconds from each source's save (its mtime)
+                to its fresh html being written
+            self.seconds - (float) wall time of the whole poll
+        """
+        self.pages = pages
+        self.removed = removed
+        self.latencies = latencies
+        self.seconds = seconds
+
+    def __bool__(self):
+        return bool(self.pages or self.removed)
+
+    def format(self):
+        lines = []
+        for page, latency in zip(self.pages, self.latencies):
+            status = f"ERROR {page.error}" if page.error else "ok"
+            lines.append(
+                f"{page.seconds * 1000:7.2f} ms convert, {latency * 1000:7.2f} ms "
+                f"save to html  {page.source}  {status}"
+            )
+        for output in self.removed:
+            lines.append(f"removed {output}")
+        lines.append(f"Poll took {self.seconds * 1000:.2f} ms")
+        return "\n".join(lines)
+
+
+class Watcher:
+    def __init__(
+        self,
+        content_dir,
+        public_dir,
+        cache_size=0,
+        template_path=None,
+        save_delay=DEFAULT_SAVE_DELAY,
+    ):
+        """
+        Keeps the converter warm in this process and re-renders only the
+        markdown files that changed since the last poll.
+
+        The manifest is loaded once and kept up to date in memory. Writing it
+        out costs as much as a large site's poll, so it is only saved once
+        the content has been left alone for save_delay seconds, or by save().
+
+        Args:
+            content_dir - (str) directory holding the markdown sources
+            public_dir - (str) directory the html files are written to
+            cache_size - (int) blocks kept in the in memory block cache, 0 disables it
+            template_path - (str) page template every page is wrapped in
+            save_delay - (float) seconds without changes before the manifest is saved
+        """
+        self.content_dir = content_dir
+        self.public_dir = public_dir
+        self.save_delay = save_delay
+        self.manifest_path = os.path.join(public_dir, MANIFEST_NAME)
+        self.template = load_template(template_path) if template_path else None
+        template_hash = self.template.hash if self.template else ""
+        self.manifest = Manifest.load(
+            self.manifest_path, converter_version(), template_hash
+        )
+        init_worker(cache_size, template=self.template)
+        self.files = snapshot(content_dir)
+        # time.monotonic() of the first change not saved yet, None when saved
+        self._unsaved = None
+
+    def save(self):
+        """
+        Writes the manifest out if any poll changed it.
+        """
+        if self._unsaved is not None:
+            self.manifest.save(self.manifest_path)
+            self._unsaved = None
+
+    def poll(self):
+        """
+        Converts new and modified files and deletes the outputs of removed ones.
+
+        Returns:
+            Rebuild
+        """
+        start = time.perf_counter()
+        files = snapshot(self.content_dir)
+        if files == self.files:
+            changed = gone = ()
+        else:
+            changed = [path for path, st in files.items() if self.files.get(path) != st]
+            gone = [path for path in self.files if path not in files]
+        self.files = files
+        if not changed and not gone:
+            if (
+                self._unsaved is not None
+                and time.monotonic() - self._unsaved >= self.save_delay
+            ):
+                self.save()
+            return Rebuild([], [], [], time.perf_counter() - start)
+
+        manifest = self.manifest
+        pages, latencies, removed = [], [], []
+        for rel_path in sorted(changed):
+            source = os.path.join(self.content_dir, rel_path)
+            output = output_path(rel_path, self.public_dir)
+            try:
+                _, entry = manifest.check(rel_path, source, output)
+            except FileNotFoundError:
+                # Deleted again since the snapshot, picked up by the next poll
+                continue
+            page = convert_file(source, output)
+            pages.append(page)
+            latencies.append(time.time() - entry["mtime_ns"] / 1e9)
+            if page.error:
+                manifest.fail(rel_path, output)
+            else:
+                manifest.record(rel_path, entry)
+        for rel_path in gone:
+            output = output_path(rel_path, self.public_dir)
+            if os.path.exists(output):
+                os.remove(output)
+                removed.append(output)
+            manifest.forget(rel_path)
+        self._unsaved = time.monotonic()
+        return Rebuild(pages, removed, latencies, time.perf_counter() - start)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(public_dir, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Serves public_dir over http from a daemon thread.
+
+    Returns:
+        the ThreadingHTTPServer, call shutdown() on it to stop serving
+    """
+    handler = functools.partial(QuietHandler, directory=public_dir)
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def watch(
+    content_dir,
+    public_dir,
+    interval=DEFAULT_INTERVAL,
+    serve=True,
+    host=DEFAULT_HOST,
+    port=DEFAULT_PORT,
+    cache_size=0,
+    log=print,
+    template_path=None,
+):
+    """
+    Builds the site once, then polls content_dir every interval seconds and
+    re-renders only the changed pages, optionally serving public_dir. Runs
+    until interrupted.
+    """
+    report = build_site(
+        content_dir,
+        public_dir,
+        workers=1,
+        cache_size=cache_size,
+        template_path=template_path,
+    )
+    log(report.format(per_file=False))
+    watcher = Watcher(content_dir, public_dir, cache_size, template_path)
+    server = None
+    if serve:
+        server = start_server(public_dir, host, port)
+        log(f"Serving {public_dir} on http://{host}:{server.server_address[1]}/")
+    log(f"Watching {content_dir} for changes, Ctrl+C to stop")
+    try:
+        while True:
+            rebuild = watcher.poll()
+            if rebuild:
+                log(rebuild.format())
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.save()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
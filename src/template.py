@@ -0,0 +1,140 @@
+import hashlib
+import os
+import re
+
+from serializer import TAG_REGEX
+
+SLOT_REGEX = re.compile(r"{{\s*(\w+)\s*}}")
+H1_REGEX = re.compile(r"<h1(?:\s[^>]*)?>(.*?)</h1>", re.DOTALL)
+TITLE_SLOT = "Title"
+CONTENT_SLOT = "Content"
+PAGE_SLOTS = (TITLE_SLOT, CONTENT_SLOT)
+MISSING_SLOT_ERROR = "template error: a slot has no value"
+UNKNOWN_SLOT_ERROR = "template error: no fragment file for a slot of the layout"
+
+# Templates compiled by load_template in this process, see template_signature
+_templates = {}
+
+
+class Template:
+    def __init__(self, source, fragments=None):
+        """
+        Page layout with {{ Slot }} placeholders, compiled once into a list of
+        static chunks with a hole per slot.
+
+        Fragments, html shared by every page such as the nav and footer, fill
+        their slots at compile time and are merged into the static chunks, so
+        a page only fills what differs per page and is rendered by one join.
+
+            template = Template(layout, {"Nav": nav_html})
+            template.render_page(markdown_to_html_node(markdown))
+
+        Args:
+            source - (str) the template, e.g. <title>{{ Title }}</title>
+            fragments - (dict) of slot name to the html filling it on every page
+
+        Attrs:
+            self.pieces - (list) of static str, with None for each slot left
+            self.slots - (list) of (index in self.pieces, slot name)
+            self.hash - (str) hash of the compiled template, fragments included
+        """
+        fragments = fragments or {}
+        pieces = []
+        slots = []
+        static = ""
+        # split alternates static text and slot names
+        for i, part in enumerate(SLOT_REGEX.split(source)):
+            if i % 2 == 0:
+                static += part
+            elif part in fragments:
+                static += fragments[part]
+            else:
+                pieces.append(static)
+                slots.append((len(pieces), part))
+                pieces.append(None)
+                static = ""
+        pieces.append(static)
+        self.pieces = pieces
+        self.slots = slots
+        self.slot_names = frozenset(name for _, name in slots)
+        self.hash = hashlib.sha256(repr((pieces, slots)).encode()).hexdigest()
+
+    def render(self, values):
+        """
+        Returns the template filled with values, a dict of slot name to str.
+        """
+        pieces = self.pieces.copy()
+        for index, name in self.slots:
+            try:
+                pieces[index] = values[name]
+            except KeyError:
+                raise ValueError(MISSING_SLOT_ERROR) from None
+        return "".join(pieces)
+
+    def render_page(self, html):
+        """
+        Returns the page for html, e.g. the output of markdown_to_html_node, with
+        the text of its first h1 as the Title, empty for a page without one.
+        """
+        values = {CONTENT_SLOT: html}
+        if TITLE_SLOT in self.slot_names:
+            values[TITLE_SLOT] = extract_title(html)
+        return self.render(values)
+
+
+def extract_title(html):
+    """
+    Returns the text of the first h1 in html, as made by md_to_heading_html_node,
+    "" when there is none.
+    """
+    found = H1_REGEX.search(html)
+    if not found:
+        return ""
+    # The title goes back into html, so it stays escaped
+    return TAG_REGEX.sub("", found.group(1)).strip()
+
+
+def fragment_path(path, slot):
+    # Fragments live next to the template, {{ Nav }} is filled by Nav.html
+    return os.path.join(os.path.dirname(path), slot + ".html")
+
+
+def template_signature(paths):
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def load_template(path):
+    """
+    Returns the Template in the file at path, each slot other than Title and
+    Content filled by the fragment file named after it next to the template.
+
+    Compiled templates are kept per process and only recompiled once the
+    template or one of its fragments changes, so every page of a build, and
+    every rebuild of a watch, shares one.
+    """
+    cached = _templates.get(path)
+    if cached is not None:
+        signature, template = cached
+        try:
+            if template_signature(entry[0] for entry in signature) == signature:
+                return template
+        except FileNotFoundError:
+            pass
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    fragments = {}
+    paths = [path]
+    for slot in set(SLOT_REGEX.findall(source)).difference(PAGE_SLOTS):
+        fragment = fragment_path(path, slot)
+        if not os.path.exists(fragment):
+            raise ValueError(UNKNOWN_SLOT_ERROR)
+        with open(fragment, encoding="utf-8") as f:
+            fragments[slot] = f.read()
+        paths.append(fragment)
+    template = Template(source, fragments)
+    _templates[path] = (template_signature(paths), template)
+    return template
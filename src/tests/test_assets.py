@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+
+from assets import (
+    ASSET_LIST_NAME,
+    NO_STATIC_DIR_ERROR,
+    asset_is_fresh,
+    find_asset_files,
+    sync_assets,
+)
+
+ASSETS = {
+    "styles.css": "body { margin: 0; }",
+    os.path.join("images", "logo.svg"): "<svg></svg>",
+    os.path.join("fonts", "sans", "regular.woff2"): "font data",
+}
+
+
+class TestSyncAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        for rel_path, data in ASSETS.items():
+            self.write(rel_path, data)
+        os.makedirs(self.public)
+        with open(os.path.join(self.public, "index.html"), "w") as f:
+            f.write("<html></html>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, data, mtime_ns=None):
+        path = os.path.join(self.static, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+        stat = os.stat(path)
+        # Make sure the change is visible even on coarse mtime filesystems
+        mtime_ns = mtime_ns or stat.st_mtime_ns + 10**9
+        os.utime(path, ns=(stat.st_atime_ns, mtime_ns))
+
+    def read_output(self, rel_path):
+        with open(os.path.join(self.public, rel_path), encoding="utf-8") as f:
+            return f.read()
+
+    def test_find_asset_files(self):
+        self.assertEqual(
+            list(find_asset_files(self.static)),
+            [
+                "styles.css",
+                os.path.join("fonts", "sans", "regular.woff2"),
+                os.path.join("images", "logo.svg"),
+            ],
+        )
+
+    def test_copies_every_asset(self):
+        report = sync_assets(self.static, self.public, workers=2)
+        self.assertEqual(len(report.copied), 3)
+        size = sum(len(data) for data in ASSETS.values())
+        self.assertEqual(report.copied_bytes, size)
+        for rel_path, data in ASSETS.items():
+            self.assertEqual(self.read_output(rel_path), data)
+        self.assertTrue(os.path.exists(os.path.join(self.public, ASSET_LIST_NAME)))
+        self.assertIn("Copied 3 assets", report.format())
+
+    def test_second_sync_copies_nothing(self):
+        sync_assets(self.static, self.public)
+        report = sync_assets(self.static, self.public)
+        self.assertEqual(report.copied, [])
+        self.assertEqual(report.unchanged, 3)
+
+    def test_changed_asset_is_copied(self):
+        sync_assets(self.static, self.public)
+        self.write("styles.css", "body { margin: 1em; }")
+        report = sync_assets(self.static, self.public)
+        self.assertEqual(report.copied, [os.path.join(self.public, "styles.css")])
+        self.assertEqual(self.read_output("styles.css"), "body { margin: 1em; }")
+
+    def test_hash_skips_touched_but_equal_assets(self):
+        sync_assets(self.static, self.public)
+        self.write("styles.css", ASSETS["styles.css"])
+        source = os.path.join(self.static, "styles.css")
+        output = os.path.join(self.public, "styles.css")
+        self.assertFalse(asset_is_fresh(source, output))
+        report = sync_assets(self.static, self.public, use_hash=True)
+        self.assertEqual(report.copied, [])
+        # The output took the source mtime, so the next check needs no hash
+        self.assertTrue(asset_is_fresh(source, output))
+
+    def test_removed_asset_is_pruned(self):
+        sync_assets(self.static, self.public)
+        os.remove(os.path.join(self.static, "fonts", "sans", "regular.woff2"))
+        report = sync_assets(self.static, self.public)
+        self.assertEqual(
+            report.removed,
+            [os.path.join(self.public, "fonts", "sans", "regular.woff2")],
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.public, "fonts")))
+        # Files that are not synced assets are left alone
+        self.assertEqual(self.read_output("index.html"), "<html></html>")
+
+    def test_raises_with_missing_static_dir(self):
+        with self.assertRaises(ValueError) as ve:
+            sync_assets(os.path.join(self.tmp.name, "missing"), self.public)
+        self.assertEqual(ve.exception.args[0], NO_STATIC_DIR_ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from async_build import build_site_async
+from build import build_site, output_path
+from search import DOCS_NAME, SEARCH_DIR
+
+PAGES = {
+    "index.md": "# Home\n\nWelcome to the **site**.",
+    os.path.join("blog", "first.md"): "# First post\n\n- one\n- two",
+    os.path.join("blog", "second.md"): "1. one\n2. two",
+    "broken.md": "This is **not closed",
+}
+
+
+def crash_worker(markdown):
+    os._exit(1)
+
+
+class TestBuildSiteAsync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        for rel_path, markdown in PAGES.items():
+            path = os.path.join(self.content, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(markdown)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, **kwargs):
+        return asyncio.run(
+            build_site_async(self.content, self.public, workers=2, **kwargs)
+        )
+
+    def read_output(self, rel_path, public=None):
+        with open(output_path(rel_path, public or self.public), encoding="utf-8") as f:
+            return f.read()
+
+    def test_matches_sync_build(self):
+        report = self.build(max_in_flight=1, io_threads=2)
+        sync_public = os.path.join(self.tmp.name, "sync")
+        sync_report = build_site(self.content, sync_public, workers=1)
+        self.assertEqual(
+            [page.source for page in report.pages],
+            [page.source for page in sync_report.pages],
+        )
+        for rel_path in PAGES:
+            if rel_path != "broken.md":
+                self.assertEqual(
+                    self.read_output(rel_path), self.read_output(rel_path, sync_public)
+                )
+
+    def test_matches_sync_build_with_template(self):
+        path = os.path.join(self.tmp.name, "template.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        self.build(template_path=path)
+        sync_public = os.path.join(self.tmp.name, "sync")
+        build_site(self.content, sync_public, workers=1, template_path=path)
+        for rel_path in ("index.md", os.path.join("blog", "first.md")):
+            self.assertEqual(
+                self.read_output(rel_path), self.read_output(rel_path, sync_public)
+            )
+        self.assertEqual(self.read_output("index.md")[:20], "<title>Home</title><")
+
+    def test_records_links(self):
+        with open(os.path.join(self.content, "links.md"), "w", encoding="utf-8") as f:
+            f.write("[first](blog/first.html) and ![missing](/img/x.png)")
+        report = self.build(record_links=True)
+        broken = report.links.broken(self.public)
+        self.assertEqual(broken, {"img/x.png": ["links.html"]})
+        page = [page for page in report.pages if page.source.endswith("links.md")][0]
+        self.assertEqual(page.links, ["blog/first.html", "/img/x.png"])
+
+    def test_search_index_matches_sync_build(self):
+        self.build(search_index=True)
+        sync_public = os.path.join(self.tmp.name, "sync")
+        build_site(self.content, sync_public, workers=1, search_index=True)
+        for rel_path in ("index.md", os.path.join("blog", "first.md")):
+            self.assertEqual(
+                self.read_output(rel_path), self.read_output(rel_path, sync_public)
+            )
+        for public in (self.public, sync_public):
+            path = os.path.join(public, SEARCH_DIR, DOCS_NAME)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(len(json.load(f)["docs"]), 3)
+
+    def test_reports_failed_pages(self):
+        report = self.build()
+        self.assertEqual(len(report.pages), 4)
+        self.assertEqual(len(report.failed), 1)
+        self.assertEqual(
+            report.failed[0].error, "Invalid markdown, formatted section not closed"
+        )
+        self.assertFalse(os.path.exists(output_path("broken.md", self.public)))
+
+    def test_reports_undecodable_pages(self):
+        with open(os.path.join(self.content, "binary.md"), "wb") as f:
+            f.write(b"\xff\xfe")
+        report = self.build()
+        sync_report = build_site(
+            self.content, os.path.join(self.tmp.name, "sync"), workers=1
+        )
+        self.assertEqual(len(report.pages), 5)
+        self.assertEqual(
+            [page.source for page in report.failed],
+            [page.source for page in sync_report.failed],
+        )
+        # Failed pages are left out of the manifest, the good ones are kept
+        self.assertEqual(len(self.build().pages), 2)
+
+    def test_converter_failure_stops_readers(self):
+        with mock.patch("async_build.convert_markdown", crash_worker):
+            with self.assertRaises(BrokenProcessPool):
+                asyncio.run(
+                    asyncio.wait_for(
+                        build_site_async(
+                            self.content, self.public, workers=1, max_in_flight=1
+                        ),
+                        timeout=30,
+                    )
+                )
+
+    def test_incremental(self):
+        self.build()
+        report = self.build()
+        # Only the failed page is retried
+        self.assertEqual(len(report.pages), 1)
+        self.assertEqual(len(report.unchanged), 3)
+
+    def test_block_cache_stats(self):
+        report = self.build(cache_size=16)
+        # Five blocks in the good pages and the one in broken.md
+        self.assertEqual(report.cache_stats()["misses"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
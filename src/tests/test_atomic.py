@@ -0,0 +1,46 @@
+import json
+import os
+import tempfile
+import unittest
+
+from atomic import atomic_path, write_json
+
+
+class TestAtomicPath(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "out", "page.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_replaces_path_once_written(self):
+        with atomic_path(self.path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("<p>new</p>")
+            self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.read(), "<p>new</p>")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["page.html"])
+
+    def test_failure_keeps_old_file(self):
+        write_json(self.path, "old")
+        with self.assertRaises(ValueError):
+            with atomic_path(self.path) as tmp_path:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write("<p>partial")
+                raise ValueError("conversion failed")
+        self.assertEqual(self.read(), '"old"')
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["page.html"])
+
+    def test_write_json(self):
+        write_json(self.path, {"b": [1, 2], "a": "é"}, sort_keys=True)
+        self.assertEqual(self.read(), '{"a":"\\u00e9","b":[1,2]}')
+        self.assertEqual(json.loads(self.read()), {"a": "é", "b": [1, 2]})
+
+
+if __name__ == "__main__":
+    unittest.main()
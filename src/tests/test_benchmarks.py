@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.corpus import CORPORA
+from benchmarks.suite import compare, read_results, run_suite, write_results
+from md_to_html import markdown_to_html_node
+
+
+def results(**timings):
+    return {"results": {name: {"min": t, "mean": t} for name, t in timings.items()}}
+
+
+class TestCorpus(unittest.TestCase):
+    def test_corpora_are_deterministic_and_convert(self):
+        for make_corpus in CORPORA.values():
+            documents = make_corpus()
+            self.assertEqual(documents, make_corpus())
+            if isinstance(documents, str):
+                documents = [documents]
+            markdown_to_html_node(documents[0])
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_regressions_over_threshold(self):
+        baseline = results(a=1.0, b=1.0, c=1.0)
+        current = results(a=1.1, b=1.5, d=9.0)
+        self.assertEqual(compare(current, baseline, 0.25), [("b", 1.0, 1.5, 1.5)])
+
+    def test_no_regressions(self):
+        self.assertEqual(compare(results(a=0.5), results(a=1.0)), [])
+
+    def test_run_suite_writes_comparable_results(self):
+        suite = run_suite(repeat=1, only="huge_code/block_to_blocktype")
+        self.assertEqual(list(suite["results"]), ["huge_code/block_to_blocktype"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.json")
+            write_results(suite, path)
+            self.assertEqual(read_results(path), suite)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,11 @@
 import unittest
-from blocks import BlockType, block_to_blocktype
+from blocks import (
+    BlockType,
+    block_to_blocktype,
+    classify_block,
+    determine_heading_number,
+    heading_level,
+)
 
 
 class TestBlocksToBlockType(unittest.TestCase):
@@ -94,5 +100,45 @@ class TestBlocksToBlockType(unittest.TestCase):
         self.assertEqual(actual, expected)
 
 
+class TestClassifyBlock(unittest.TestCase):
+    def test_returns_split_lines_for_quotes_and_lists(self):
+        self.assertEqual(
+            classify_block("> one\n> two"), (BlockType.QUOTE, ["> one", "> two"])
+        )
+        self.assertEqual(
+            classify_block("- one\n- two"), (BlockType.UNORDERED, ["- one", "- two"])
+        )
+        self.assertEqual(
+            classify_block("1. one\n2. two"), (BlockType.ORDERED, ["1. one", "2. two"])
+        )
+
+    def test_returns_no_lines_for_other_blocks(self):
+        self.assertEqual(classify_block("## Heading"), (BlockType.HEADING, None))
+        self.assertEqual(classify_block("```code```"), (BlockType.CODE, None))
+        self.assertEqual(classify_block("Paragraph"), (BlockType.PARAGRAPH, None))
+        self.assertEqual(classify_block(""), (BlockType.PARAGRAPH, None))
+
+    def test_falls_back_to_paragraph(self):
+        blocks = [
+            "#no space",
+            "####### seven hashes",
+            "```not closed",
+            "> quote\nnot quote",
+            "- item\nnot item",
+            "10. not starting at one",
+        ]
+        for block in blocks:
+            self.assertEqual(classify_block(block), (BlockType.PARAGRAPH, None))
+
+    def test_heading_level(self):
+        self.assertEqual(heading_level("# One"), 1)
+        self.assertEqual(heading_level("###### Six"), 6)
+        self.assertEqual(heading_level("####### Seven"), 0)
+        self.assertEqual(heading_level("#None"), 0)
+        self.assertEqual(determine_heading_number("### Three"), "h3")
+        with self.assertRaises(Exception):
+            determine_heading_number("Not a heading")
+
+
 if __name__ == "__main__":
     unittest.main()
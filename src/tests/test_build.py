@@ -0,0 +1,251 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from build import (
+    NO_CONTENT_DIR_ERROR,
+    build_site,
+    default_chunksize,
+    find_markdown_files,
+    output_path,
+)
+
+PAGES = {
+    "index.md": "# Home\n\nWelcome to the **site**.",
+    os.path.join("blog", "first.md"): "# First post\n\n- one\n- two",
+    os.path.join("blog", "second.markdown"): "1. one\n2. two",
+}
+
+
+class TestBuildSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        for rel_path, markdown in PAGES.items():
+            path = os.path.join(self.content, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(markdown)
+        with open(os.path.join(self.content, "notes.txt"), "w") as f:
+            f.write("not markdown")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_output(self, rel_path):
+        with open(output_path(rel_path, self.public), encoding="utf-8") as f:
+            return f.read()
+
+    def test_find_markdown_files(self):
+        self.assertEqual(
+            list(find_markdown_files(self.content)),
+            [
+                "index.md",
+                os.path.join("blog", "first.md"),
+                os.path.join("blog", "second.markdown"),
+            ],
+        )
+
+    def test_output_path(self):
+        self.assertEqual(
+            output_path(os.path.join("blog", "first.md"), "public"),
+            os.path.join("public", "blog", "first.html"),
+        )
+
+    def test_build_in_process(self):
+        report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(report.workers, 1)
+        self.assertEqual(len(report.pages), 3)
+        self.assertEqual(report.failed, [])
+        self.assertEqual(
+            self.read_output("index.md"),
+            "<div><h1>Home</h1><p>Welcome to the <b>site</b>.</p></div>",
+        )
+        self.assertEqual(
+            self.read_output(os.path.join("blog", "second.markdown")),
+            "<div><ol><li>one</li><li>two</li></ol></div>",
+        )
+
+    def test_build_with_process_pool(self):
+        report = build_site(self.content, self.public, workers=2, chunksize=1)
+        self.assertEqual(report.workers, 2)
+        self.assertEqual(report.failed, [])
+        self.assertEqual(
+            self.read_output(os.path.join("blog", "first.md")),
+            "<div><h1>First post</h1><ul><li>one</li><li>two</li></ul></div>",
+        )
+
+    def test_failed_page_is_reported(self):
+        with open(os.path.join(self.content, "broken.md"), "w") as f:
+            f.write("This is **not closed")
+        report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(len(report.failed), 1)
+        self.assertEqual(
+            report.failed[0].error, "Invalid markdown, formatted section not closed"
+        )
+        self.assertFalse(os.path.exists(output_path("broken.md", self.public)))
+        self.assertIn("Built 3/4 pages", report.format())
+
+    def test_raises_with_missing_content_dir(self):
+        with self.assertRaises(ValueError) as ve:
+            build_site(os.path.join(self.tmp.name, "missing"), self.public)
+        self.assertEqual(ve.exception.args[0], NO_CONTENT_DIR_ERROR)
+
+    def test_second_build_skips_unchanged_pages(self):
+        build_site(self.content, self.public, workers=1)
+        report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(report.pages, [])
+        self.assertEqual(len(report.unchanged), 3)
+
+    def test_edited_page_is_rebuilt(self):
+        build_site(self.content, self.public, workers=1)
+        with open(os.path.join(self.content, "index.md"), "w") as f:
+            f.write("# Home again")
+        report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(
+            [page.source for page in report.pages],
+            [os.path.join(self.content, "index.md")],
+        )
+        self.assertEqual(self.read_output("index.md"), "<div><h1>Home again</h1></div>")
+
+    def test_removed_source_deletes_output(self):
+        build_site(self.content, self.public, workers=1)
+        os.remove(os.path.join(self.content, "index.md"))
+        report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(report.removed, [output_path("index.md", self.public)])
+        self.assertFalse(os.path.exists(output_path("index.md", self.public)))
+
+    def test_converter_change_rebuilds_everything(self):
+        build_site(self.content, self.public, workers=1)
+        with mock.patch("build.converter_version", return_value="changed"):
+            report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(len(report.pages), 3)
+
+    def test_failed_page_is_retried(self):
+        with open(os.path.join(self.content, "broken.md"), "w") as f:
+            f.write("This is **not closed")
+        build_site(self.content, self.public, workers=1)
+        report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(len(report.pages), 1)
+        self.assertEqual(len(report.failed), 1)
+
+    def test_failed_then_removed_source_deletes_output(self):
+        build_site(self.content, self.public, workers=1)
+        source = os.path.join(self.content, "index.md")
+        with open(source, "w") as f:
+            f.write("**bold")
+        report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(len(report.failed), 1)
+        os.remove(source)
+        report = build_site(self.content, self.public, workers=1)
+        self.assertEqual(report.removed, [output_path("index.md", self.public)])
+        self.assertFalse(os.path.exists(output_path("index.md", self.public)))
+
+    def test_not_incremental_rebuilds_everything(self):
+        build_site(self.content, self.public, workers=1)
+        report = build_site(self.content, self.public, workers=1, incremental=False)
+        self.assertEqual(len(report.pages), 3)
+
+    def test_build_with_block_cache(self):
+        cache_path = os.path.join(self.tmp.name, "blocks.sqlite")
+        report = build_site(
+            self.content, self.public, workers=2, cache_size=16, cache_path=cache_path
+        )
+        self.assertEqual(report.cache_stats()["misses"], 5)
+        self.assertEqual(
+            self.read_output("index.md"),
+            "<div><h1>Home</h1><p>Welcome to the <b>site</b>.</p></div>",
+        )
+        report = build_site(
+            self.content,
+            self.public,
+            workers=1,
+            incremental=False,
+            cache_size=16,
+            cache_path=cache_path,
+        )
+        self.assertEqual(report.cache_stats()["disk_hits"], 5)
+        self.assertIn("Block cache:", report.format())
+
+    def test_build_with_inline_cache(self):
+        report = build_site(self.content, self.public, workers=1, inline_cache_size=8)
+        stats = report.cache_stats()
+        self.assertEqual(stats["inline_misses"], 1)
+        self.assertNotIn("misses", stats)
+        self.assertEqual(
+            self.read_output("index.md"),
+            "<div><h1>Home</h1><p>Welcome to the <b>site</b>.</p></div>",
+        )
+
+    def write_template(self, layout):
+        path = os.path.join(self.tmp.name, "template.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(layout)
+        return path
+
+    def test_build_with_template(self):
+        path = self.write_template(
+            "<title>{{ Title }}</title><article>{{ Content }}</article>"
+        )
+        report = build_site(self.content, self.public, workers=2, template_path=path)
+        self.assertEqual(
+            self.read_output(os.path.join("blog", "first.md")),
+            "<title>First post</title><article><div><h1>First post</h1>"
+            "<ul><li>one</li><li>two</li></ul></div></article>",
+        )
+        # A page without an h1 gets an empty title rather than failing
+        self.assertEqual(report.failed, [])
+        self.assertEqual(
+            self.read_output(os.path.join("blog", "second.markdown")),
+            "<title></title><article><div><ol><li>one</li><li>two</li></ol></div>"
+            "</article>",
+        )
+
+    def test_template_change_rebuilds_everything(self):
+        path = self.write_template("<main>{{ Content }}</main>")
+        build_site(self.content, self.public, workers=1, template_path=path)
+        report = build_site(self.content, self.public, workers=1, template_path=path)
+        self.assertEqual(len(report.unchanged), 3)
+        path = self.write_template("<body>{{ Content }}</body>")
+        report = build_site(self.content, self.public, workers=1, template_path=path)
+        self.assertEqual(len(report.pages), 3)
+        self.assertEqual(
+            self.read_output("index.md"),
+            "<body><div><h1>Home</h1><p>Welcome to the <b>site</b>.</p></div></body>",
+        )
+
+    def test_build_records_links(self):
+        path = os.path.join(self.content, "links.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[home](index.html), [first](blog/first.html) and [gone](/gone/)")
+        build_site(self.content, self.public, workers=1)
+        # Pages built without links are built again to record them
+        report = build_site(self.content, self.public, workers=2, record_links=True)
+        self.assertEqual(len(report.pages), 4)
+        self.assertEqual(
+            report.links.broken(self.public), {"gone/index.html": ["links.html"]}
+        )
+        report = build_site(self.content, self.public, workers=1, record_links=True)
+        self.assertEqual(report.pages, [])
+        self.assertEqual(
+            sorted(report.links.internal),
+            ["blog/first.html", "gone/index.html", "index.html"],
+        )
+        self.assertIsNone(build_site(self.content, self.public, workers=1).links)
+
+    def test_build_with_profile(self):
+        report = build_site(self.content, self.public, workers=2, profile=True)
+        profiler = report.profile()
+        self.assertEqual(profiler.stages["classify"]["calls"], 5)
+        self.assertEqual(profiler.block_types["heading"]["calls"], 2)
+        self.assertIsNone(build_site(self.content, self.public, workers=1).profile())
+
+    def test_default_chunksize(self):
+        self.assertEqual(default_chunksize(10, 4), 1)
+        self.assertEqual(default_chunksize(10000, 8), 312)
+
+
+if __name__ == "__main__":
+    unittest.main()
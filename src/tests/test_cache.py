@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+
+from cache import INVALID_CACHE_SIZE_ERROR, BlockCache, InlineCache, LRUCache
+from md_to_html import block_to_html, inline_to_html, markdown_to_html_node
+
+MD = """
+# Title
+
+Shared **footer** text.
+
+Shared **footer** text.
+"""
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_raises_with_invalid_size(self):
+        with self.assertRaises(ValueError) as ve:
+            LRUCache(0)
+        self.assertEqual(ve.exception.args[0], INVALID_CACHE_SIZE_ERROR)
+
+
+class TestBlockCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "blocks.sqlite")
+        self.renders = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def render(self, block):
+        self.renders.append(block)
+        return block_to_html(block)
+
+    def test_renders_each_block_once(self):
+        cache = BlockCache(8)
+        for _ in range(3):
+            html = cache.get_or_render("Some **bold**", self.render)
+        self.assertEqual(html, "<p>Some <b>bold</b></p>")
+        self.assertEqual(self.renders, ["Some **bold**"])
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_disk_tier_is_shared_between_instances(self):
+        BlockCache(8, self.path).get_or_render("# Title", self.render)
+        cache = BlockCache(8, self.path)
+        html = cache.get_or_render("# Title", self.render)
+        self.assertEqual(html, "<h1>Title</h1>")
+        self.assertEqual(len(self.renders), 1)
+        self.assertEqual(cache.stats()["disk_hits"], 1)
+
+    def test_parsers_do_not_share_blocks(self):
+        markdown = "see [docs](https://x/a_b) and _c_"
+        cache = BlockCache(8, self.path)
+        markdown_to_html_node(markdown, cache, single_pass=True)
+        # The chained parser rejects it, whatever the single pass one cached
+        for cache in (cache, BlockCache(8, self.path)):
+            with self.assertRaises(ValueError):
+                markdown_to_html_node(markdown, cache)
+
+    def test_markdown_to_html_node_with_cache(self):
+        cache = BlockCache(8)
+        self.assertEqual(markdown_to_html_node(MD, cache), markdown_to_html_node(MD))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+
+class TestInlineCache(unittest.TestCase):
+    def setUp(self):
+        self.renders = []
+
+    def render(self, text, single_pass):
+        self.renders.append(text)
+        return inline_to_html(text, single_pass)
+
+    def test_returns_the_same_fragment(self):
+        cache = InlineCache(8)
+        first = cache.get_or_render("See [docs](/docs)", False, self.render)
+        second = cache.get_or_render("See [docs](/docs)", False, self.render)
+        self.assertEqual(first, 'See <a href="/docs">docs</a>')
+        self.assertIs(first, second)
+        self.assertEqual(len(self.renders), 1)
+
+    def test_parsers_are_cached_apart(self):
+        cache = InlineCache(8)
+        cache.get_or_render("_a_", False, self.render)
+        cache.get_or_render("_a_", True, self.render)
+        self.assertEqual(len(self.renders), 2)
+
+    def test_invalid_markdown_is_not_cached(self):
+        cache = InlineCache(8)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.get_or_render("**open", False, self.render)
+        self.assertEqual(len(cache), 0)
+
+    def test_markdown_to_html_node_with_inline_cache(self):
+        markdown = "> Shared **footer** text.\n> Other\n\n" + MD
+        cache = InlineCache(1)
+        self.assertEqual(
+            markdown_to_html_node(markdown, inline_cache=cache),
+            markdown_to_html_node(markdown),
+        )
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from converter import PROCESS, THREAD, UNKNOWN_MODE_ERROR, Converter, convert_many
+from md_to_html import markdown_to_html_node
+
+DOCUMENTS = [
+    f"## Comment {i}\n\nThanks for the **fix** in [#{i}](https://example.com/{i})\n\n"
+    "> Sent from my phone"
+    for i in range(12)
+]
+EXPECTED = [markdown_to_html_node(doc) for doc in DOCUMENTS]
+
+
+class TestConverter(unittest.TestCase):
+    def test_convert_matches_markdown_to_html_node(self):
+        converter = Converter()
+        for doc, html in zip(DOCUMENTS, EXPECTED):
+            self.assertEqual(converter.convert(doc), html)
+
+    def test_convert_many_serial(self):
+        self.assertEqual(Converter().convert_many(DOCUMENTS), EXPECTED)
+
+    def test_convert_many_accepts_generator(self):
+        documents = (doc for doc in DOCUMENTS)
+        self.assertEqual(Converter().convert_many(documents, workers=3), EXPECTED)
+
+    def test_convert_many_threads_keep_order(self):
+        converter = Converter()
+        self.assertEqual(converter.convert_many(DOCUMENTS, 4, THREAD), EXPECTED)
+
+    def test_convert_many_processes_keep_order(self):
+        html = Converter().convert_many(DOCUMENTS, 2, PROCESS, chunksize=5)
+        self.assertEqual(html, EXPECTED)
+
+    def test_single_pass_inline_parser(self):
+        converter = Converter(cache_size=0, single_pass=True)
+        self.assertIsNone(converter.cache)
+        self.assertEqual(converter.convert_many(DOCUMENTS), EXPECTED)
+
+    def test_default_parser_matches_markdown_to_html_node(self):
+        markdown = "see [docs](https://x/a_b) and _c_"
+        with self.assertRaises(ValueError):
+            markdown_to_html_node(markdown)
+        with self.assertRaises(ValueError):
+            Converter().convert(markdown)
+
+    def test_shared_blocks_hit_the_cache(self):
+        converter = Converter()
+        converter.convert_many(DOCUMENTS)
+        stats = converter.cache.stats()
+        # The quote is the same in every document
+        self.assertEqual(stats["hits"], len(DOCUMENTS) - 1)
+
+    def test_raises_with_unknown_mode(self):
+        with self.assertRaises(ValueError) as ve:
+            Converter().convert_many(DOCUMENTS, 2, "fiber")
+        self.assertEqual(ve.exception.args[0], UNKNOWN_MODE_ERROR)
+
+    def test_convert_many_function(self):
+        self.assertEqual(convert_many(DOCUMENTS, cache_size=0), EXPECTED)
+
+    def test_errors_propagate(self):
+        with self.assertRaises(ValueError):
+            Converter().convert_many(["fine", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+from unittest import mock
+
+from blocks import BlockType
+from cache import BlockCache
+from document import (
+    EDIT_RANGE_ERROR,
+    IncrementalDocument,
+    LazyDocument,
+    common_prefix_length,
+    common_suffix_length,
+)
+from htmlnode import NO_CHILDREN_ERROR
+from md_to_html import build_html_node, markdown_to_html_node
+
+MD = """# Title
+
+Intro with **bold** and a [link](/x).
+
+```
+code
+
+with a blank line
+```
+
+   
+
+- one
+- two
+
+> quoted
+"""
+
+
+class TestLazyDocument(unittest.TestCase):
+    def test_render_matches_markdown_to_html_node(self):
+        self.assertEqual(LazyDocument(MD).render(), markdown_to_html_node(MD))
+        self.assertEqual(LazyDocument(MD.encode()).render(), markdown_to_html_node(MD))
+
+    def test_render_matches_markdown_to_html_node_with_crlf(self):
+        md = MD.replace("\n", "\r\n")
+        html = markdown_to_html_node(md)
+        self.assertEqual(html, markdown_to_html_node(MD))
+        self.assertEqual(LazyDocument(md).render(), html)
+        self.assertEqual(LazyDocument(md.encode()).render(), html)
+
+    def test_indexes_blocks(self):
+        doc = LazyDocument(MD)
+        self.assertEqual(len(doc), 5)
+        self.assertEqual(doc.block(0), "# Title")
+        self.assertEqual(doc.block(2), "```\ncode\n\nwith a blank line\n```")
+        self.assertEqual(doc.block(-1), "> quoted")
+
+    def test_classifies_on_demand(self):
+        doc = LazyDocument(MD)
+        self.assertEqual(doc.block_type(3), BlockType.UNORDERED)
+        self.assertEqual(doc._block_types.count(None), 4)
+
+    def test_random_access_renders_only_that_block(self):
+        doc = LazyDocument(MD)
+        with mock.patch("document.build_html_node", wraps=build_html_node) as build:
+            self.assertEqual(doc[3], "<ul><li>one</li><li>two</li></ul>")
+            self.assertEqual(doc[3], "<ul><li>one</li><li>two</li></ul>")
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(doc._html.count(None), 4)
+
+    def test_render_slice(self):
+        doc = LazyDocument(MD)
+        self.assertEqual(
+            doc.render(0, 2),
+            '<div><h1>Title</h1><p>Intro with <b>bold</b> and a <a href="/x">link</a>.</p></div>',
+        )
+        self.assertEqual(doc[3:], [doc[3], doc[4]])
+        self.assertEqual(doc._html.count(None), 1)
+
+    def test_with_block_cache(self):
+        cache = BlockCache(8)
+        LazyDocument(MD, cache).render()
+        self.assertEqual(LazyDocument(MD, cache).render(), markdown_to_html_node(MD))
+        self.assertEqual(cache.stats()["hits"], 5)
+
+    def test_out_of_range(self):
+        doc = LazyDocument(MD)
+        with self.assertRaises(IndexError):
+            doc[5]
+        with self.assertRaises(ValueError) as ve:
+            doc.render(5)
+        self.assertEqual(ve.exception.args[0], NO_CHILDREN_ERROR)
+
+
+class TestIncrementalDocument(unittest.TestCase):
+    def assert_matches_fresh(self, doc):
+        fresh = LazyDocument(doc.buf)
+        self.assertEqual(doc.spans, fresh.spans)
+        self.assertEqual(doc.render(), fresh.render())
+
+    def test_edit_inside_a_block(self):
+        doc = IncrementalDocument(MD)
+        doc.render()
+        offset = MD.index("Intro") + len("Intro")
+        self.assertEqual(doc.edit(offset, 0, " text"), (1, 1, 1))
+        self.assertEqual(doc._html.count(None), 1)
+        self.assertEqual(doc.block(1)[:16], "Intro text with ")
+        self.assert_matches_fresh(doc)
+
+    def test_edit_splits_and_joins_blocks(self):
+        doc = IncrementalDocument(MD)
+        doc.render()
+        offset = MD.index("- two")
+        self.assertEqual(doc.edit(offset, 0, "\n"), (3, 1, 2))
+        self.assert_matches_fresh(doc)
+        self.assertEqual(doc.edit(offset, 1, ""), (3, 2, 1))
+        self.assertEqual(doc.render(), markdown_to_html_node(MD))
+
+    def test_opening_a_fence_swallows_later_blocks(self):
+        doc = IncrementalDocument(MD)
+        doc.render()
+        self.assertEqual(doc.edit(MD.index("- one"), 0, "```\n"), (3, 2, 1))
+        self.assertEqual(doc.spans, LazyDocument(doc.buf).spans)
+        self.assertEqual(doc.edit(len(doc.buf), 0, "```\n"), (3, 1, 1))
+        self.assertEqual(len(doc), 4)
+        self.assertEqual(doc.block_type(3), BlockType.CODE)
+        self.assert_matches_fresh(doc)
+
+    def test_moved_blocks_keep_their_html(self):
+        doc = IncrementalDocument(MD)
+        html = doc.render()
+        self.assertEqual(doc.edit(0, 0, "New first paragraph\n\n"), (0, 0, 1))
+        self.assertEqual(doc._html.count(None), 1)
+        self.assertEqual(doc.render(1), html)
+
+    def test_update_with_full_text(self):
+        doc = IncrementalDocument(MD)
+        doc.render()
+        new = MD.replace("> quoted", "> quoted\n> again")
+        self.assertEqual(doc.update(new), (4, 1, 1))
+        self.assertEqual(doc.render(), markdown_to_html_node(new))
+        self.assertEqual(doc.update(new), (5, 0, 0))
+
+    def test_edit_out_of_range(self):
+        doc = IncrementalDocument(MD)
+        with self.assertRaises(ValueError) as ve:
+            doc.edit(len(MD), 1, "")
+        self.assertEqual(ve.exception.args[0], EDIT_RANGE_ERROR)
+
+    def test_common_prefix_and_suffix_length(self):
+        a = "x" * 10000 + "abc" + "y" * 5000
+        b = "x" * 10000 + "aXc" + "y" * 5000
+        self.assertEqual(common_prefix_length(a, b), 10001)
+        self.assertEqual(common_suffix_length(a, b, len(a) - 10001), 5001)
+        self.assertEqual(common_prefix_length("ab", "abc"), 2)
+        self.assertEqual(common_suffix_length("aa", "aaa", 2), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
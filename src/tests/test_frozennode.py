@@ -0,0 +1,102 @@
+import unittest
+
+from frozennode import (
+    FROZEN_NODE_ERROR,
+    FrozenLeafNode,
+    FrozenParentNode,
+    NodeTable,
+)
+from cache import InlineCache
+from htmlnode import NO_CHILDREN_ERROR, NO_VALUE_ERROR, LeafNode, ParentNode, RawNode
+from md_to_html import block_to_html_node
+from textnode import TextNode, TextType
+
+
+class TestFrozenNodes(unittest.TestCase):
+    def test_nodes_cannot_change(self):
+        leaf = FrozenLeafNode("a", "home", {"href": "/"})
+        with self.assertRaises(AttributeError) as ae:
+            leaf.value = "away"
+        self.assertEqual(ae.exception.args[0], FROZEN_NODE_ERROR)
+        with self.assertRaises(TypeError):
+            leaf.props["href"] = "/away"
+        parent = FrozenParentNode("p", [leaf])
+        with self.assertRaises(AttributeError):
+            parent.children.append(leaf)
+
+    def test_props_are_copied(self):
+        props = {"href": "/"}
+        leaf = FrozenLeafNode("a", "home", props)
+        props["href"] = "/away"
+        self.assertEqual(leaf.to_html(), '<a href="/">home</a>')
+
+    def test_equal_nodes_hash_equal(self):
+        first = FrozenParentNode("li", [FrozenLeafNode("b", "x")])
+        second = FrozenParentNode("li", [FrozenLeafNode("b", "x")])
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, FrozenParentNode("li", [FrozenLeafNode("i", "x")]))
+        self.assertEqual(len({first, second}), 1)
+
+    def test_validates_like_mutable_nodes(self):
+        with self.assertRaises(ValueError) as ve:
+            FrozenLeafNode("b", "")
+        self.assertEqual(ve.exception.args[0], NO_VALUE_ERROR)
+        with self.assertRaises(ValueError) as ve:
+            FrozenParentNode("p", [])
+        self.assertEqual(ve.exception.args[0], NO_CHILDREN_ERROR)
+
+
+class TestNodeTable(unittest.TestCase):
+    def setUp(self):
+        self.table = NodeTable()
+
+    def test_identical_nodes_are_shared(self):
+        space = self.table.leaf(None, " ")
+        self.assertIs(self.table.leaf(None, " "), space)
+        first = self.table.parent("li", [self.table.leaf("b", "tag")])
+        second = self.table.parent("li", [self.table.leaf("b", "tag")])
+        self.assertIs(first, second)
+        self.assertEqual(self.table.stats()["size"], 3)
+
+    def test_text_nodes_are_shared_and_hashable(self):
+        node = self.table.text("docs", TextType.LINK, "/docs")
+        self.assertIs(self.table.text("docs", TextType.LINK, "/docs"), node)
+        self.assertEqual(node, TextNode("docs", TextType.LINK, "/docs"))
+        with self.assertRaises(AttributeError):
+            node.url = "/away"
+
+    def test_freeze_keeps_the_html(self):
+        tree = block_to_html_node("> Some **bold** and [a link](/x)\n> again")
+        frozen = self.table.freeze(tree)
+        self.assertIsInstance(frozen, FrozenParentNode)
+        self.assertEqual(frozen.to_html(), tree.to_html())
+        self.assertEqual("".join(frozen.iter_html()), tree.to_html())
+        self.assertIs(self.table.freeze(tree), frozen)
+
+    def test_freeze_keeps_raw_html_unescaped(self):
+        frozen = self.table.freeze(ParentNode("p", [RawNode("<b>x</b>")]))
+        self.assertEqual(frozen.to_html(), "<p><b>x</b></p>")
+        # Not shared with a leaf of the same text, which is escaped
+        leaf = self.table.leaf(None, "<b>x</b>")
+        self.assertIsNot(frozen.children[0], leaf)
+        self.assertEqual(leaf.to_html(), "&lt;b&gt;x&lt;/b&gt;")
+
+    def test_freeze_keeps_the_html_of_inline_cached_paragraphs(self):
+        tree = block_to_html_node("Some **bold** & [a link](/x)", False, InlineCache())
+        self.assertEqual(self.table.freeze(tree).to_html(), tree.to_html())
+
+    def test_shared_subtree_html_is_computed_once(self):
+        item = self.table.parent("li", [LeafNode("a", "python", {"href": "/py"})])
+        page = self.table.parent("ul", [item, item, item])
+        html = item.to_html()
+        self.assertIs(item.to_html(), html)
+        self.assertEqual(page.to_html(), "<ul>" + html * 3 + "</ul>")
+
+    def test_frozen_tree_inside_mutable_tree(self):
+        item = self.table.parent("li", [self.table.leaf(None, "x")])
+        self.assertEqual(ParentNode("ul", [item]).to_html(), "<ul><li>x</li></ul>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from htmlnode import (
@@ -115,6 +116,23 @@ class TestParentNode(unittest.TestCase):
         expected = f'<div class="mydiv"><p>{PARA + " 1"}</p><p>{PARA + " 2"}</p></div>'
         self.assertEqual(result, expected)
 
+    def test_iter_html_yields_chunks_in_order(self):
+        grandchild_node = LeafNode("b", "grandchild")
+        child_node = ParentNode("span", [grandchild_node])
+        parent_node = ParentNode("div", [child_node], {"class": "mydiv"})
+        self.assertEqual(
+            list(parent_node.iter_html()),
+            ['<div class="mydiv">', "<span>", "<b>grandchild</b>", "</span>", "</div>"],
+        )
+
+    def test_write_html_matches_to_html(self):
+        p1 = LeafNode("p", (PARA + " 1"))
+        p2 = LeafNode(None, (PARA + " 2"))
+        div = ParentNode("div", [p1, ParentNode("section", [p2])])
+        sink = io.StringIO()
+        div.write_html(sink)
+        self.assertEqual(sink.getvalue(), div.to_html())
+
 
 class TestLeafNode(unittest.TestCase):
     def test_leaf_node_initializes(self):
@@ -160,6 +178,12 @@ class TestHTMLNode(unittest.TestCase):
         str_repr = """HTMLNode(\ntag: p\nvalue: Some paragraph...\nchildren: None\nprops:  class="myclass"\n)"""
         self.assertEqual(str(html_node), str_repr)
 
+    def test_nodes_have_no_instance_dict(self):
+        leaf = LeafNode("p", PARA)
+        nodes = [HTMLNode("p", PARA), leaf, ParentNode("div", [leaf])]
+        for node in nodes:
+            self.assertFalse(hasattr(node, "__dict__"))
+
     def test_props_to_html(self):
         html_node = HTMLNode("p", PARA)
         html_node1 = HTMLNode("p", PARA, None, {"class": "myclass"})
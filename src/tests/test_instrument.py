@@ -0,0 +1,65 @@
+import json
+import unittest
+
+import instrument
+from cache import BlockCache
+from md_to_html import markdown_to_html_node
+
+MD = """
+# Title
+
+A paragraph with **bold** and a [link](https://boot.dev).
+
+- one
+- two
+
+> quoted
+"""
+
+
+class TestProfile(unittest.TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(instrument.profiler)
+
+    def test_records_stages_and_block_types(self):
+        with instrument.profile() as prof:
+            html = markdown_to_html_node(MD)
+        self.assertIsNone(instrument.profiler)
+        self.assertEqual(html, markdown_to_html_node(MD))
+        for stage in ("split", "classify", "inline", "build", "serialize"):
+            self.assertIn(stage, prof.stages)
+        self.assertEqual(prof.stages["classify"]["calls"], 4)
+        # The paragraph and the quote's paragraph
+        self.assertEqual(prof.stages["inline"]["calls"], 2)
+        self.assertEqual(prof.stages["inline"]["nodes"], 6)
+        self.assertEqual(prof.stages["serialize"]["bytes"], len(html) - len("<div></div>"))
+        self.assertEqual(
+            sorted(prof.block_types),
+            ["heading", "paragraph", "quote", "unordered_list"],
+        )
+        self.assertEqual(prof.block_types["unordered_list"]["nodes"], 3)
+
+    def test_records_cache_lookups(self):
+        cache = BlockCache(8)
+        with instrument.profile() as prof:
+            markdown_to_html_node(MD, cache)
+            markdown_to_html_node(MD, cache)
+        self.assertEqual(prof.stages["cache"]["calls"], 8)
+        self.assertEqual(prof.stages["classify"]["calls"], 4)
+
+    def test_merge_and_export(self):
+        with instrument.profile() as first:
+            markdown_to_html_node(MD)
+        total = instrument.Profiler()
+        total.merge(first.to_dict())
+        total.merge(json.loads(first.to_json()))
+        self.assertEqual(
+            total.stages["classify"]["calls"], 2 * first.stages["classify"]["calls"]
+        )
+        table = total.format_table()
+        self.assertIn("serialize", table)
+        self.assertIn("unordered_list", table)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import io
+import os
+import tempfile
+import unittest
+
+from links import (
+    LinkIndex,
+    LinkRecorder,
+    extract_links,
+    output_files,
+    resolve_target,
+)
+from manifest import Manifest
+from md_to_html import markdown_to_html, markdown_to_html_node
+
+
+class TestExtractLinks(unittest.TestCase):
+    def test_links_and_images_in_order(self):
+        html = markdown_to_html_node(
+            "See [docs](/docs/) and ![logo](img/logo.png).\n\n"
+            "- not [parsed](x)\n\n"
+            "> [quoted](../up.html)"
+        )
+        self.assertEqual(extract_links(html), ["/docs/", "img/logo.png", "../up.html"])
+
+    def test_unescapes_targets(self):
+        html = markdown_to_html_node('[q](/search?a=1&b="2")')
+        self.assertEqual(extract_links(html), ['/search?a=1&b="2"'])
+
+    def test_escaped_text_is_not_a_link(self):
+        html = markdown_to_html_node('```\n<a href="/nope">x</a>\n```')
+        self.assertEqual(extract_links(html), [])
+
+    def test_recorder_passes_html_through(self):
+        markdown = "# Title\n\n[one](/1.html) and [two](/2.html)\n\n![i](/i.png)"
+        sink = io.StringIO()
+        recorder = LinkRecorder(sink)
+        markdown_to_html(markdown, recorder)
+        self.assertEqual(sink.getvalue(), markdown_to_html_node(markdown))
+        self.assertEqual(recorder.targets, ["/1.html", "/2.html", "/i.png"])
+
+
+class TestResolveTarget(unittest.TestCase):
+    def test_internal_targets(self):
+        page = "blog/post.html"
+        self.assertEqual(resolve_target(page, "other.html"), "blog/other.html")
+        self.assertEqual(resolve_target(page, "../img/a.png"), "img/a.png")
+        self.assertEqual(resolve_target(page, "/about.html#team"), "about.html")
+        self.assertEqual(resolve_target(page, "/docs/"), "docs/index.html")
+        self.assertEqual(resolve_target(page, "/"), "index.html")
+        self.assertEqual(resolve_target(page, "my%20file.html"), "blog/my file.html")
+
+    def test_external_and_same_page_targets(self):
+        targets = ("https://boot.dev", "//cdn.example.com/a.js", "mailto:a@b", "#top")
+        for target in targets:
+            self.assertIsNone(resolve_target("index.html", target))
+
+
+class TestLinkIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.public = self.tmp.name
+        for rel_path in ("index.html", "blog/post.html", "docs/index.html", "logo.png"):
+            path = os.path.join(self.public, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_output_files(self):
+        self.assertEqual(
+            output_files(self.public),
+            {"index.html", "blog/post.html", "docs/index.html", "logo.png"},
+        )
+
+    def test_broken(self):
+        index = LinkIndex()
+        index.add_page("index.html", ["blog/post.html", "/docs", "missing.html"])
+        index.add_page("blog/post.html", ["../logo.png", "../missing.html", "http://x"])
+        self.assertEqual(index.internal["logo.png"], ["blog/post.html"])
+        self.assertEqual(index.external, {"http://x": ["blog/post.html"]})
+        self.assertEqual(
+            index.broken(self.public),
+            {"missing.html": ["index.html", "blog/post.html"]},
+        )
+
+    def test_from_manifest(self):
+        manifest = Manifest("v")
+        output = os.path.join(self.public, "blog", "post.html")
+        manifest.record("blog/post.md", {"output": output, "links": ["gone.png"]})
+        manifest.record("index.md", {"output": os.path.join(self.public, "index.html")})
+        index = LinkIndex.from_manifest(manifest, self.public)
+        self.assertEqual(index.internal, {"blog/gone.png": ["blog/post.html"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+from manifest import Manifest, converter_version, file_hash
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "page.md")
+        self.output = os.path.join(self.tmp.name, "page.html")
+        self.path = os.path.join(self.tmp.name, "manifest.json")
+        self.write(self.source, "# Page")
+        self.write(self.output, "<div><h1>Page</h1></div>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def built_manifest(self):
+        manifest = Manifest("v1")
+        fresh, entry = manifest.check("page.md", self.source, self.output)
+        self.assertFalse(fresh)
+        manifest.record("page.md", entry)
+        return manifest
+
+    def test_new_source_is_stale(self):
+        fresh, entry = Manifest("v1").check("page.md", self.source, self.output)
+        self.assertFalse(fresh)
+        self.assertEqual(entry["hash"], file_hash(self.source))
+        self.assertEqual(entry["output"], self.output)
+
+    def test_unchanged_source_is_fresh(self):
+        manifest = self.built_manifest()
+        fresh, _ = manifest.check("page.md", self.source, self.output)
+        self.assertTrue(fresh)
+
+    def test_touched_but_unchanged_source_is_fresh(self):
+        manifest = self.built_manifest()
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        fresh, entry = manifest.check("page.md", self.source, self.output)
+        self.assertTrue(fresh)
+        self.assertEqual(manifest.entries["page.md"]["mtime_ns"], entry["mtime_ns"])
+
+    def test_edited_source_is_stale(self):
+        manifest = self.built_manifest()
+        self.write(self.source, "# Page edited")
+        fresh, _ = manifest.check("page.md", self.source, self.output)
+        self.assertFalse(fresh)
+
+    def test_missing_output_is_stale(self):
+        manifest = self.built_manifest()
+        os.remove(self.output)
+        fresh, _ = manifest.check("page.md", self.source, self.output)
+        self.assertFalse(fresh)
+
+    def test_save_and_load(self):
+        manifest = self.built_manifest()
+        manifest.save(self.path)
+        loaded = Manifest.load(self.path, "v1")
+        self.assertEqual(loaded.entries, manifest.entries)
+
+    def test_load_invalidates_on_version_or_template_change(self):
+        self.built_manifest().save(self.path)
+        self.assertEqual(Manifest.load(self.path, "v2").entries, {})
+        self.assertEqual(Manifest.load(self.path, "v1", "template").entries, {})
+        self.assertEqual(Manifest.load(self.source, "v1").entries, {})
+
+    def test_removed(self):
+        manifest = self.built_manifest()
+        self.assertEqual(manifest.removed(["page.md"]), [])
+        self.assertEqual(manifest.removed([]), [("page.md", self.output)])
+
+    def test_failed_source_is_stale_and_removable(self):
+        manifest = self.built_manifest()
+        manifest.fail("page.md", self.output)
+        fresh, entry = manifest.check("page.md", self.source, self.output)
+        self.assertFalse(fresh)
+        self.assertEqual(entry["hash"], file_hash(self.source))
+        self.assertEqual(manifest.removed([]), [("page.md", self.output)])
+
+    def test_converter_version_is_stable(self):
+        self.assertEqual(converter_version(), converter_version())
+        self.assertEqual(len(converter_version()), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,14 @@
+import io
+import os
+import tempfile
 import unittest
 
-from md_to_html import markdown_to_html_node
+from md_to_html import (
+    iter_markdown_html,
+    markdown_file_to_html,
+    markdown_to_html,
+    markdown_to_html_node,
+)
 
 MD_1 = """
 # This is an H1
@@ -67,5 +75,43 @@ should retain breaks
         self.assertEqual(actual_html, expected_html)
 
 
+class TestStreamingMdToHtml(unittest.TestCase):
+    def test_markdown_to_html_writes_to_sink(self):
+        sink = io.StringIO()
+        markdown_to_html(MD_1, sink)
+        self.assertEqual(sink.getvalue(), HTML_1)
+
+    def test_iter_markdown_html_yields_chunks(self):
+        chunks = list(iter_markdown_html(MD_1))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), HTML_1)
+
+    def test_reads_from_file_object(self):
+        sink = io.StringIO()
+        markdown_to_html(io.StringIO(MD_1), sink)
+        self.assertEqual(sink.getvalue(), HTML_1)
+
+    def test_code_block_with_blank_line(self):
+        md = "```\nfirst\n\nsecond\n```"
+        expected_html = "<div><pre><code>\nfirst\n\nsecond\n</code></pre></div>"
+        self.assertEqual(markdown_to_html_node(md), expected_html)
+
+    def test_reads_from_bytes(self):
+        self.assertEqual(markdown_to_html_node(MD_1.encode()), HTML_1)
+
+    def test_markdown_file_to_html(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(MD_1)
+            sink = io.StringIO()
+            markdown_file_to_html(path, sink)
+        self.assertEqual(sink.getvalue(), HTML_1)
+
+    def test_empty_markdown_raises(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html("", io.StringIO())
+
+
 if __name__ == "__main__":
     unittest.main()
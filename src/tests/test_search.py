@@ -0,0 +1,171 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from build import build_site
+from md_to_html import markdown_to_html, markdown_to_html_node
+from search import (
+    DOCS_NAME,
+    SEARCH_DIR,
+    PageIndexer,
+    decode_postings,
+    encode_postings,
+    load_postings,
+    shard_path,
+    slugify,
+)
+
+MARKDOWN = """# Install Guide
+
+Get started with **pygenstat** &amp; python.
+
+## Setup
+
+Run the build.
+
+## Setup
+
+```
+<h2>not a heading</h2>
+```"""
+
+
+class TestPageIndexer(unittest.TestCase):
+    def index(self, markdown):
+        sink = io.StringIO()
+        indexer = PageIndexer(sink)
+        markdown_to_html(markdown, indexer)
+        return indexer, sink.getvalue()
+
+    def test_gives_headings_unique_ids(self):
+        _, html = self.index(MARKDOWN)
+        self.assertEqual(
+            html,
+            markdown_to_html_node(MARKDOWN)
+            .replace("<h1>", '<h1 id="install-guide">')
+            .replace("<h2>", '<h2 id="setup">', 1)
+            .replace("<h2>", '<h2 id="setup-2">', 1),
+        )
+
+    def test_terms_point_to_sections(self):
+        indexer, _ = self.index(MARKDOWN)
+        self.assertEqual(indexer.title, "Install Guide")
+        self.assertEqual(
+            indexer.anchors,
+            [
+                ["", ""],
+                ["install-guide", "Install Guide"],
+                ["setup", "Setup"],
+                ["setup-2", "Setup"],
+            ],
+        )
+        self.assertEqual(indexer.terms["pygenstat"], [1])
+        self.assertEqual(indexer.terms["amp"], [1])
+        self.assertEqual(indexer.terms["setup"], [2, 3])
+        self.assertEqual(indexer.terms["build"], [2])
+        self.assertEqual(indexer.terms["heading"], [3])
+        self.assertNotIn("a", indexer.terms)
+
+    def test_whole_page_in_one_write(self):
+        indexer, html = self.index(MARKDOWN)
+        sink = io.StringIO()
+        whole = PageIndexer(sink)
+        whole.write(markdown_to_html_node(MARKDOWN))
+        self.assertEqual(sink.getvalue(), html)
+        self.assertEqual(whole.to_dict(), indexer.to_dict())
+
+    def test_slugify(self):
+        self.assertEqual(slugify("Hello, World!"), "hello-world")
+        self.assertEqual(slugify("Café au lait"), "café-au-lait")
+        self.assertEqual(slugify("!!!"), "section")
+
+
+class TestPostings(unittest.TestCase):
+    def test_delta_encoding_round_trips(self):
+        postings = [(0, 1), (0, 3), (4, 0), (1000, 2)]
+        self.assertEqual(encode_postings(postings), [0, 1, 0, 3, 4, 0, 996, 2])
+        self.assertEqual(decode_postings(encode_postings(postings)), postings)
+
+
+class TestBuildSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.index_dir = os.path.join(self.public, SEARCH_DIR)
+        self.write("index.md", MARKDOWN)
+        self.write(os.path.join("blog", "post.md"), "# Post\n\nA python zebra.")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, markdown):
+        path = os.path.join(self.content, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+
+    def docs(self):
+        with open(os.path.join(self.index_dir, DOCS_NAME), encoding="utf-8") as f:
+            return json.load(f)["docs"]
+
+    def test_build_writes_sharded_index(self):
+        report = build_site(self.content, self.public, workers=2, search_index=True)
+        self.assertEqual(report.search["pages"], 2)
+        self.assertIn("Search index: 2 pages", report.format())
+        self.assertEqual(
+            [doc[:2] for doc in self.docs()],
+            [["/blog/post.html", "Post"], ["/index.html", "Install Guide"]],
+        )
+        self.assertEqual(load_postings(self.index_dir, "Python"), [(0, 1), (1, 1)])
+        self.assertEqual(load_postings(self.index_dir, "setup"), [(1, 2), (1, 3)])
+        self.assertEqual(load_postings(self.index_dir, "missing"), [])
+        self.assertTrue(os.path.exists(os.path.join(self.index_dir, shard_path("ze"))))
+        with open(os.path.join(self.public, "index.html"), encoding="utf-8") as f:
+            self.assertIn('<h2 id="setup">Setup</h2>', f.read())
+
+    def test_incremental_builds_keep_unchanged_pages(self):
+        build_site(self.content, self.public, workers=1)
+        # Pages built without indexing are built again to index them
+        report = build_site(self.content, self.public, workers=1, search_index=True)
+        self.assertEqual(len(report.pages), 2)
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        report = build_site(self.content, self.public, workers=1, search_index=True)
+        self.assertEqual(report.pages, [])
+        self.assertEqual([doc[0] for doc in self.docs()], ["/index.html"])
+        self.assertEqual(load_postings(self.index_dir, "pygenstat"), [(0, 1)])
+        # The shard of terms only the removed page had is gone
+        self.assertFalse(os.path.exists(os.path.join(self.index_dir, shard_path("ze"))))
+
+    def test_leaves_other_files_in_index_dir(self):
+        self.write(os.path.join(SEARCH_DIR, "help.md"), "# Help")
+        asset = os.path.join(self.index_dir, "ui.js")
+        os.makedirs(self.index_dir)
+        with open(asset, "w", encoding="utf-8") as f:
+            f.write("search()")
+        options = {"workers": 1, "record_links": True, "search_index": True}
+        for _ in range(2):
+            report = build_site(self.content, self.public, **options)
+        # The page is not deleted by the index, so it stays up to date
+        self.assertEqual(report.pages, [])
+        self.assertTrue(os.path.exists(os.path.join(self.index_dir, "help.html")))
+        self.assertTrue(os.path.exists(asset))
+        self.assertEqual(report.links.broken(self.public), {})
+        self.assertIn("/search/help.html", [doc[0] for doc in self.docs()])
+
+    def test_template_title_from_heading_with_id(self):
+        path = os.path.join(self.tmp.name, "template.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        build_site(
+            self.content, self.public, workers=1, template_path=path, search_index=True
+        )
+        with open(os.path.join(self.public, "index.html"), encoding="utf-8") as f:
+            self.assertEqual(f.read()[:28], "<title>Install Guide</title>")
+        self.assertEqual(load_postings(self.index_dir, "zebra"), [(0, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import io
+import unittest
+
+from cache import InlineCache
+from frozennode import NodeTable
+from htmlnode import LeafNode, ParentNode, RawNode
+from md_to_html import markdown_to_html_node
+from serializer import (
+    attrs_to_html,
+    close_tag,
+    escape_attr,
+    escape_text,
+    open_tag,
+    iter_html,
+    serialize,
+    write_html,
+)
+
+
+class FirstChildOnly:
+    """
+    Children that fail once walked past the first, to show what is read when
+    """
+
+    def __init__(self, first):
+        self.first = first
+
+    def __iter__(self):
+        yield self.first
+        raise AssertionError("walked past the first child")
+
+
+def wrap(html, tag, depth):
+    return f"<{tag}>" * depth + html + f"</{tag}>" * depth
+
+
+class TestEscaping(unittest.TestCase):
+    def test_escape_text(self):
+        self.assertEqual(escape_text("a < b && c > d"), "a &lt; b &amp;&amp; c &gt; d")
+        self.assertEqual(escape_text('say "hi"'), 'say "hi"')
+        text = "nothing to escape"
+        self.assertIs(escape_text(text), text)
+
+    def test_escape_attr(self):
+        self.assertEqual(escape_attr('/q?a=1&b="2"'), "/q?a=1&amp;b=&quot;2&quot;")
+
+    def test_attrs_to_html(self):
+        props = {"href": "/?a&b", "class": "nav"}
+        self.assertEqual(attrs_to_html(props), ' href="/?a&amp;b" class="nav"')
+
+
+class TestTags(unittest.TestCase):
+    def test_tags_without_props_are_reused(self):
+        self.assertIs(open_tag("section"), open_tag("section"))
+        self.assertIs(close_tag("section"), close_tag("section"))
+        self.assertEqual(open_tag("p", {"id": "x"}), '<p id="x">')
+        self.assertEqual(close_tag("p"), "</p>")
+
+
+class TestSerialize(unittest.TestCase):
+    def setUp(self):
+        self.tree = ParentNode(
+            "div",
+            [
+                LeafNode("b", "1 < 2"),
+                LeafNode(None, " & "),
+                ParentNode("p", [LeafNode("a", "x", {"href": "/?a&b"})]),
+                RawNode("<br>"),
+            ],
+            {"class": "main"},
+        )
+        self.html = (
+            '<div class="main"><b>1 &lt; 2</b> &amp; '
+            '<p><a href="/?a&amp;b">x</a></p><br></div>'
+        )
+
+    def test_serialize(self):
+        self.assertEqual(serialize(self.tree), self.html)
+        self.assertEqual(self.tree.to_html(), self.html)
+
+    def test_iter_and_write_match_serialize(self):
+        self.assertEqual("".join(self.tree.iter_html()), self.html)
+        sink = io.StringIO()
+        write_html(self.tree, sink)
+        self.assertEqual(sink.getvalue(), self.html)
+
+    def test_memoized_nodes_are_reused(self):
+        table = NodeTable()
+        item = table.leaf("li", "a & b")
+        tree = ParentNode("ul", [item, item])
+        html = "<ul><li>a &amp; b</li><li>a &amp; b</li></ul>"
+        self.assertEqual(serialize(tree), html)
+        self.assertEqual(item.html, "<li>a &amp; b</li>")
+
+    def test_nested_memoized_nodes_remember_their_html(self):
+        table = NodeTable()
+        inner = table.parent("b", [table.leaf(None, "x")])
+        outer = table.parent("p", [inner, table.leaf("i", "y")])
+        page = ParentNode("div", [outer, inner])
+        html = "<div><p><b>x</b><i>y</i></p><b>x</b></div>"
+        self.assertEqual(serialize(page), html)
+        self.assertEqual(inner.html, "<b>x</b>")
+        self.assertEqual(outer.html, "<p><b>x</b><i>y</i></p>")
+
+    def test_deep_trees_do_not_hit_the_recursion_limit(self):
+        node = LeafNode("code", "x")
+        for _ in range(20000):
+            node = ParentNode("div", [node])
+        html = serialize(node)
+        self.assertEqual(html, wrap("<code>x</code>", "div", 20000))
+        self.assertEqual("".join(node.iter_html()), html)
+        self.assertEqual(node.to_html(), html)
+
+    def test_deep_frozen_trees(self):
+        table = NodeTable()
+        node = table.leaf("code", "x")
+        for _ in range(5000):
+            node = table.parent("div", [node])
+        self.assertEqual(node.to_html(), wrap("<code>x</code>", "div", 5000))
+
+    def test_iter_html_parts(self):
+        tree = ParentNode("p", [LeafNode("b", "x"), LeafNode(None, "y")])
+        self.assertEqual(list(iter_html(tree)), ["<p>", "<b>x</b>", "y", "</p>"])
+
+    def test_first_part_before_rest_of_tree(self):
+        tree = ParentNode("div", [ParentNode("p", FirstChildOnly(LeafNode("b", "x")))])
+        parts = tree.iter_html()
+        self.assertEqual([next(parts) for _ in range(3)], ["<div>", "<p>", "<b>x</b>"])
+        with self.assertRaises(AssertionError):
+            next(parts)
+
+    def test_write_html_streams(self):
+        tree = ParentNode("p", FirstChildOnly(LeafNode(None, "x")))
+        sink = io.StringIO()
+        with self.assertRaises(AssertionError):
+            write_html(tree, sink)
+        self.assertEqual(sink.getvalue(), "<p>x")
+
+    def test_memoized_subtree_is_collected_while_streaming(self):
+        table = NodeTable()
+        frozen = table.parent("p", [table.leaf("b", "x"), table.leaf(None, "y")])
+        tree = ParentNode("div", [LeafNode(None, "a"), frozen])
+        self.assertEqual(
+            list(iter_html(tree)), ["<div>", "a", "<p><b>x</b>y</p>", "</div>"]
+        )
+        self.assertEqual(frozen.html, "<p><b>x</b>y</p>")
+
+    def test_invalid_nested_node_raises(self):
+        child = ParentNode("span", [LeafNode(None, "x")])
+        tree = ParentNode("p", [child])
+        child.children = []
+        with self.assertRaises(ValueError):
+            serialize(tree)
+
+    def test_markdown_is_escaped(self):
+        html = markdown_to_html_node("```\nif a < b:\n```\n\nFish & **chips**")
+        self.assertEqual(
+            html,
+            "<div><pre><code>\nif a &lt; b:\n</code></pre>"
+            "<p>Fish &amp; <b>chips</b></p></div>",
+        )
+        cached = markdown_to_html_node("Fish & chips", inline_cache=InlineCache(4))
+        self.assertEqual(cached, "<div><p>Fish &amp; chips</p></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from build import build_site, output_path
+from serve import Watcher, snapshot, start_server
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.write("index.md", "# Home")
+        self.write(os.path.join("docs", "guide.md"), "Read the guide")
+        build_site(self.content, self.public, workers=1)
+        self.watcher = Watcher(self.content, self.public)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, markdown):
+        path = os.path.join(self.content, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        # Make sure the change is visible even on coarse mtime filesystems
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def read_output(self, rel_path):
+        with open(output_path(rel_path, self.public), encoding="utf-8") as f:
+            return f.read()
+
+    def test_snapshot(self):
+        expected = [os.path.join("docs", "guide.md"), "index.md"]
+        self.assertEqual(sorted(snapshot(self.content)), expected)
+        self.assertEqual(sorted(snapshot(self.content + os.sep)), expected)
+
+    def test_no_changes(self):
+        self.assertFalse(self.watcher.poll())
+
+    def test_rebuilds_only_changed_pages(self):
+        self.write("index.md", "# Home page")
+        self.write("new.md", "A new page")
+        rebuild = self.watcher.poll()
+        self.assertEqual(
+            [page.source for page in rebuild.pages],
+            [os.path.join(self.content, "index.md"), os.path.join(self.content, "new.md")],
+        )
+        self.assertEqual(len(rebuild.latencies), 2)
+        self.assertEqual(self.read_output("index.md"), "<div><h1>Home page</h1></div>")
+        self.assertEqual(self.read_output("new.md"), "<div><p>A new page</p></div>")
+        self.assertFalse(self.watcher.poll())
+        # The manifest is kept up to date, so a full build has nothing to do
+        self.watcher.save()
+        self.assertEqual(build_site(self.content, self.public, workers=1).pages, [])
+
+    def test_saves_manifest_once_idle(self):
+        watcher = Watcher(self.content, self.public, save_delay=0)
+        self.write("index.md", "# Home page")
+        self.assertTrue(watcher.poll())
+        # Not written while pages are changing
+        self.assertEqual(len(build_site(self.content, self.public, workers=1).pages), 1)
+        self.write("index.md", "# Home")
+        watcher.poll()
+        self.assertFalse(watcher.poll())
+        self.assertEqual(build_site(self.content, self.public, workers=1).pages, [])
+
+    def test_rebuilds_with_template(self):
+        path = os.path.join(self.tmp.name, "template.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("<main>{{ Content }}</main>")
+        build_site(self.content, self.public, workers=1, template_path=path)
+        watcher = Watcher(self.content, self.public, template_path=path)
+        self.write("index.md", "# Home page")
+        self.assertEqual(len(watcher.poll().pages), 1)
+        self.assertEqual(
+            self.read_output("index.md"), "<main><div><h1>Home page</h1></div></main>"
+        )
+        watcher.save()
+        build = build_site(self.content, self.public, workers=1, template_path=path)
+        self.assertEqual(build.pages, [])
+
+    def test_removes_output_of_deleted_page(self):
+        os.remove(os.path.join(self.content, "index.md"))
+        rebuild = self.watcher.poll()
+        self.assertEqual(rebuild.removed, [output_path("index.md", self.public)])
+        self.assertIn("removed", rebuild.format())
+
+
+class TestServer(unittest.TestCase):
+    def test_serves_public_dir(self):
+        with tempfile.TemporaryDirectory() as public:
+            with open(os.path.join(public, "index.html"), "w") as f:
+                f.write("<div><h1>Home</h1></div>")
+            server = start_server(public, port=0)
+            try:
+                url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+                with urllib.request.urlopen(url) as response:
+                    self.assertEqual(response.read(), b"<div><h1>Home</h1></div>")
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
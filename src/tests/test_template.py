@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+
+import template
+from template import (
+    MISSING_SLOT_ERROR,
+    UNKNOWN_SLOT_ERROR,
+    Template,
+    extract_title,
+    load_template,
+)
+
+LAYOUT = (
+    "<html><head><title>{{ Title }}</title></head>"
+    "<body>{{Nav}}<article>{{ Content }}</article>{{ Footer }}</body></html>"
+)
+
+
+class TestTemplate(unittest.TestCase):
+    def test_compiles_to_static_chunks_and_slots(self):
+        page = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(
+            page.pieces, ["<title>", None, "</title><main>", None, "</main>"]
+        )
+        self.assertEqual(page.slots, [(1, "Title"), (3, "Content")])
+
+    def test_fragments_fold_into_static_chunks(self):
+        page = Template(LAYOUT, {"Nav": "<nav>n</nav>", "Footer": "<footer/>"})
+        self.assertEqual(len(page.pieces), 5)
+        self.assertEqual(page.pieces[2], "</title></head><body><nav>n</nav><article>")
+        self.assertEqual(page.pieces[4], "</article><footer/></body></html>")
+
+    def test_render_page(self):
+        page = Template(LAYOUT, {"Nav": "<nav>n</nav>", "Footer": ""})
+        html = "<div><h1>Hello &amp; welcome</h1><p>text</p></div>"
+        self.assertEqual(
+            page.render_page(html),
+            "<html><head><title>Hello &amp; welcome</title></head><body><nav>n</nav>"
+            f"<article>{html}</article></body></html>",
+        )
+
+    def test_render_page_without_title_slot(self):
+        page = Template("<main>{{ Content }}</main>")
+        self.assertEqual(
+            page.render_page("<div><p>x</p></div>"), "<main><div><p>x</p></div></main>"
+        )
+
+    def test_missing_slot(self):
+        with self.assertRaises(ValueError) as ve:
+            Template(LAYOUT).render_page("<div><h1>T</h1></div>")
+        self.assertEqual(ve.exception.args[0], MISSING_SLOT_ERROR)
+
+    def test_hash_covers_fragments(self):
+        self.assertEqual(
+            Template(LAYOUT, {"Nav": "a", "Footer": ""}).hash,
+            Template(LAYOUT, {"Nav": "a", "Footer": ""}).hash,
+        )
+        self.assertNotEqual(
+            Template(LAYOUT, {"Nav": "a", "Footer": ""}).hash,
+            Template(LAYOUT, {"Nav": "b", "Footer": ""}).hash,
+        )
+
+
+class TestExtractTitle(unittest.TestCase):
+    def test_first_h1(self):
+        html = "<div><h2>Sub</h2><h1>First</h1><h1>Second</h1></div>"
+        self.assertEqual(extract_title(html), "First")
+
+    def test_drops_inline_tags(self):
+        self.assertEqual(extract_title("<h1>A <b>bold</b> title</h1>"), "A bold title")
+
+    def test_escaped_h1_in_code_is_not_a_title(self):
+        html = "<div><pre><code>&lt;h1&gt;x&lt;/h1&gt;</code></pre></div>"
+        self.assertEqual(extract_title(html), "")
+
+    def test_page_without_h1(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        html = "<div><p>Just a note</p></div>"
+        self.assertEqual(template.render_page(html), "<title></title>" + html)
+
+
+class TestLoadTemplate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.write("template.html", LAYOUT)
+        self.write("Nav.html", "<nav>n</nav>")
+        self.write("Footer.html", "<footer>f</footer>")
+
+    def tearDown(self):
+        template._templates.pop(self.path, None)
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_loads_fragments_next_to_the_template(self):
+        page = load_template(self.path)
+        self.assertEqual(page.slots, [(1, "Title"), (3, "Content")])
+        self.assertIn("<nav>n</nav>", page.pieces[2])
+        self.assertIn("<footer>f</footer>", page.pieces[4])
+
+    def test_compiled_once_until_a_file_changes(self):
+        page = load_template(self.path)
+        self.assertIs(load_template(self.path), page)
+        self.write("Footer.html", "<footer>changed</footer>")
+        os.utime(os.path.join(self.tmp.name, "Footer.html"), ns=(1, 1))
+        changed = load_template(self.path)
+        self.assertIsNot(changed, page)
+        self.assertIn("<footer>changed</footer>", changed.pieces[4])
+
+    def test_missing_fragment(self):
+        os.remove(os.path.join(self.tmp.name, "Nav.html"))
+        with self.assertRaises(ValueError) as ve:
+            load_template(self.path)
+        self.assertEqual(ve.exception.args[0], UNKNOWN_SLOT_ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,6 @@
+import io
+import os
+import tempfile
 import unittest
 
 from textnode import TextNode, TextType
@@ -8,7 +11,12 @@ from text_functions import (
     split_nodes_image,
     split_nodes_link,
     text_to_text_nodes,
+    tokenize_inline,
     markdown_to_blocks,
+    iter_markdown_blocks,
+    iter_block_spans,
+    iter_buffer_blocks,
+    map_markdown_file,
 )
 
 
@@ -233,6 +241,33 @@ class TestLinkSplit(unittest.TestCase):
         self.assertEqual(new_nodes, expected)
 
 
+    def test_link_brackets_without_link_stay_text(self):
+        # The find and extract patterns used to disagree here, raising IndexError
+        node = TextNode("a [b] (c) and [d](e)", TextType.TEXT)
+        expected = [
+            TextNode("a [b] (c) and ", TextType.TEXT),
+            TextNode("d", TextType.LINK, "e"),
+        ]
+        self.assertEqual(split_nodes_link([node]), expected)
+
+    def test_link_split_skips_non_text_nodes(self):
+        node = TextNode("[a](b)", TextType.CODE)
+        self.assertEqual(split_nodes_link([node]), [node])
+
+    def test_image_then_link_split(self):
+        node = TextNode("![a](b.png)[c](d) tail", TextType.TEXT)
+        expected = [
+            TextNode("a", TextType.IMAGE, "b.png"),
+            TextNode("[c](d) tail", TextType.TEXT),
+        ]
+        self.assertEqual(split_nodes_image([node]), expected)
+        expected = [
+            TextNode("![a](b.png)", TextType.TEXT),
+            TextNode("c", TextType.LINK, "d"),
+            TextNode(" tail", TextType.TEXT),
+        ]
+        self.assertEqual(split_nodes_link([node]), expected)
+
 class TestTextToTextNodes(unittest.TestCase):
     def test_all_nodes(self):
         self.maxDiff = None
@@ -256,6 +291,41 @@ class TestTextToTextNodes(unittest.TestCase):
         self.assertEqual(nodes, expected)
 
 
+class TestTokenizeInline(unittest.TestCase):
+    def test_matches_chained_passes(self):
+        texts = [
+            "",
+            "Just plain text",
+            "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+            "[xlingual](https://xlingual.co.jp)[google](https://google.com)",
+            "![rick roll](https://i.imgur.com/aKaOqIh.gif)![obi wan](https://i.imgur.com/fJRm4Vk.jpeg)",
+            "**bold**_italic_`code` and a [not a link",
+        ]
+        for text in texts:
+            self.assertEqual(tokenize_inline(text), text_to_text_nodes(text))
+
+    def test_selectable_from_text_to_text_nodes(self):
+        text = "A **bold** [link](https://boot.dev)"
+        self.assertEqual(
+            text_to_text_nodes(text, single_pass=True), tokenize_inline(text)
+        )
+
+    def test_delimiters_inside_link_url_are_kept(self):
+        text = "See [docs](https://example.com/some_page_name)"
+        expected = [
+            TextNode("See ", TextType.TEXT),
+            TextNode("docs", TextType.LINK, "https://example.com/some_page_name"),
+        ]
+        self.assertEqual(tokenize_inline(text), expected)
+
+    def test_raises_with_unclosed_delimiter(self):
+        with self.assertRaises(ValueError) as ve:
+            tokenize_inline("This is text with a **bold block word")
+        self.assertEqual(
+            ve.exception.args[0], "Invalid markdown, formatted section not closed"
+        )
+
+
 class TestMarkdownBlocks(unittest.TestCase):
     def test_markdown_to_blocks(self):
         md = """
@@ -300,5 +370,91 @@ This is the same paragraph on a new line
         )
 
 
+class TestIterMarkdownBlocks(unittest.TestCase):
+    def test_reads_blocks_from_file(self):
+        md = "# Heading\n\nSome paragraph\non two lines\n\n\n- a list\n- of items\n"
+        blocks = iter_markdown_blocks(io.StringIO(md))
+        self.assertEqual(next(blocks), "# Heading")
+        self.assertEqual(
+            list(blocks), ["Some paragraph\non two lines", "- a list\n- of items"]
+        )
+
+    def test_reads_blocks_from_lines_without_newlines(self):
+        lines = ["first", "", "second", "third"]
+        self.assertEqual(list(iter_markdown_blocks(lines)), ["first", "second\nthird"])
+
+    def test_keeps_code_fence_intact(self):
+        md = "Intro\n\n```\ndef f():\n\n    return 1\n```\n\nOutro"
+        self.assertEqual(
+            list(iter_markdown_blocks(io.StringIO(md))),
+            ["Intro", "```\ndef f():\n\n    return 1\n```", "Outro"],
+        )
+
+    def test_single_line_code_does_not_open_fence(self):
+        lines = ["```some code```", "", "A paragraph"]
+        self.assertEqual(
+            list(iter_markdown_blocks(lines)), ["```some code```", "A paragraph"]
+        )
+
+    def test_skips_whitespace_only_blocks(self):
+        md = "one\n\n   \n\ntwo"
+        self.assertEqual(markdown_to_blocks(md), ["one", "two"])
+
+
+class TestBufferBlocks(unittest.TestCase):
+    def test_matches_iter_markdown_blocks(self):
+        for md in (
+            "# Heading\n\nSome paragraph\non two lines\n\n\n- a list\n- of items\n",
+            "Intro\n\n```\ndef f():\n\n    return 1\n```\n\nOutro",
+            "```some code```\n\nA paragraph",
+            "text with ``` inside\n\nnext",
+            "```\nnever closed\n\nstill code",
+            "one\n\n   \n\ntwo",
+            "\n\n\n",
+        ):
+            self.assertEqual(
+                list(iter_buffer_blocks(md.encode())),
+                list(iter_markdown_blocks(io.StringIO(md))),
+            )
+
+    def test_spans_point_into_the_buffer(self):
+        buf = b"first\n\n```\na\n\nb\n```\n\n\nlast"
+        spans = list(iter_block_spans(buf))
+        self.assertEqual(
+            [buf[start:end] for start, end in spans],
+            [b"first", b"```\na\n\nb\n```", b"last"],
+        )
+
+    def test_spans_of_str_from_a_block_start(self):
+        text = "first\n\n```\na\n\nb\n```\n\n\nlast"
+        self.assertEqual(
+            [text[start:end] for start, end in iter_block_spans(text)],
+            ["first", "```\na\n\nb\n```", "last"],
+        )
+        self.assertEqual(list(iter_block_spans(text, 7)), [(7, 19), (22, 26)])
+
+    def test_crlf_line_endings(self):
+        md = "a\r\nb\r\n\r\n```\r\nx\r\n\r\ny\r\n```"
+        expected = ["a\nb", "```\nx\n\ny\n```"]
+        self.assertEqual(list(iter_buffer_blocks(md.encode())), expected)
+        self.assertEqual(markdown_to_blocks(md), expected)
+
+    def test_decodes_utf8_per_block(self):
+        md = "caf\u00e9\n\n\u65e5\u672c"
+        blocks = list(iter_buffer_blocks(md.encode()))
+        self.assertEqual(blocks, ["caf\u00e9", "\u65e5\u672c"])
+
+    def test_map_markdown_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "wb") as f:
+                f.write(b"# Title\n\nBody")
+            with map_markdown_file(path) as buf:
+                self.assertEqual(list(iter_buffer_blocks(buf)), ["# Title", "Body"])
+            open(path, "wb").close()
+            with map_markdown_file(path) as buf:
+                self.assertEqual(list(iter_buffer_blocks(buf)), [])
+
+
 if __name__ == "__main__":
     unittest.main()
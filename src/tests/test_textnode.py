@@ -53,6 +53,12 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode(B, TextType.BOLD)
         self.assertNotEqual(node, node2)
 
+    def test_has_no_instance_dict(self):
+        node = TextNode(T, TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = True
+
     def test_representation(self):
         node = TextNode(L, TextType.LINK, URL)
         self.assertEqual(
@@ -1,3 +1,7 @@
+import contextlib
+import io
+import mmap
+import os
 import re
 
 from textnode import TextType, TextNode
@@ -24,107 +28,115 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 
+# Compiled once, each node is scanned by a single split over one of these
+IMAGE_REGEX = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_REGEX = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+
 def extract_markdown_images(text):
-    image_regex = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(image_regex, text)
-    return matches
+    return IMAGE_REGEX.findall(text)
 
 
 def extract_markdown_links(text):
-    link_regex = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(link_regex, text)
-    return matches
-
+    return LINK_REGEX.findall(text)
 
-def split_nodes_link(nodes_arr):
-    find_link_regex = r"(?<!!)\[[^\)]+\)"
 
+def split_nodes_pattern(nodes_arr, regex, text_type):
+    """
+    Splits the TEXT nodes in nodes_arr on every match of regex, whose groups are
+    the (text, url) of a node of text_type. The text between matches is kept as
+    TEXT nodes, empty nodes and nodes of other types are passed through as is.
+    """
     new_nodes = []
-
+    append = new_nodes.append
+    text_type_text = TextType.TEXT
     for node in nodes_arr:
-        # No link markdown in str
-        if not node.text:
-            new_nodes.append(node)
+        text = node.text
+        if node.text_type != text_type_text or not text:
+            append(node)
             continue
-        found = re.search(find_link_regex, node.text)
-        if not found:
-            new_nodes.append(node)
+        # With capturing groups one split scans the text once and returns
+        # [text, label, url, text, label, url, ..., text]
+        parts = regex.split(text)
+        if len(parts) == 1:
+            append(node)
             continue
-
-        # link markdown in str
-        links_removed_list = re.split(find_link_regex, node.text)
-        links_details_list = extract_markdown_links(node.text)
-
-        for i, item in enumerate(links_removed_list):
-            if not item:
-                if i + 1 == len(links_removed_list):
-                    break
-                else:
-                    link_text = links_details_list[i][0]
-                    href = links_details_list[i][1]
-                    link_node = TextNode(link_text, TextType.LINK, href)
-                    new_nodes.append(link_node)
-            else:
-                if i + 1 == len(links_removed_list):
-                    text_node = TextNode(item, TextType.TEXT)
-                    new_nodes.append(text_node)
-                else:
-                    # Add text node
-                    text_node = TextNode(item, TextType.TEXT)
-                    new_nodes.append(text_node)
-                    # Add link node
-                    link_text = links_details_list[i][0]
-                    href = links_details_list[i][1]
-                    link_node = TextNode(link_text, TextType.LINK, href)
-                    new_nodes.append(link_node)
+        for i in range(0, len(parts) - 1, 3):
+            if parts[i]:
+                append(TextNode(parts[i], text_type_text))
+            append(TextNode(parts[i + 1], text_type, parts[i + 2]))
+        if parts[-1]:
+            append(TextNode(parts[-1], text_type_text))
     return new_nodes
 
 
+def split_nodes_link(nodes_arr):
+    return split_nodes_pattern(nodes_arr, LINK_REGEX, TextType.LINK)
+
+
 def split_nodes_image(nodes_arr):
-    find_image_regex = r"[!\[]{2}[^\)]+\)"
+    return split_nodes_pattern(nodes_arr, IMAGE_REGEX, TextType.IMAGE)
 
-    new_nodes = []
 
-    for node in nodes_arr:
-        # No image markdown in str
-        if not node.text:
-            new_nodes.append(node)
+# Single-pass inline scanner
+INLINE_DELIMITERS = {
+    "**": TextType.BOLD,
+    "_": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+INLINE_TOKEN_REGEX = re.compile(r"\*\*|[_`]|!?\[")
+INLINE_LINK_REGEX = re.compile(r"\[([^\[\]]*)\]\(([^\(\)]*)\)")
+UNCLOSED_DELIMITER_ERROR = "Invalid markdown, formatted section not closed"
+
+
+def tokenize_inline(text):
+    """
+    Splits inline markdown into TextNodes with one left-to-right scan.
+
+    Produces the same nodes as the chained split_nodes_* passes for well
+    formed markdown. Delimiters are not interpreted inside code spans, bold,
+    italic or link sections, so e.g. underscores in a link url are kept.
+    """
+    nodes = []
+    text_start = 0
+    pos = 0
+    search = INLINE_TOKEN_REGEX.search
+    match_link = INLINE_LINK_REGEX.match
+    while True:
+        token = search(text, pos)
+        if not token:
+            break
+        start = token.start()
+        delimiter = token.group()
+        if delimiter in INLINE_DELIMITERS:
+            end = text.find(delimiter, token.end())
+            if end == -1:
+                raise ValueError(UNCLOSED_DELIMITER_ERROR)
+            if start > text_start:
+                nodes.append(TextNode(text[text_start:start], TextType.TEXT))
+            inner = text[token.end() : end]
+            if inner:
+                nodes.append(TextNode(inner, INLINE_DELIMITERS[delimiter]))
+            pos = text_start = end + len(delimiter)
             continue
-        found = re.search(find_image_regex, node.text)
-        if not found:
-            new_nodes.append(node)
+        # Link or image, "[" that does not open one is plain text
+        link = match_link(text, token.end() - 1)
+        if not link:
+            pos = token.end()
             continue
-
-        # Image markdown in str
-        imgs_removed_list = re.split(find_image_regex, node.text)
-        imgs_details_list = extract_markdown_images(node.text)
-
-        for i, item in enumerate(imgs_removed_list):
-            if not item:
-                if i + 1 == len(imgs_removed_list):
-                    break
-                else:
-                    alt_text = imgs_details_list[i][0]
-                    src = imgs_details_list[i][1]
-                    img_node = TextNode(alt_text, TextType.IMAGE, src)
-                    new_nodes.append(img_node)
-            else:
-                if i + 1 == len(imgs_removed_list):
-                    text_node = TextNode(item, TextType.TEXT)
-                    new_nodes.append(text_node)
-                else:
-                    # Add text node
-                    text_node = TextNode(item, TextType.TEXT)
-                    new_nodes.append(text_node)
-                    # Add image node
-                    alt_text = imgs_details_list[i][0]
-                    src = imgs_details_list[i][1]
-                    img_node = TextNode(alt_text, TextType.IMAGE, src)
-                    new_nodes.append(img_node)
-    return new_nodes
+        if start > text_start:
+            nodes.append(TextNode(text[text_start:start], TextType.TEXT))
+        text_type = TextType.IMAGE if delimiter == "![" else TextType.LINK
+        nodes.append(TextNode(link.group(1), text_type, link.group(2)))
+        pos = text_start = link.end()
+    if text_start < len(text):
+        nodes.append(TextNode(text[text_start:], TextType.TEXT))
+    return nodes
 
 
-def text_to_text_nodes(text):
+def text_to_text_nodes(text, single_pass=False):
+    if single_pass:
+        return tokenize_inline(text)
     text_node = TextNode(
         text,
         TextType.TEXT,
@@ -144,5 +156,163 @@ def text_to_text_nodes(text):
 
 
 def markdown_to_blocks(markdown):
-    blocks = [block.strip() for block in markdown.split("\n\n") if block]
-    return blocks
+    return list(iter_markdown_blocks(io.StringIO(markdown)))
+
+
+CODE_FENCE = "```"
+
+
+def iter_markdown_blocks(lines):
+    """
+    Yields markdown blocks one at a time from an iterable of lines.
+
+    lines can be an open text file, a list of lines or any other iterator,
+    with or without trailing newlines. A block ends at an empty line, except
+    inside a ``` code fence, so code blocks are kept whole. Blocks are
+    stripped and empty blocks skipped, matching markdown_to_blocks.
+    Lines may end in \r\n, as in a str read from a file in binary mode.
+    """
+    block_lines = []
+    in_fence = False
+    for line in lines:
+        line = line.rstrip("\n")
+        if line.endswith("\r"):
+            # As iter_block_spans and decode_block do
+            line = line[:-1]
+        if not line and not in_fence:
+            if block_lines:
+                block = "\n".join(block_lines).strip()
+                block_lines = []
+                if block:
+                    yield block
+            continue
+        if (in_fence or line.startswith(CODE_FENCE)) and line.count(CODE_FENCE) % 2:
+            in_fence = not in_fence
+        block_lines.append(line)
+    if block_lines:
+        block = "\n".join(block_lines).strip()
+        if block:
+            yield block
+
+
+# Offset level block splitting, for memory mapped sources and edited documents
+BLOCK_BREAK_REGEX = re.compile(rb"^(?:(```)|\r?$)", re.MULTILINE)
+BLOCK_BREAK_TEXT_REGEX = re.compile(r"^(?:(```)|\r?$)", re.MULTILINE)
+FENCE_BYTES = CODE_FENCE.encode()
+FENCE_BYTES_REGEX = re.compile(re.escape(FENCE_BYTES))
+
+
+def count_fences(buf, start, end):
+    if isinstance(buf, str):
+        return buf.count(CODE_FENCE, start, end)
+    # mmap has find but no count
+    return len(FENCE_BYTES_REGEX.findall(buf, start, end))
+
+
+def iter_block_spans(buf, pos=0):
+    """
+    Yields the (start, end) offsets of each block in buf, a str or any bytes-like
+    object such as an mmap, following the same rules as iter_markdown_blocks.
+    Only the lines that can start or end a block are looked at in Python, the
+    rest is skipped by a regex search, so nothing is copied.
+
+    Scanning starts at pos, which must be the start of a block or of the buf.
+    Spans are raw, see decode_block. Whitespace only spans are not skipped.
+    """
+    if isinstance(buf, str):
+        search, newline = BLOCK_BREAK_TEXT_REGEX.search, "\n"
+    else:
+        search, newline = BLOCK_BREAK_REGEX.search, b"\n"
+    size = len(buf)
+    start = pos
+    while pos < size:
+        found = search(buf, pos)
+        if not found:
+            break
+        line_start = found.start()
+        line_end = buf.find(newline, line_start)
+        if line_end == -1:
+            line_end = size
+        if found.group(1):
+            # A line starting with a fence opens one if it has an odd number of them
+            if count_fences(buf, line_start, line_end) % 2:
+                line_end = skip_fence(buf, line_end)
+            pos = line_end + 1
+            continue
+        # An empty line outside a fence ends the block
+        if line_start > start:
+            yield start, line_start - 1
+        start = pos = line_end + 1
+    if start < size:
+        yield start, size
+
+
+def skip_fence(buf, pos):
+    """
+    Returns the offset of the end of the line closing the fence open at pos,
+    or len(buf) for a fence that is never closed.
+    """
+    if isinstance(buf, str):
+        fence, newline = CODE_FENCE, "\n"
+    else:
+        fence, newline = FENCE_BYTES, b"\n"
+    size = len(buf)
+    while True:
+        found = buf.find(fence, pos)
+        if found == -1:
+            return size
+        line_start = buf.rfind(newline, 0, found) + 1
+        line_end = buf.find(newline, found)
+        if line_end == -1:
+            line_end = size
+        if count_fences(buf, line_start, line_end) % 2:
+            return line_end
+        pos = line_end
+
+
+def decode_block(raw):
+    block = raw if isinstance(raw, str) else raw.decode("utf-8")
+    if "\r" in block:
+        # Text mode reads turn \r\n into \n, do the same
+        block = block.replace("\r\n", "\n")
+    return block.strip()
+
+
+# Mapped pages already parsed are handed back to the OS in steps of this many bytes
+RELEASE_BYTES = 16 * 2**20
+
+
+def iter_buffer_blocks(buf):
+    """
+    Yields markdown blocks from a bytes-like object of utf-8 markdown, decoding
+    only one block at a time, so an mmap of a huge file never becomes one str.
+    The pages of an mmap are released once parsed, so they don't pile up either.
+    """
+    release = getattr(buf, "madvise", None) if hasattr(mmap, "MADV_DONTNEED") else None
+    released = 0
+    for start, end in iter_block_spans(buf):
+        block = decode_block(buf[start:end])
+        if release is not None and start - released >= RELEASE_BYTES:
+            upto = start - start % mmap.PAGESIZE
+            release(mmap.MADV_DONTNEED, released, upto - released)
+            released = upto
+        if block:
+            yield block
+
+
+@contextlib.contextmanager
+def map_markdown_file(path):
+    """
+    Memory maps the file at path read only, for iter_buffer_blocks.
+
+        with map_markdown_file("huge.md") as buf:
+            for block in iter_buffer_blocks(buf):
+                ...
+    """
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            # Empty files can't be mapped
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf